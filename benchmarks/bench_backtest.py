@@ -0,0 +1,71 @@
+# benchmarks/bench_backtest.py
+from __future__ import annotations
+
+import os
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from benchmarks.bench_ingest import build_catalog, catalog_dir
+from benchmarks.synthetic import VENUE, symbols
+
+
+def run(sizes: List[int], workdir: str, days: int = 1, algo: str = "vwap") -> List[Dict]:
+    """
+    End-to-end bars per second through ``run_backtest``.
+
+    Uses the catalog of the ingest suite when it exists (building it
+    otherwise) and the stock strategy config; daily bars are not loaded.
+    """
+    from src.config import ExecutionConfig, MomentumConfig
+    from src.data import create_data_configs
+    from src.engine import run_backtest, run_stats
+
+    records = []
+    for n in sizes:
+        path = catalog_dir(workdir, n, days)
+        if not os.path.isdir(path):
+            build_catalog(workdir, n, days)
+
+        sessions = pd.bdate_range("2024-10-01", periods=days)
+        start = pd.Timestamp(sessions[0], tz="UTC")
+        end = pd.Timestamp(sessions[-1], tz="UTC") + pd.Timedelta(days=1)
+        instrument_ids = [f"{s}.{VENUE}" for s in symbols(n)]
+
+        config = MomentumConfig(
+            instrument_ids=instrument_ids,
+            venue=VENUE,
+            session_start=str(start.date()),
+            session_end=str(end.date()),
+            session_cache_dir=os.path.join(workdir, "sessions"),
+            execution=ExecutionConfig(algo=algo),
+        )
+        t0 = time.perf_counter()
+        results = run_backtest(
+            strategy_path="src.strategy:MomentumStrategy",
+            config_path="src.config:MomentumConfig",
+            strategy_config=config,
+            venue_name=VENUE,
+            data_configs=create_data_configs(path, instrument_ids, daily_lookback_days=0),
+            start=start,
+            end=end,
+            starting_balances=["1_000_000 USD"],
+        )
+        total_s = time.perf_counter() - t0
+        stats = run_stats(results[0])
+        records.append({
+            "suite": "backtest",
+            "case": algo,
+            "n": n,
+            "days": days,
+            "bars": stats["iterations"],
+            "orders": results[0].total_orders,
+            # Engine run only (bars_per_s) vs. the whole call, node build and data load included
+            "elapsed_s": stats["wall_time_s"],
+            "total_s": total_s,
+            "bars_per_s": stats["iterations_per_s"],
+            "peak_rss_mb": stats["peak_rss_mb"],
+        })
+        print(f"[backtest] {algo:<12} n={n:<6} {records[-1]['bars_per_s']:,.0f} bars/s")
+    return records
@@ -0,0 +1,107 @@
+# benchmarks/bench_execution.py
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from typing import Dict, List
+
+import numpy as np
+
+from nautilus_trader.common.component import TestClock
+from nautilus_trader.common.factories import OrderFactory
+from nautilus_trader.model.identifiers import StrategyId, TraderId, Venue
+
+from benchmarks.synthetic import VENUE, equities, minute_bars, minute_frame
+from src.config import ExecutionConfig
+from src.execution.engine import ExecutionEngine
+from src.execution.orders import OrderSubmitter
+from src.instrumentation import NullRecorder
+
+# Execution configs per algo in src/execution/algos/
+ALGOS = {
+    "market": dict(algo="market"),
+    "twap": dict(algo="twap"),
+    "pov": dict(algo="pov"),
+    "vwap": dict(algo="vwap"),
+    "vwap_passive": dict(algo="vwap", passive=True),
+}
+
+
+class BenchStrategy:
+    """
+    The slice of ``MomentumStrategy`` the execution engine uses.
+
+    Orders are built by a real ``OrderFactory``; submitted children fill in
+    full at once (resting limits included) and cancels close the child, so
+    the engine's bookkeeping runs as in a backtest without the venue.
+    """
+
+    def __init__(self, instruments):
+        self.venue = Venue(VENUE)
+        self.latency = NullRecorder()
+        self.order_factory = OrderFactory(TraderId("BENCH-001"), StrategyId("Bench-001"), TestClock())
+        self._instruments = {i.id: i for i in instruments}
+        self.cache = SimpleNamespace(instrument=self._instruments.get)
+        self.orders = OrderSubmitter(self)
+        self.execution: ExecutionEngine | None = None
+        self.submitted = 0
+
+    def submit_order(self, order):
+        self.submitted += 1
+        self.execution.on_order_filled(
+            SimpleNamespace(
+                client_order_id=order.client_order_id,
+                last_qty=order.quantity,
+                order_side=order.side,
+            )
+        )
+
+    def cancel_order(self, order):
+        self.execution.on_order_closed(SimpleNamespace(client_order_id=order.client_order_id))
+
+
+def run(sizes: List[int], minutes: int = 30, decision_every: int = 1) -> List[Dict]:
+    """
+    ``ExecutionEngine.on_bar`` throughput per algo and universe size.
+
+    Every ``decision_every`` minutes a fresh random target is netted into
+    the book for the whole universe (as the strategy does), then the
+    minute's bars are fed one by one through ``on_bar``.
+    """
+    records = []
+    for n in sizes:
+        instruments = equities(n)
+        instrument_ids = [i.id for i in instruments]
+        frame = minute_frame(n, days=1)
+        waves = minute_bars(frame[frame["date"] < frame["date"].iloc[0] + np.timedelta64(minutes, "m")])
+        rng = np.random.default_rng(0)
+        targets = [np.round(rng.normal(0.0, 500.0, n)) for _ in waves]
+
+        for name, overrides in ALGOS.items():
+            strategy = BenchStrategy(instruments)
+            engine = strategy.execution = ExecutionEngine(strategy, ExecutionConfig(**overrides))
+
+            n_bars = 0
+            t0 = time.perf_counter()
+            for minute, bars in enumerate(waves):
+                if minute % decision_every == 0:
+                    engine.submit_targets(instrument_ids, targets[minute], bars[0].ts_event)
+                for bar in bars:
+                    engine.on_bar(bar)
+                engine.flush()
+                n_bars += len(bars)
+            elapsed = time.perf_counter() - t0
+
+            records.append({
+                "suite": "execution",
+                "case": name,
+                "n": n,
+                "minutes": len(waves),
+                "bars": n_bars,
+                "orders": strategy.submitted,
+                "elapsed_s": elapsed,
+                "bars_per_s": n_bars / elapsed,
+                "us_per_bar": elapsed / n_bars * 1e6,
+            })
+            print(f"[execution] {name:<12} n={n:<6} {records[-1]['bars_per_s']:,.0f} bars/s, {strategy.submitted:,} orders")
+    return records
@@ -0,0 +1,71 @@
+# benchmarks/bench_ingest.py
+from __future__ import annotations
+
+import importlib
+import os
+import shutil
+import time
+from typing import Dict, List
+
+from benchmarks.synthetic import minute_frame, write_csv
+
+
+def catalog_dir(workdir: str, n: int, days: int) -> str:
+    return os.path.join(workdir, f"catalog_n{n}_d{days}")
+
+
+def _ingest_module(catalog_path: str):
+    """
+    The ingestion script, pointed at ``catalog_path``.
+
+    The script binds its catalog from ``NAUTILUS_ROOT`` at import; the
+    environment is set first (spawned ingest workers inherit it) and the
+    module globals are re-pointed for every later catalog.
+    """
+    from nautilus_trader.persistence.catalog import ParquetDataCatalog
+
+    os.environ["NAUTILUS_ROOT"] = catalog_path
+    module = importlib.import_module("provider.ingest_data_nt")
+    module.catalog_path = catalog_path
+    module.catalog = ParquetDataCatalog(path=catalog_path)
+    return module
+
+
+def build_catalog(workdir: str, n: int, days: int = 1, workers: int | None = None) -> Dict:
+    """
+    Generate the synthetic CSV for ``n`` instruments and ingest it into a
+    fresh catalog under ``workdir``; returns the catalog path and timings.
+    """
+    path = catalog_dir(workdir, n, days)
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+    frame = minute_frame(n, days=days)
+    csv_path = write_csv(frame, os.path.join(workdir, f"minutes_n{n}_d{days}.csv"))
+
+    ingest = _ingest_module(path)
+    t0 = time.perf_counter()
+    ingest.ingest_equities(csv_path, workers=workers, incremental=False)
+    elapsed = time.perf_counter() - t0
+
+    return {"catalog": path, "rows": len(frame), "csv_mb": os.path.getsize(csv_path) / 2**20, "elapsed_s": elapsed}
+
+
+def run(sizes: List[int], workdir: str, days: int = 1, workers: int | None = None) -> List[Dict]:
+    """Full (non-incremental) ``ingest_equities`` throughput in minute rows per second."""
+    records = []
+    for n in sizes:
+        built = build_catalog(workdir, n, days, workers)
+        records.append({
+            "suite": "ingest",
+            "case": "full",
+            "n": n,
+            "days": days,
+            "workers": workers or os.cpu_count() or 1,
+            "rows": built["rows"],
+            "csv_mb": built["csv_mb"],
+            "elapsed_s": built["elapsed_s"],
+            "rows_per_s": built["rows"] / built["elapsed_s"],
+        })
+        print(f"[ingest] n={n:<6} {records[-1]['rows_per_s']:,.0f} rows/s")
+    return records
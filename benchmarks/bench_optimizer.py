@@ -0,0 +1,106 @@
+# benchmarks/bench_optimizer.py
+from __future__ import annotations
+
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.alpha import PositionOptimizer
+
+# Solve paths: loose limits stay closed form, a tight net-delta limit takes
+# the multiplier root solve (warm-started from the previous solve, as in the
+# decision loop, or cold on a fresh optimizer), and the full problem goes
+# through cvxpy
+CASES = ("closed_form", "bisection", "bisection_cold", "cvxpy")
+
+
+def inputs(n: int, seed: int = 0) -> Dict[str, pd.Series]:
+    """Optimizer inputs shaped like the strategy's, for ``n`` instruments."""
+    rng = np.random.default_rng(seed)
+    index = [f"S{i:05d}" for i in range(n)]
+    return {
+        "alpha": pd.Series(rng.standard_normal(n), index=index),
+        "current_position_usd": pd.Series(rng.normal(0.0, 10_000.0, n), index=index),
+        "trading_cost": pd.Series(0.005, index=index),
+        "risk_lambda": pd.Series(0.001, index=index),
+        "clip_pos_usd": pd.Series(50_000.0, index=index),
+        "clip_trd_usd": pd.Series(50_000.0, index=index),
+        "factor_loading": pd.Series(rng.standard_normal(n), index=index),
+    }
+
+
+def cvxpy_solver() -> str:
+    import cvxpy as cp
+
+    return "MOSEK" if "MOSEK" in cp.installed_solvers() else "SCS"
+
+
+def run(sizes: List[int], repeats: int = 20, cvxpy_max_n: int = 1000) -> List[Dict]:
+    """
+    Solve time of ``PositionOptimizer.solve`` per path and universe size.
+
+    Each case solves the array inputs directly, as the decision loop does,
+    with alpha perturbed by 1% between solves so warm starts see a moving
+    problem. ``bisection_cold`` forgets the previous multiplier before every
+    solve; the cvxpy case runs with the fast path off and its first call,
+    which builds and compiles the problem, is reported separately. Sizes
+    above ``cvxpy_max_n`` skip the cvxpy path.
+    """
+    records = []
+    solver = cvxpy_solver()
+    for n in sizes:
+        data = {name: series.values for name, series in inputs(n).items()}
+        rng = np.random.default_rng(n)
+        alphas = [data["alpha"] * (1.0 + 0.01 * rng.standard_normal(n)) for _ in range(repeats + 1)]
+        for case in CASES:
+            if case == "cvxpy" and n > cvxpy_max_n:
+                continue
+
+            optimizer = PositionOptimizer(solver=solver, fast_path=case != "cvxpy")
+            max_delta = 1_000.0 if case.startswith("bisection") else 1e12
+
+            def solve(alpha):
+                if case == "bisection_cold":
+                    optimizer._multipliers.clear()
+                optimizer.solve(
+                    alpha=alpha,
+                    x0=data["current_position_usd"],
+                    cost=data["trading_cost"],
+                    lam=data["risk_lambda"],
+                    pos_cap=data["clip_pos_usd"],
+                    trd_cap=data["clip_trd_usd"],
+                    factor_loading=data["factor_loading"],
+                    max_factor_exposure=1e12,
+                    max_delta=max_delta,
+                )
+                return optimizer.last_method, optimizer.last_iterations
+
+            t0 = time.perf_counter()
+            solve(alphas[0])
+            first_ms = (time.perf_counter() - t0) * 1e3
+
+            times = np.empty(repeats)
+            iterations = np.empty(repeats)
+            for i in range(repeats):
+                t0 = time.perf_counter()
+                method, iterations[i] = solve(alphas[i + 1])
+                times[i] = (time.perf_counter() - t0) * 1e3
+
+            records.append({
+                "suite": "optimizer",
+                "case": case,
+                "n": n,
+                "method": method,
+                "iterations": float(iterations.mean()),
+                "first_ms": first_ms,
+                "p50_ms": float(np.median(times)),
+                "p90_ms": float(np.quantile(times, 0.9)),
+                "solves_per_s": float(1e3 / times.mean()),
+            })
+            print(
+                f"[optimizer] {case:<14} n={n:<6} p50 {records[-1]['p50_ms'] * 1e3:,.0f} us "
+                f"({method}, {records[-1]['iterations']:.1f} iterations)"
+            )
+    return records
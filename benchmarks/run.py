@@ -0,0 +1,156 @@
+# benchmarks/run.py
+"""
+Benchmark suite for the optimizer, execution and end-to-end hot paths.
+
+    python benchmarks/run.py                              # every suite, default sizes
+    python benchmarks/run.py --suites optimizer execution --sizes 100 1000
+    python benchmarks/run.py --baseline benchmarks/results/<old>.json
+
+Results (one record per suite / case / size, plus the commit, versions and
+machine) are written as JSON to ``--output`` (default
+``benchmarks/results/<commit>.json``); with ``--baseline`` the run is
+compared against an earlier file and regressions beyond ``--threshold``
+make the exit status non-zero.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+# Repo root on the path so the suites can import src/ and provider/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SUITES = ("optimizer", "execution", "ingest", "backtest")
+
+# Throughput metric per suite (higher is better) used for comparisons
+METRICS = {
+    "optimizer": "solves_per_s",
+    "execution": "bars_per_s",
+    "ingest": "rows_per_s",
+    "backtest": "bars_per_s",
+}
+
+
+def git_revision() -> Dict[str, object]:
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown", "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def environment() -> Dict[str, object]:
+    import nautilus_trader
+    import numpy
+
+    return {
+        "python": platform.python_version(),
+        "nautilus_trader": nautilus_trader.__version__,
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(records: List[Dict], baseline: List[Dict], threshold: float) -> List[Dict]:
+    """Throughput ratio (new / baseline) per record present in both runs."""
+    def key(record):
+        return record["suite"], record["case"], record["n"]
+
+    old = {key(r): r for r in baseline}
+    rows = []
+    for record in records:
+        before = old.get(key(record))
+        metric = METRICS[record["suite"]]
+        if before is None or not before.get(metric):
+            continue
+        ratio = record[metric] / before[metric]
+        rows.append({
+            "suite": record["suite"],
+            "case": record["case"],
+            "n": record["n"],
+            "metric": metric,
+            "baseline": before[metric],
+            "current": record[metric],
+            "ratio": ratio,
+            "regression": ratio < 1.0 - threshold,
+        })
+    return rows
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 5000],
+                        help="universe sizes for the optimizer and execution suites")
+    parser.add_argument("--backtest-sizes", nargs="+", type=int, default=[100],
+                        help="universe sizes for the ingest and end-to-end suites")
+    parser.add_argument("--days", type=int, default=1, help="sessions of synthetic data (ingest / backtest)")
+    parser.add_argument("--repeats", type=int, default=20, help="timed solves per optimizer case")
+    parser.add_argument("--minutes", type=int, default=30, help="minutes replayed per execution case")
+    parser.add_argument("--workdir", default=None, help="synthetic CSVs and catalogs (default: a temp dir)")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="throughput drop flagged as a regression")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="nautilus_bench_")
+    os.makedirs(workdir, exist_ok=True)
+
+    records: List[Dict] = []
+    t0 = time.perf_counter()
+    if "optimizer" in args.suites:
+        from benchmarks import bench_optimizer
+
+        records += bench_optimizer.run(args.sizes, repeats=args.repeats)
+    if "execution" in args.suites:
+        from benchmarks import bench_execution
+
+        records += bench_execution.run(args.sizes, minutes=args.minutes)
+    if "ingest" in args.suites:
+        from benchmarks import bench_ingest
+
+        records += bench_ingest.run(args.backtest_sizes, workdir, days=args.days)
+    if "backtest" in args.suites:
+        from benchmarks import bench_backtest
+
+        records += bench_backtest.run(args.backtest_sizes, workdir, days=args.days)
+
+    revision = git_revision()
+    report = {
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment(),
+        "args": vars(args),
+        "elapsed_s": time.perf_counter() - t0,
+        "records": records,
+    }
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{revision['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Benchmark results written to {output}")
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare(records, baseline["records"], args.threshold)
+    print(f"Against {baseline['revision']['commit']} (throughput ratio, regression below {1 - args.threshold:.2f}):")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"  {row['suite']:<10} {row['case']:<12} n={row['n']:<6} {row['ratio']:6.2f}x{flag}")
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# benchmarks/synthetic.py
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from nautilus_trader.model.currencies import USD
+from nautilus_trader.model.data import Bar, BarType
+from nautilus_trader.model.identifiers import InstrumentId, Symbol, Venue
+from nautilus_trader.model.instruments import Equity
+from nautilus_trader.model.objects import Price, Quantity
+
+VENUE = "XNYS"
+SESSION_MINUTES = 390
+
+
+def symbols(n: int) -> List[str]:
+    return [f"S{i:05d}" for i in range(n)]
+
+
+def minute_frame(n_instruments: int, days: int = 1, start: str = "2024-10-01", seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic regular-session minute bars in the ingestion CSV layout.
+
+    Columns are ``date`` (naive New York time), ``symbol`` and OHLCV, sorted
+    by date then symbol. Closes follow a seeded geometric random walk per
+    symbol, so the same arguments always produce the same frame.
+    """
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range(start, periods=days)
+    minutes = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta(hours=9, minutes=30), periods=SESSION_MINUTES, freq="1min")
+        for day in sessions
+    ]))
+    t, n = len(minutes), n_instruments
+
+    start_px = rng.uniform(20.0, 200.0, n)
+    close = start_px * np.exp(np.cumsum(rng.normal(0.0, 0.001, (t, n)), axis=0))
+    open_ = np.vstack([start_px, close[:-1]])
+    spread = np.abs(rng.normal(0.0, 0.0005, (t, n)))
+    high = np.maximum(open_, close) * (1.0 + spread)
+    low = np.minimum(open_, close) * (1.0 - spread)
+    volume = rng.integers(100, 10_000, (t, n))
+
+    return pd.DataFrame({
+        "date": np.repeat(minutes, n),
+        "symbol": np.tile(symbols(n), t),
+        "open": open_.ravel().round(2),
+        "high": high.ravel().round(2),
+        "low": low.ravel().round(2),
+        "close": close.ravel().round(2),
+        "volume": volume.ravel(),
+    })
+
+
+def write_csv(frame: pd.DataFrame, path: str) -> str:
+    frame.to_csv(path, index=False)
+    return path
+
+
+def equities(n_instruments: int) -> List[Equity]:
+    """Equity definitions matching the ingestion script's."""
+    return [
+        Equity(
+            instrument_id=InstrumentId(symbol=Symbol(symbol), venue=Venue(VENUE)),
+            raw_symbol=Symbol(symbol),
+            currency=USD,
+            price_precision=2,
+            price_increment=Price.from_str("0.01"),
+            lot_size=Quantity.from_int(100),
+            ts_event=0,
+            ts_init=0,
+        )
+        for symbol in symbols(n_instruments)
+    ]
+
+
+def minute_bars(frame: pd.DataFrame) -> List[List[Bar]]:
+    """Nautilus 1-MINUTE bars of ``frame``, grouped per timestamp (ts_event = minute open, UTC)."""
+    ts = (
+        pd.DatetimeIndex(frame["date"]).tz_localize("America/New_York").tz_convert("UTC").asi8
+    ).astype(np.uint64)
+    bar_types = {
+        symbol: BarType.from_str(f"{symbol}.{VENUE}-1-MINUTE-LAST-EXTERNAL")
+        for symbol in frame["symbol"].unique()
+    }
+
+    bars = [
+        Bar(
+            bar_types[symbol],
+            Price(o, 2), Price(h, 2), Price(l, 2), Price(c, 2),
+            Quantity(v, 0),
+            int(t), int(t),
+        )
+        for symbol, o, h, l, c, v, t in zip(
+            frame["symbol"], frame["open"], frame["high"], frame["low"], frame["close"], frame["volume"], ts
+        )
+    ]
+
+    # Frames are sorted by date, so one timestamp is a contiguous run
+    _, starts = np.unique(ts, return_index=True)
+    edges = [*starts, len(bars)]
+    return [bars[a:b] for a, b in zip(edges[:-1], edges[1:])]
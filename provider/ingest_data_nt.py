@@ -1,7 +1,16 @@
 from dotenv import load_dotenv
+import hashlib
+import json
+import multiprocessing
 import os
+import shutil
+import sys
+import tempfile
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from nautilus_trader.model.data import Bar, BarType, BarSpecification, BarAggregation
 from nautilus_trader.model.instruments import Equity
@@ -14,6 +23,10 @@ from nautilus_trader.common.config import NautilusConfig
 
 from nautilus_trader.core.rust.model import PriceType
 
+# Repo root on the path so the script can share src/ helpers
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.liquidity import build_liquidity_index, load_liquidity_index, update_liquidity_index
+
 
 load_dotenv()
 
@@ -29,85 +42,313 @@ venue = Venue("XNYS")
 #end_date = pd.Timestamp('2025-09-11', tz='UTC')  # 9:02 PM JST = ~12:02 PM UTC
 #overwrite_start_date = None  # Set to pd.Timestamp('2025-09-01', tz='UTC') for overwriting
 
-def ingest_equities():
-    # Load OHLCV data
-    df_minute = pd.read_csv(f'{os.getenv("SIMULATE_DATA")}/simulated_intraday_stocks.csv', parse_dates=['date'])
-    df_minute['date'] = pd.to_datetime(df_minute['date']).dt.tz_localize('America/New_York').dt.tz_convert('UTC')
-
-    # Aggregate daily data
-    df_daily = df_minute.groupby([df_minute['symbol'], df_minute['date'].dt.date]).agg({
-        'open': 'first',
-        'high': 'max',
-        'low': 'min',
-        'close': 'last',
-        'volume': 'sum'
-    }).reset_index()
-    df_daily['date'] = pd.to_datetime(df_daily['date']).dt.tz_localize('UTC')
+# Streaming / parallelism
+CSV_BLOCK_SIZE = 64 << 20      # bytes of CSV decoded per chunk
+BUCKETS_PER_WORKER = 4         # symbol hash-partitions per worker process
 
-    '''
-    # Load fundamental data
-    df_sectors = pro.stock_basic(exchange='SSE', fields='ts_code,symbol,industry')
-    df_sectors['symbol'] = df_sectors['ts_code'].str.replace('.SH', '', regex=False)
-    df_sectors = df_sectors[['symbol', 'industry']].drop_duplicates()
-
-    df_earnings = pd.DataFrame()
-    for symbol in df_sectors['symbol'][:100]:  # Limit to 100 for testing
-        df_e = pro.income(ts_code=f"{symbol}.SH", start_date='20200101', end_date='20250911', fields='ts_code,ann_date,end_date,eps')
-        df_e['symbol'] = symbol
-        df_e['date'] = pd.to_datetime(df_e['ann_date']).dt.tz_localize('UTC')
-        df_earnings = pd.concat([df_earnings, df_e[['symbol', 'date', 'eps']]])
-
-    # Filter for append/overwrite
-    if overwrite_start_date:
-        df_minute = df_minute[df_minute['date'] >= overwrite_start_date]
-        df_daily = df_daily[df_daily['date'] >= overwrite_start_date]
-        df_earnings = df_earnings[df_earnings['date'] >= overwrite_start_date]
-    '''
+OHLCV = ['open', 'high', 'low', 'close', 'volume']
+MANIFEST_FILE = 'ingest_manifest.json'
+minute_spec = BarSpecification(1, BarAggregation.MINUTE, PriceType.LAST)
+daily_spec = BarSpecification(1, BarAggregation.DAY, PriceType.LAST)
 
-    # Define instrument
-    instruments = []
-    for symbol in sorted(df_daily['symbol'].unique()):  # Limit to 100 for testing
-        #sector = df_sectors[df_sectors['symbol'] == symbol]['industry'].iloc[0] if symbol in df_sectors['symbol'].values else 'Unknown'
-        instrument = Equity(
-            instrument_id=InstrumentId(symbol=Symbol(symbol), venue=venue),
-            raw_symbol=Symbol(symbol),
-            currency=USD,
-            price_precision=2,
-            price_increment=Price.from_str("0.01"),
-            lot_size=Quantity.from_int(100),
-            ts_event=int(pd.Timestamp.now(tz='UTC').timestamp() * 1e9),
-            ts_init=int(pd.Timestamp.now(tz='UTC').timestamp() * 1e9)
-        )
-        instruments.append(instrument)
-        catalog.write_data([instrument])
-
-    # Ingest minute bars
-    minute_spec = BarSpecification(1, BarAggregation.MINUTE, PriceType.LAST)
-    for i, symbol in enumerate(sorted(df_daily['symbol'].unique())):
-        minute_type = BarType(instrument_id=instruments[i].id, bar_spec=minute_spec)
-        instrument = instruments[i]
-        wrangler = BarDataWrangler(bar_type=minute_type, instrument=instrument)
-        df = df_minute[df_minute['symbol'] == symbol][['date', 'open', 'high', 'low', 'close', 'volume']].round(2)
-        df.rename(columns={'date': 'timestamp'}, inplace=True)
-        df = df.set_index('timestamp')
-        bars = wrangler.process(
-            data=df,
-        )
-        catalog.write_data(data=bars)
-
-    # Ingest daily bars
-    daily_spec = BarSpecification(1, BarAggregation.DAY, PriceType.LAST)
-    for i, symbol in enumerate(sorted(df_daily['symbol'].unique())):
-        daily_type = BarType(instrument_id=instruments[i].id, bar_spec=daily_spec)
-        instrument = instruments[i]
-        wrangler = BarDataWrangler(bar_type=daily_type, instrument=instrument)
-        df = df_daily[df_daily['symbol'] == symbol][['date', 'open', 'high', 'low', 'close', 'volume']].round(2)
-        df.rename(columns={'date': 'timestamp'}, inplace=True)
-        df = df.set_index('timestamp')
-        bars = wrangler.process(
-            data=df,
-        )
-        catalog.write_data(data=bars)
+
+def make_equity(symbol: str, ts: int = 0) -> Equity:
+    # ts is the first bar time, so a rerun produces an identical definition
+    return Equity(
+        instrument_id=InstrumentId(symbol=Symbol(symbol), venue=venue),
+        raw_symbol=Symbol(symbol),
+        currency=USD,
+        price_precision=2,
+        price_increment=Price.from_str("0.01"),
+        lot_size=Quantity.from_int(100),
+        ts_event=ts,
+        ts_init=ts,
+    )
+
+
+def instrument_fingerprint(instrument: Equity) -> str:
+    """Hash of the definition fields (timestamps excluded)."""
+    fields = (
+        instrument.id, instrument.raw_symbol, instrument.quote_currency,
+        instrument.price_precision, instrument.price_increment, instrument.lot_size,
+    )
+    return hashlib.sha1('|'.join(map(str, fields)).encode()).hexdigest()
+
+
+def source_fingerprint(csv_path: str) -> dict:
+    stat = os.stat(csv_path)
+    return {'path': os.path.abspath(csv_path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def load_manifest(path: str) -> dict:
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {'source': None, 'instruments': {}, 'bars': {}}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def save_manifest(path: str, manifest: dict):
+    manifest_path = os.path.join(path, MANIFEST_FILE)
+    tmp_path = f'{manifest_path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def bar_type_str(symbol: str, bar_spec: BarSpecification) -> str:
+    return f'{symbol}.{venue}-{bar_spec}-EXTERNAL'
+
+
+def last_ingested(manifest: dict, symbol: str, bar_spec: BarSpecification):
+    """Last ingested bar time (UTC) for a symbol, from the manifest or the catalog."""
+    bar_type = bar_type_str(symbol, bar_spec)
+    if bar_type in manifest['bars']:
+        return pd.Timestamp(manifest['bars'][bar_type], tz='UTC')
+    return catalog.query_last_timestamp(Bar, identifier=bar_type)
+
+
+def read_minute_chunks(csv_path: str, block_size: int = CSV_BLOCK_SIZE):
+    """Stream the minute CSV in blocks, yielding frames with UTC timestamps."""
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        convert_options=pacsv.ConvertOptions(
+            column_types={'date': pa.timestamp('ns'), 'symbol': pa.string()},
+        ),
+    )
+    for batch in reader:
+        df = batch.to_pandas()
+        df['date'] = df['date'].dt.tz_localize('America/New_York').dt.tz_convert('UTC')
+        yield df
+
+
+def daily_partials(df: pd.DataFrame) -> pd.DataFrame:
+    """Per (symbol, UTC date) partial OHLCV of one chunk, combinable across chunks."""
+    day = df['date'].dt.tz_localize(None).dt.normalize()
+    grouped = df.assign(day=day).sort_values('date').groupby(['symbol', 'day'], sort=False)
+    return grouped.agg(
+        first_ts=('date', 'first'),
+        last_ts=('date', 'last'),
+        open=('open', 'first'),
+        high=('high', 'max'),
+        low=('low', 'min'),
+        close=('close', 'last'),
+        volume=('volume', 'sum'),
+    ).reset_index()
+
+
+def combine_daily(partials: pd.DataFrame) -> pd.DataFrame:
+    """Reduce chunk partials to one daily bar per symbol and date."""
+    keys = ['symbol', 'day']
+    daily = partials.sort_values('first_ts').groupby(keys).agg(
+        open=('open', 'first'),
+        high=('high', 'max'),
+        low=('low', 'min'),
+        volume=('volume', 'sum'),
+        last_ts=('last_ts', 'max'),
+    )
+    daily['close'] = partials.sort_values('last_ts').groupby(keys)['close'].last()
+    daily = daily.reset_index().rename(columns={'day': 'date'})
+    daily['date'] = daily['date'].dt.tz_localize('UTC')
+    return daily[['symbol', 'date'] + OHLCV + ['last_ts']]
+
+
+def symbol_buckets(symbols: pd.Series, n_buckets: int):
+    """Stable hash partition of symbols (identical across processes and runs)."""
+    return pd.util.hash_pandas_object(symbols, index=False).to_numpy() % n_buckets
+
+
+def _wrangle(instrument: Equity, bar_spec: BarSpecification, df: pd.DataFrame):
+    bar_type = BarType(instrument_id=instrument.id, bar_spec=bar_spec)
+    wrangler = BarDataWrangler(bar_type=bar_type, instrument=instrument)
+    df = df[['date'] + OHLCV].round(2).rename(columns={'date': 'timestamp'}).set_index('timestamp')
+    return wrangler.process(data=df)
+
+
+def ingest_bucket(catalog_path: str, bucket_dir: str, df_daily: pd.DataFrame) -> dict:
+    """
+    Wrangle and write every symbol of one hash bucket.
+
+    Runs in a worker process: the bucket's spooled minute rows are read back,
+    split per symbol with a single groupby, and all bars of a bar spec are
+    written in one catalog call. Returns the last bar time written per bar
+    type.
+    """
+    bucket_catalog = ParquetDataCatalog(path=catalog_path)
+    df_minute = (
+        pd.read_parquet(bucket_dir).sort_values(['symbol', 'date'], kind='stable')
+        if os.path.isdir(bucket_dir)
+        else pd.DataFrame(columns=['symbol', 'date'] + OHLCV)
+    )
+
+    minute_bars, daily_bars, last_ts = [], [], {}
+    for symbol, df in df_minute.groupby('symbol', sort=True):
+        minute_bars.extend(_wrangle(make_equity(symbol), minute_spec, df))
+        last_ts[bar_type_str(symbol, minute_spec)] = int(df['date'].iloc[-1].value)
+    for symbol, df in df_daily.groupby('symbol', sort=True):
+        daily_bars.extend(_wrangle(make_equity(symbol), daily_spec, df))
+        last_ts[bar_type_str(symbol, daily_spec)] = int(df['date'].iloc[-1].value)
+
+    if minute_bars:
+        bucket_catalog.write_data(data=minute_bars)
+    if daily_bars:
+        bucket_catalog.write_data(data=daily_bars)
+    return last_ts
+
+def ingest_equities(
+    csv_path: str | None = None,
+    workers: int | None = None,
+    block_size: int = CSV_BLOCK_SIZE,
+    incremental: bool = True,
+):
+    """
+    Stream the minute CSV into the catalog.
+
+    The file is read in blocks; each block is hash-partitioned by symbol into
+    spool files and folded into the daily aggregates in the same pass, so
+    memory is bounded by the block size. Buckets of symbols are then
+    wrangled and written in parallel worker processes.
+
+    In incremental mode only minute rows newer than the last ingested bar of
+    each symbol are written, daily bars are appended for new days (the last
+    ingested day is restated if it received new rows), unchanged instrument
+    definitions are skipped, and a manifest in the catalog records what was
+    ingested so an unchanged source is a no-op.
+    """
+    csv_path = csv_path or f'{os.getenv("SIMULATE_DATA")}/simulated_intraday_stocks.csv'
+    workers = workers or os.cpu_count() or 1
+    n_buckets = workers * BUCKETS_PER_WORKER
+
+    manifest = load_manifest(catalog_path) if incremental else {'source': None, 'instruments': {}, 'bars': {}}
+    source = source_fingerprint(csv_path)
+    if incremental and manifest['source'] == source:
+        print(f'Catalog is up to date with {csv_path}, nothing to ingest')
+        return
+
+    spool_dir = tempfile.mkdtemp(prefix='ingest_spool_')
+
+    try:
+        # Load OHLCV data: one pass for filtering, partitioning and daily aggregation
+        minute_cutoff, daily_cutoff = {}, {}
+        partials = []
+        n_rows = n_new = 0
+        for k, chunk in enumerate(read_minute_chunks(csv_path, block_size)):
+            n_rows += len(chunk)
+            if incremental:
+                for symbol in set(chunk['symbol'].unique()) - minute_cutoff.keys():
+                    minute_cutoff[symbol] = last_ingested(manifest, symbol, minute_spec)
+                    daily_cutoff[symbol] = last_ingested(manifest, symbol, daily_spec)
+
+                day = chunk['date'].dt.normalize()
+                cut = pd.to_datetime(chunk['symbol'].map(minute_cutoff), utc=True)
+                day_cut = pd.to_datetime(chunk['symbol'].map(daily_cutoff), utc=True)
+                daily_rows = chunk[day_cut.isna() | (day >= day_cut)]
+                chunk = chunk[cut.isna() | (chunk['date'] > cut)]
+            else:
+                daily_rows = chunk
+
+            if len(daily_rows):
+                partials.append(daily_partials(daily_rows))
+            n_new += len(chunk)
+            for bucket, part in chunk.groupby(symbol_buckets(chunk['symbol'], n_buckets), sort=False):
+                bucket_dir = os.path.join(spool_dir, f'bucket={bucket}')
+                os.makedirs(bucket_dir, exist_ok=True)
+                part.to_parquet(os.path.join(bucket_dir, f'part-{k:06d}.parquet'), index=False)
+
+        print(f'Read {n_rows} minute rows, {n_new} new')
+
+        # Aggregate daily data
+        if partials:
+            partials = pd.concat(partials, ignore_index=True)
+            df_daily = combine_daily(partials)
+            first_seen = partials.groupby('symbol')['first_ts'].min()
+        else:
+            df_daily = pd.DataFrame(columns=['symbol', 'date'] + OHLCV + ['last_ts'])
+            first_seen = pd.Series(dtype=object)
+
+        if incremental and len(df_daily):
+            # The last ingested day is re-aggregated from the full source and
+            # its daily bar restated, but only if it received new minute rows
+            day_cut = pd.to_datetime(df_daily['symbol'].map(daily_cutoff), utc=True)
+            minute_cut = pd.to_datetime(df_daily['symbol'].map(minute_cutoff), utc=True)
+            on_cut_day = df_daily['date'] == day_cut
+            has_new = minute_cut.isna() | (df_daily['last_ts'] > minute_cut)
+            for symbol, date in df_daily.loc[on_cut_day & has_new, ['symbol', 'date']].itertuples(index=False):
+                catalog.delete_data_range(Bar, identifier=bar_type_str(symbol, daily_spec), start=date, end=date)
+            df_daily = df_daily[~on_cut_day | has_new]
+
+        '''
+        # Load fundamental data
+        df_sectors = pro.stock_basic(exchange='SSE', fields='ts_code,symbol,industry')
+        df_sectors['symbol'] = df_sectors['ts_code'].str.replace('.SH', '', regex=False)
+        df_sectors = df_sectors[['symbol', 'industry']].drop_duplicates()
+
+        df_earnings = pd.DataFrame()
+        for symbol in df_sectors['symbol'][:100]:  # Limit to 100 for testing
+            df_e = pro.income(ts_code=f"{symbol}.SH", start_date='20200101', end_date='20250911', fields='ts_code,ann_date,end_date,eps')
+            df_e['symbol'] = symbol
+            df_e['date'] = pd.to_datetime(df_e['ann_date']).dt.tz_localize('UTC')
+            df_earnings = pd.concat([df_earnings, df_e[['symbol', 'date', 'eps']]])
+
+        # Filter for append/overwrite
+        if overwrite_start_date:
+            df_minute = df_minute[df_minute['date'] >= overwrite_start_date]
+            df_daily = df_daily[df_daily['date'] >= overwrite_start_date]
+            df_earnings = df_earnings[df_earnings['date'] >= overwrite_start_date]
+        '''
+
+        # Define instrument (single batched write, unchanged definitions skipped)
+        instruments = []
+        for symbol, ts in first_seen.sort_index().items():
+            instrument = make_equity(symbol, ts=int(ts.value))
+            fingerprint = instrument_fingerprint(instrument)
+            if manifest['instruments'].get(symbol) != fingerprint:
+                instruments.append(instrument)
+                manifest['instruments'][symbol] = fingerprint
+        if instruments:
+            catalog.write_data(instruments)
+
+        # Ingest minute and daily bars per symbol bucket in parallel
+        daily_buckets = symbol_buckets(df_daily['symbol'], n_buckets)
+        bucket_ids = [
+            bucket for bucket in range(n_buckets)
+            if os.path.isdir(os.path.join(spool_dir, f'bucket={bucket}'))
+            or (daily_buckets == bucket).any()
+        ]
+        with ProcessPoolExecutor(
+            max_workers=max(1, min(workers, len(bucket_ids))),
+            mp_context=multiprocessing.get_context('spawn'),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    ingest_bucket,
+                    catalog_path,
+                    os.path.join(spool_dir, f'bucket={bucket}'),
+                    df_daily[daily_buckets == bucket],
+                )
+                for bucket in bucket_ids
+            ]
+            for future in futures:
+                manifest['bars'].update(future.result())
+
+        # Refresh the liquidity (ADV) index with the new daily bars; a catalog
+        # that predates the index is indexed in full (new days included)
+        if incremental and load_liquidity_index(catalog_path) is None:
+            build_liquidity_index(ParquetDataCatalog(path=catalog_path))
+        elif len(df_daily) or not incremental:
+            update_liquidity_index(
+                catalog_path,
+                df_daily.round(2).assign(instrument_id=df_daily['symbol'] + f'.{venue}'),
+                replace=not incremental,
+            )
+
+        manifest['source'] = source
+        save_manifest(catalog_path, manifest)
+
+        print(f'Ingested {len(instruments)} instrument definitions, {n_new} minute bars, {len(df_daily)} daily bars')
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
 
     '''
     # Ingest fundamental data
@@ -156,4 +397,4 @@ def ingest_equities():
 
 
 if __name__ == '__main__':
-    ingest_equities()
+    ingest_equities(incremental='--full' not in sys.argv[1:])
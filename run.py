@@ -1,7 +1,11 @@
 # run.py
 from __future__ import annotations
 
+import time
+_STARTED = time.perf_counter()
+
 from dotenv import load_dotenv
+from hydra.core.hydra_config import HydraConfig
 from hydra.utils import instantiate
 from omegaconf import DictConfig, OmegaConf
 
@@ -9,20 +13,66 @@ import os
 import pandas as pd
 import hydra
 
-from src.config import MomentumConfig
-from src.data import get_catalog, get_top_liquid_instruments, create_data_configs
-from src.engine import run_backtest
+from src.data import get_catalog, get_top_liquid_instruments, get_rolling_universe, create_data_configs
+from src.startup import StartupProfile
 
 @hydra.main(version_base=None, config_path="conf", config_name="config")
 def main(cfg: DictConfig):
+    # Optional pieces (sessions, curves, cache, sharding, the engine) are
+    # imported where they are used; heavy third-party modules load lazily
+    profile = StartupProfile(_STARTED)
+    profile.mark("imports + config")
+
     # 1. Prepare Data
     load_dotenv()
     NAUTILUS_ROOT = os.getenv('NAUTILUS_ROOT')
     catalog = get_catalog(NAUTILUS_ROOT)
-    instruments = get_top_liquid_instruments(catalog,
-                                             limit=cfg.universe.top_n_instruments)
-    print(f"Selected Instruments: {instruments}")
-    data_configs = create_data_configs(NAUTILUS_ROOT, instruments)
+    session_cache_dir = cfg.strategy.session_cache_dir or os.path.join(NAUTILUS_ROOT, "sessions")
+    if cfg.universe.rolling:
+        from src.sessions import get_session_index
+
+        # Point-in-time universe per session; minute bars only while a member
+        sessions = get_session_index(cfg.backtest.venue,
+                                     cfg.backtest.start_date,
+                                     cfg.backtest.end_date,
+                                     cache_dir=session_cache_dir)
+        schedule, windows = get_rolling_universe(catalog,
+                                                 sessions.session_dates(),
+                                                 limit=cfg.universe.top_n_instruments,
+                                                 by=cfg.universe.rank_by,
+                                                 exit_days=cfg.universe.exit_days)
+        instruments = sorted(windows)
+        cfg.strategy.universe_schedule = schedule
+        print(f"Rolling universe: {len(schedule)} sessions, {len(instruments)} instruments")
+    else:
+        windows = None
+        instruments = get_top_liquid_instruments(catalog,
+                                                 limit=cfg.universe.top_n_instruments,
+                                                 as_of=cfg.universe.as_of or cfg.backtest.start_date,
+                                                 by=cfg.universe.rank_by)
+        print(f"Selected Instruments: {instruments}")
+    profile.mark("universe")
+    data_configs = create_data_configs(NAUTILUS_ROOT, instruments,
+                                       windows=windows,
+                                       start=cfg.backtest.start_date,
+                                       daily_lookback_days=cfg.backtest.daily_lookback_days)
+    market_cache = None
+    if cfg.backtest.market_cache:
+        from src.market_cache import build_market_cache
+
+        market_cache = build_market_cache(catalog, data_configs, root=cfg.backtest.market_cache_dir)
+    profile.mark("data configs / market cache")
+
+    # Intraday volume curves from the history before the backtest
+    if cfg.strategy.execution.volume_curve_dir:
+        from src.volume_curve import update_volume_curves
+
+        update_volume_curves(catalog,
+                             cfg.strategy.execution.volume_curve_dir,
+                             instruments,
+                             exchange=cfg.backtest.venue,
+                             end=cfg.backtest.start_date)
+        profile.mark("volume curves")
 
     # 2. Define Parameters
 
@@ -35,6 +85,11 @@ def main(cfg: DictConfig):
 
     starting_balances = list(cfg.backtest.starting_balances)
     cfg.strategy.instrument_ids = instruments
+    cfg.strategy.session_start = cfg.backtest.start_date
+    cfg.strategy.session_end = cfg.backtest.end_date
+    cfg.strategy.session_cache_dir = session_cache_dir
+    if cfg.strategy.instrumentation.enabled and cfg.strategy.instrumentation.output_dir is None:
+        cfg.strategy.instrumentation.output_dir = HydraConfig.get().runtime.output_dir
 
     strategy_config = instantiate(cfg.strategy, _convert_="all")
 
@@ -43,6 +98,35 @@ def main(cfg: DictConfig):
     print(strategy_config)
 
     # 3. Run
+    from src.engine import run_backtest
+    from src.sharding import run_sharded_backtest
+
+    profile.mark("strategy config + engine import")
+    if cfg.backtest.shard:
+        report = run_sharded_backtest(
+            strategy_path=strategy_path,
+            config_path=config_path,
+            strategy_config=strategy_config,
+            venue_name=venue,
+            data_configs=data_configs,
+            start=start_date,
+            end=end_date,
+            starting_balances=starting_balances,
+            shard=cfg.backtest.shard,
+            mode=cfg.backtest.shard_mode,
+            max_workers=cfg.backtest.max_workers,
+            chunk_size=cfg.backtest.chunk_size,
+            market_cache=market_cache,
+        )
+        output_dir = HydraConfig.get().runtime.output_dir
+        for name in ("summary", "fills", "positions", "account"):
+            report[name].to_csv(os.path.join(output_dir, f"shards_{name}.csv"))
+        print(report["summary"].to_string())
+        print(f"Total PnL: {report['total_pnl']}")
+        profile.mark("sharded backtest")
+        print(profile.report())
+        return
+
     results = run_backtest(
         strategy_path=strategy_path,
         config_path=config_path,
@@ -52,9 +136,13 @@ def main(cfg: DictConfig):
         start=start_date,
         end=end_date,
         starting_balances=starting_balances,
+        chunk_size=cfg.backtest.chunk_size,
+        market_cache=market_cache,
     )
 
     print(results)
+    profile.mark("backtest (build + run)")
+    print(profile.report())
 
 if __name__ == '__main__':
     main()
@@ -2,9 +2,333 @@
 from __future__ import annotations
 
 import numpy as np
-import cvxpy as cp
 import pandas as pd
 
+from .startup import lazy_import
+
+
+class PositionOptimizer:
+    """
+    Persistent USD target-position optimizer.
+
+    Without the delta / factor constraints the objective is separable per
+    instrument and is solved in closed form (soft-threshold then clip). A
+    single binding delta or factor constraint is handled by a root solve on
+    its multiplier, seeded from the previous solve's multiplier.
+
+    Everything else falls back to a cvxpy problem, solved with ``solver``
+    (any cvxpy solver name; Clarabel ships with cvxpy), that is built once
+    per universe size (and constraint set) with ``cp.Parameter`` inputs, so
+    each call only updates parameter values and re-solves, warm-starting
+    from the previous solution. cvxpy itself is only imported by the first
+    problem that needs it.
+    """
+
+    def __init__(self, solver: str = "CLARABEL", fast_path: bool = True):
+        self.solver = solver
+        self.fast_path = fast_path
+        self.last_method: str | None = None
+        # Status / iteration count of the last solve (0 iterations in closed form)
+        self.last_status: str | None = None
+        self.last_iterations: int = 0
+        self._problems = {}
+        # Multiplier of the last bisection per constraint (0: delta, 1: factor)
+        self._multipliers: dict[int, float] = {}
+
+    def _build(self, n: int, has_delta: bool, has_factor: bool):
+        cp = lazy_import("cvxpy")
+
+        # x: target positions, d: trades. Keeping d as a variable tied to x
+        # through an equality constraint keeps the problem DPP-compliant.
+        x = cp.Variable(n)
+        d = cp.Variable(n)
+
+        params = {
+            "alpha": cp.Parameter(n),
+            "x0": cp.Parameter(n),
+            "cost": cp.Parameter(n, nonneg=True),
+            "sqrt_lam": cp.Parameter(n, nonneg=True),
+            "pos_cap": cp.Parameter(n, nonneg=True),
+            "trd_cap": cp.Parameter(n, nonneg=True),
+        }
+
+        objective = cp.Maximize(
+            params["alpha"] @ x
+            - params["cost"] @ cp.abs(d)
+            - 0.5 * cp.sum_squares(cp.multiply(params["sqrt_lam"], x))
+        )
+
+        constraints = [
+            d == x - params["x0"],
+            cp.abs(x) <= params["pos_cap"],
+            cp.abs(d) <= params["trd_cap"],
+        ]
+
+        if has_delta:
+            params["max_delta"] = cp.Parameter(nonneg=True)
+            constraints.append(cp.abs(cp.sum(x)) <= params["max_delta"])
+
+        if has_factor:
+            params["factor"] = cp.Parameter(n)
+            params["max_factor"] = cp.Parameter(nonneg=True)
+            constraints.append(cp.abs(params["factor"] @ x) <= params["max_factor"])
+
+        return cp.Problem(objective, constraints), x, params
+
+    def solve(
+        self,
+        alpha: np.ndarray,
+        x0: np.ndarray,
+        cost: np.ndarray,
+        lam: np.ndarray,
+        pos_cap: np.ndarray,
+        trd_cap: np.ndarray,
+        factor_loading: np.ndarray | None = None,
+        max_factor_exposure: float | None = None,
+        max_delta: float = 0.0,
+    ) -> np.ndarray:
+        """
+        Optimize target positions (USD) for aligned input arrays.
+
+        Returns
+        -------
+        np.ndarray
+            Target positions in USD.
+        """
+        n = len(alpha)
+        has_delta = max_delta > 0
+        has_factor = factor_loading is not None and max_factor_exposure is not None
+
+        if self.fast_path:
+            target = self._solve_fast(
+                alpha, x0, cost, lam, pos_cap, trd_cap,
+                factor_loading if has_factor else None,
+                max_factor_exposure if has_factor else None,
+                max_delta if has_delta else None,
+            )
+            if target is not None:
+                return target
+
+        key = (n, has_delta, has_factor)
+        if key not in self._problems:
+            self._problems[key] = self._build(n, has_delta, has_factor)
+        problem, x, params = self._problems[key]
+
+        params["alpha"].value = np.asarray(alpha, dtype=float)
+        params["x0"].value = np.asarray(x0, dtype=float)
+        params["cost"].value = np.asarray(cost, dtype=float)
+        params["sqrt_lam"].value = np.sqrt(np.asarray(lam, dtype=float))
+        params["pos_cap"].value = np.asarray(pos_cap, dtype=float)
+        params["trd_cap"].value = np.asarray(trd_cap, dtype=float)
+        if has_delta:
+            params["max_delta"].value = float(max_delta)
+        if has_factor:
+            params["factor"].value = np.asarray(factor_loading, dtype=float)
+            params["max_factor"].value = float(max_factor_exposure)
+
+        try:
+            problem.solve(
+                solver=self.solver,
+                warm_start=True,
+                verbose=False,
+            )
+            if x.value is None:
+                raise ValueError("Solver returned None")
+        except Exception as exc:
+            raise RuntimeError(f"Optimization failed: {exc}")
+
+        self.last_method = "cvxpy"
+        self.last_status = problem.status
+        self.last_iterations = problem.solver_stats.num_iters or 0
+        return x.value.copy()
+
+    # -----------------------------
+    # Fast path (no cvxpy)
+    # -----------------------------
+
+    def _solve_fast(
+        self,
+        alpha,
+        x0,
+        cost,
+        lam,
+        pos_cap,
+        trd_cap,
+        factor_loading,
+        max_factor_exposure,
+        max_delta,
+    ) -> np.ndarray | None:
+        """
+        Solve with the closed form / single-multiplier bisection if possible.
+
+        Returns None when the problem is outside the fast path (zero risk
+        aversion, infeasible box, non-finite inputs, or both linear
+        constraints binding at once).
+        """
+        alpha = np.asarray(alpha, dtype=float)
+        x0 = np.asarray(x0, dtype=float)
+        cost = np.asarray(cost, dtype=float)
+        lam = np.asarray(lam, dtype=float)
+        pos_cap = np.asarray(pos_cap, dtype=float)
+        trd_cap = np.asarray(trd_cap, dtype=float)
+
+        lo = np.maximum(-pos_cap, x0 - trd_cap)
+        hi = np.minimum(pos_cap, x0 + trd_cap)
+
+        inputs = (alpha, x0, cost, lam, lo, hi)
+        if not all(np.isfinite(v).all() for v in inputs):
+            return None
+        if not (lam > 0).all() or (cost < 0).any() or (lo > hi).any():
+            return None
+
+        constraints = []
+        if max_delta is not None:
+            constraints.append((0, np.ones_like(alpha), float(max_delta)))
+        if factor_loading is not None:
+            f = np.asarray(factor_loading, dtype=float)
+            if not np.isfinite(f).all():
+                return None
+            constraints.append((1, f, float(max_factor_exposure)))
+
+        x = _separable_solution(alpha, x0, cost, lam, lo, hi)
+        violated = [c for c in constraints if abs(c[1] @ x) > c[2]]
+        if not violated:
+            self.last_method = "closed_form"
+            self.last_status = "optimal"
+            self.last_iterations = 0
+            return x
+
+        # An optimum of a relaxation that satisfies every constraint is
+        # optimal for the full problem, so try each binding constraint alone.
+        for key, w, bound in violated:
+            x, iterations, nu = _bisect_multiplier(
+                alpha, x0, cost, lam, lo, hi, w, bound, nu0=self._multipliers.get(key)
+            )
+            if x is not None:
+                self._multipliers[key] = nu
+            if x is not None and all(abs(v @ x) <= b + 1e-9 * max(b, 1.0) for _, v, b in constraints):
+                self.last_method = "bisection"
+                self.last_status = "optimal"
+                self.last_iterations = iterations
+                return x
+
+        return None
+
+
+def _separable_solution(alpha, x0, cost, lam, lo, hi) -> np.ndarray:
+    """
+    Per-instrument maximizer of ``a*x - c*|x - x0| - 0.5*lam*x^2`` on [lo, hi].
+
+    The unconstrained optimum is x0 unless the marginal alpha clears the cost
+    band on either side; the objective is concave in one dimension, so
+    clipping to the box is exact.
+    """
+    buy = (alpha - cost) / lam
+    sell = (alpha + cost) / lam
+    x = np.where(buy > x0, buy, np.where(sell < x0, sell, x0))
+    return np.minimum(np.maximum(x, lo), hi)
+
+
+def _bisect_multiplier(
+    alpha, x0, cost, lam, lo, hi, w, bound, nu0: float | None = None, max_iter: int = 200
+) -> tuple[np.ndarray | None, int, float]:
+    """
+    Solve with the single constraint ``|w @ x| <= bound`` via its multiplier.
+
+    ``w @ x(nu)`` is continuous, non-increasing and piecewise linear in
+    ``nu`` for ``x(nu)`` the separable solution at ``alpha - nu * w``. The
+    root is bracketed from ``nu0`` (the previous solve's multiplier, when it
+    has the right sign) or from the input scale, then found by regula falsi
+    with the Illinois step, which is exact on a linear piece and typically
+    needs a handful of evaluations. Returns the feasible end of the bracket
+    (or None if the box makes the constraint unreachable), the number of
+    evaluations and the multiplier.
+    """
+    x = _separable_solution(alpha, x0, cost, lam, lo, hi)
+    sign = 1.0 if w @ x > 0 else -1.0
+    target = sign * bound
+
+    # x(nu) = clip(clip(x0, buy, sell), lo, hi) with buy <= sell (cost >= 0),
+    # evaluated in two scratch buffers
+    buy0 = (alpha - cost) / lam
+    sell0 = (alpha + cost) / lam
+    w_lam = w / lam
+    x_nu = np.empty_like(x)
+    shift = np.empty_like(x)
+
+    def excess(nu):
+        np.multiply(w_lam, nu, out=shift)
+        np.subtract(buy0, shift, out=x_nu)
+        np.maximum(x_nu, x0, out=x_nu)
+        np.subtract(sell0, shift, out=shift)
+        np.minimum(x_nu, shift, out=x_nu)
+        np.maximum(x_nu, lo, out=x_nu)
+        np.minimum(x_nu, hi, out=x_nu)
+        return sign * (w @ x_nu - target)
+
+    # Bracket [nu_lo (violated), nu_hi (feasible)]; nu = 0 is violated
+    nu_lo, gap_lo = 0.0, sign * (w @ x - target)
+    warm = nu0 is not None and nu0 * sign > 0
+    if warm:
+        nu, step = nu0, 0.05
+    else:
+        scale = max(np.abs(alpha).max() + np.abs(cost).max(), 1e-12) / max(np.abs(w).max(), 1e-12)
+        nu, step = sign * scale, 1.0
+    gap = excess(nu)
+    iterations = 1
+    if gap > 0:
+        while gap > 0:
+            if iterations > max_iter:
+                return None, iterations, 0.0
+            nu_lo, gap_lo = nu, gap
+            nu = nu * (1.0 + step)
+            step *= 2.0
+            gap = excess(nu)
+            iterations += 1
+    elif warm:
+        # Feasible warm start: walk back towards 0 for a close violated end
+        nu_hi, gap_hi = nu, gap
+        while step < 1.0:
+            nu = nu_hi * (1.0 - step)
+            gap = excess(nu)
+            iterations += 1
+            if gap > 0:
+                nu_lo, gap_lo = nu, gap
+                break
+            nu_hi, gap_hi = nu, gap
+            step *= 2.0
+        nu, gap = nu_hi, gap_hi
+    nu_hi, gap_hi = nu, gap
+
+    tol = 1e-9 * max(bound, 1.0)
+    f_lo, f_hi = gap_lo, gap_hi   # Illinois-scaled copies for the secant
+    side = 0
+    while -gap_hi > tol and iterations < max_iter:
+        if abs(nu_hi - nu_lo) <= 1e-15 * abs(nu_hi):
+            break
+        nu = nu_lo + f_lo * (nu_hi - nu_lo) / (f_lo - f_hi)
+        if not min(nu_lo, nu_hi) < nu < max(nu_lo, nu_hi):
+            nu = 0.5 * (nu_lo + nu_hi)
+        gap = excess(nu)
+        iterations += 1
+        if gap > 0:
+            nu_lo, f_lo = nu, gap
+            if side == -1:
+                f_hi *= 0.5
+            side = -1
+        else:
+            nu_hi, gap_hi, f_hi = nu, gap, gap
+            if side == 1:
+                f_lo *= 0.5
+            side = 1
+
+    excess(nu_hi)
+    return x_nu, iterations, nu_hi
+
+
+_OPTIMIZERS: dict[str, PositionOptimizer] = {}
+
+
 def optimize_target_positions_usd(
     alpha: pd.Series,
     current_position_usd: pd.Series,
@@ -15,64 +339,51 @@ def optimize_target_positions_usd(
     factor_loading: pd.Series | None = None,
     max_factor_exposure: float | None = None,
     max_delta: float = 0.0,
-    solver: str = "MOSEK",
+    solver: str = "CLARABEL",
 ) -> pd.Series:
     """
     Optimize target positions directly in USD with trading cost penalty.
 
+    Thin wrapper around a process-wide ``PositionOptimizer`` per solver;
+    the method, status and iteration count of the call are available from
+    ``last_solve_stats(solver)``.
+
     Returns
     -------
     pd.Series
         Target positions in USD.
     """
     idx = alpha.index
-    n = len(idx)
+
+    optimizer = _OPTIMIZERS.get(solver)
+    if optimizer is None:
+        optimizer = _OPTIMIZERS[solver] = PositionOptimizer(solver=solver)
 
     # Align everything
-    x0 = current_position_usd.loc[idx].values
-    alpha = alpha.loc[idx].values
-    cost = trading_cost.loc[idx].values
-    lam = risk_lambda.loc[idx].values
-    pos_cap = clip_pos_usd.loc[idx].values
-    trd_cap = clip_trd_usd.loc[idx].values
-    '''
-    print("x0=", x0)
-    print("alpha=", alpha)
-    print("cost=", cost)
-    print("lam=", lam)
-    print("pos_cap=", pos_cap)
-    print("trd_cap=", trd_cap)
-    '''
-    x = cp.Variable(n)
-
-    objective = cp.Maximize(
-        alpha @ x
-        - cost @ cp.abs(x - x0)
-        - 0.5 * cp.sum(cp.multiply(lam, cp.square(x)))
+    target = optimizer.solve(
+        alpha=alpha.loc[idx].values,
+        x0=current_position_usd.loc[idx].values,
+        cost=trading_cost.loc[idx].values,
+        lam=risk_lambda.loc[idx].values,
+        pos_cap=clip_pos_usd.loc[idx].values,
+        trd_cap=clip_trd_usd.loc[idx].values,
+        factor_loading=(
+            factor_loading.loc[idx].values if factor_loading is not None else None
+        ),
+        max_factor_exposure=max_factor_exposure,
+        max_delta=max_delta,
     )
 
-    constraints = [
-        cp.abs(x) <= pos_cap,
-        cp.abs(x - x0) <= trd_cap,
-    ]
-
-    if max_delta > 0:
-        constraints.append(cp.abs(cp.sum(x)) <= max_delta)
+    return pd.Series(target, index=idx)
 
-    if factor_loading is not None and max_factor_exposure is not None:
-        f = factor_loading.loc[idx].values
-        constraints.append(cp.abs(f @ x) <= max_factor_exposure)
-
-    problem = cp.Problem(objective, constraints)
-
-    try:
-        problem.solve(
-            solver=cp.MOSEK if solver == "MOSEK" else cp.SCS,
-            verbose=False,
-        )
-        if x.value is None:
-            raise ValueError("Solver returned None")
-    except Exception as exc:
-        raise RuntimeError(f"Optimization failed: {exc}")
 
-    return pd.Series(x.value, index=idx)
+def last_solve_stats(solver: str = "CLARABEL") -> dict:
+    """Method, status and iterations of the last ``optimize_target_positions_usd`` call."""
+    optimizer = _OPTIMIZERS.get(solver)
+    if optimizer is None:
+        return {"method": None, "status": None, "iterations": 0}
+    return {
+        "method": optimizer.last_method,
+        "status": optimizer.last_status,
+        "iterations": optimizer.last_iterations,
+    }
@@ -0,0 +1,78 @@
+# src/barrier.py
+from __future__ import annotations
+
+from typing import Callable
+
+from nautilus_trader.core.datetime import unix_nanos_to_dt
+
+
+class BarBarrier:
+    """
+    Per-timestamp bar barrier for the decision loop.
+
+    ``open`` arms the barrier for a bar timestamp with the number of bars
+    expected (the subscribed cross-section); ``arrive`` counts the bars as
+    they are processed. The callback runs exactly once per armed timestamp:
+
+    - when the last expected bar has arrived (``complete=True``);
+    - at ``ts + timeout_ns`` via a clock alert, with whatever has arrived;
+    - when bars of a later timestamp show up first (late data, or a timeout
+      longer than the bar spacing).
+
+    A timestamp with no bars is never opened, so it never triggers.
+    """
+
+    def __init__(
+        self,
+        clock,
+        callback: Callable[[int, bool], None],
+        timeout_ns: int,
+        name: str = "bar_barrier",
+    ):
+        self.clock = clock
+        self.callback = callback
+        self.timeout_ns = int(timeout_ns)
+        self.name = name
+
+        self.ts: int | None = None
+        self.expected = 0
+        self.count = 0
+        self.armed = False
+
+        self.completed = 0
+        self.timed_out = 0
+
+    def open(self, ts_ns: int, expected: int, armed: bool = True) -> None:
+        """Start collecting the bars of ``ts_ns`` (``armed=False``: count only)."""
+        if self.armed:
+            self._fire(complete=False)
+        self.ts = ts_ns
+        self.expected = expected
+        self.count = 0
+        self.armed = armed
+        if armed:
+            self.clock.set_time_alert(
+                self.name,
+                unix_nanos_to_dt(ts_ns + self.timeout_ns),
+                callback=self._on_timeout,
+                override=True,
+            )
+
+    def arrive(self) -> None:
+        self.count += 1
+        if self.armed and self.count >= self.expected:
+            self._fire(complete=True)
+
+    def _on_timeout(self, event) -> None:
+        if self.armed:
+            self._fire(complete=False)
+
+    def _fire(self, complete: bool) -> None:
+        self.armed = False
+        if self.name in self.clock.timer_names:
+            self.clock.cancel_timer(self.name)
+        if complete:
+            self.completed += 1
+        else:
+            self.timed_out += 1
+        self.callback(self.ts, complete)
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from nautilus_trader.config import StrategyConfig
-from typing import List
+from typing import Dict, List
 
 import msgspec
 
@@ -15,6 +15,45 @@ class ExecutionConfig(msgspec.Struct):
     passive: bool = False               # 🔑 NEW
     max_cross_spread_minutes: int = 5   # fallback aggressiveness
     price_offset_ticks: int = 0         # passive improvement
+    max_resting_orders: int = 1         # resting passive limits per instrument
+
+    # Prebuilt intraday volume curves (src/volume_curve.py); VWAP algos
+    # follow them when set, else slice a share of each bar's volume
+    volume_curve_dir: str | None = None
+
+class SignalConfig(msgspec.Struct):
+    # Momentum lookbacks and their weights, in bars
+    horizons: List[int] = msgspec.field(default_factory=lambda: [5, 15, 60])
+    horizon_weights: List[float] = msgspec.field(default_factory=lambda: [0.5, 0.3, 0.2])
+    cross_sectional: bool = True   # demean the score across ready names
+    max_score: float = 3.0
+    min_bars: int = 5              # returns seen before a name gets alpha / beta
+
+    vol_halflife: int = 30         # bars, EWMA variance of returns
+    beta_halflife: int = 120       # bars, EWMA beta to the equal-weight market
+    sigma_prior: float = 0.001     # per-bar vol of names without history
+
+    # alpha = ic * score * sigma * sqrt(holding_bars); risk_lambda = risk_aversion * sigma^2 * holding_bars
+    ic: float = 0.05
+    holding_bars: int = 390
+    risk_aversion: float = 5e-5
+    # trading_cost = cost_base + cost_vol_mult * sigma (per USD traded)
+    cost_base: float = 0.0002
+    cost_vol_mult: float = 0.5
+
+class RebalanceConfig(msgspec.Struct):
+    # When the decision loop re-solves and which deltas it trades (src/rebalance.py)
+    interval_minutes: int = 1          # minimum minutes between solves
+    max_interval_minutes: int = 0      # force a solve after this long (0: never forced)
+    change_threshold: float = 0.0      # relative L2 move of the inputs below which the solve is skipped (0: off)
+    round_to_lots: bool = True         # targets in whole lots, deltas in size increments
+    no_trade_band_usd: float = 0.0     # deltas below this notional are not traded
+    no_trade_band_lots: float = 0.0    # ... or below this many lots
+
+class InstrumentationConfig(msgspec.Struct):
+    # Per-stage latency histograms + per-decision solver log (src/instrumentation.py)
+    enabled: bool = False
+    output_dir: str | None = None   # CSV dump on stop; run.py defaults it to the Hydra output dir
 
 class MomentumConfig(StrategyConfig):
     instrument_ids: List[str]
@@ -25,8 +64,38 @@ class MomentumConfig(StrategyConfig):
     max_trade_weight: float = 0.05
     max_delta: float = 1_000_000.0
     max_factor_exposure: float = 1_000_000.0
+    solver: str = "CLARABEL"   # cvxpy solver for problems outside the optimizer's fast path
     min_trade_qty: float = 1.0
 
+    # Decision loop: every k session minutes, once the subscribed cross-section's
+    # bars for the minute have arrived or the timeout after the bar timestamp
+    decision_interval_minutes: int = 1
+    decision_timeout_secs: float = 5.0
+
+    # Session calendar window (set by run.py from the backtest window)
+    session_start: str | None = None
+    session_end: str | None = None
+    session_cache_dir: str | None = None
+
+    # Positions to establish at the first bar (carried over between shards)
+    initial_positions: Dict[str, float] = msgspec.field(default_factory=dict)
+
+    # Rolling universe: session date (YYYY-MM-DD) -> tradable instrument IDs.
+    # Empty means the static ``instrument_ids`` universe.
+    universe_schedule: Dict[str, List[str]] = msgspec.field(default_factory=dict)
+
     execution: ExecutionConfig = msgspec.field(
         default_factory=ExecutionConfig
     )
+
+    signals: SignalConfig = msgspec.field(
+        default_factory=SignalConfig
+    )
+
+    rebalance: RebalanceConfig = msgspec.field(
+        default_factory=RebalanceConfig
+    )
+
+    instrumentation: InstrumentationConfig = msgspec.field(
+        default_factory=InstrumentationConfig
+    )
@@ -2,11 +2,40 @@
 from __future__ import annotations
 
 import os
-from typing import List
+from typing import Dict, List, Tuple
+
+import pandas as pd
 
-from nautilus_trader.persistence.catalog import ParquetDataCatalog
 from nautilus_trader.backtest.config import BacktestDataConfig
 from nautilus_trader.model.data import Bar
+from nautilus_trader.persistence.catalog import ParquetDataCatalog
+
+from .liquidity import (
+    build_liquidity_index,
+    load_liquidity_index,
+    membership_windows,
+    rolling_universe,
+    top_liquid,
+)
+
+
+class BarDataConfig(BacktestDataConfig, frozen=True):
+    """
+    Bar data config that loads exactly its bar type.
+
+    ``BacktestDataConfig.query`` selects by instrument ID and relies on a
+    ``bar_type`` filter expression the Rust catalog backend does not apply,
+    so every bar type of the instrument (minute and daily) was loaded by
+    each config. Querying the bar type itself keeps the one-shot load in
+    line with streaming, which already selects by bar type.
+    """
+
+    @property
+    def query(self):
+        query = super().query
+        if self.instrument_id is not None and self.bar_spec is not None:
+            query["identifiers"] = [f"{self.instrument_id}-{self.bar_spec}-EXTERNAL"]
+        return query
 
 
 def get_catalog(path) -> ParquetDataCatalog:
@@ -14,41 +43,127 @@ def get_catalog(path) -> ParquetDataCatalog:
     return ParquetDataCatalog(path=path)
 
 
-def get_top_liquid_instruments(catalog: ParquetDataCatalog, limit: int = 10) -> List[str]:
+def _liquidity_index(catalog: ParquetDataCatalog) -> pd.DataFrame:
+    index = load_liquidity_index(catalog.path)
+    if index is None:
+        index = build_liquidity_index(catalog)
+    return index
+
+
+def get_top_liquid_instruments(
+    catalog: ParquetDataCatalog,
+    limit: int = 10,
+    as_of=None,
+    by: str = "adv_usd",
+) -> List[str]:
     """
-    Return top N instrument IDs.
+    Return top N instrument IDs by rolling liquidity as of a date.
 
-    In production: filter by average daily volume or liquidity.
+    Ranks by ``by`` (``adv_usd``, ``adv`` or ``dollar_volume``) from the
+    liquidity index stored next to the catalog, building it from the 1-DAY
+    bars on first use. Falls back to catalog order if there is no daily
+    history before ``as_of``.
     """
+    index = _liquidity_index(catalog)
+    ranked = top_liquid(index, limit, as_of=as_of, by=by) if not index.empty else []
+    if ranked:
+        return ranked
+
     instruments = catalog.instruments()
     return [str(inst.id) for inst in instruments][:limit]
 
 
+def get_rolling_universe(
+    catalog: ParquetDataCatalog,
+    sessions,
+    limit: int = 10,
+    by: str = "adv_usd",
+    exit_days: int = 1,
+) -> Tuple[Dict[str, List[str]], Dict[str, List[Tuple[pd.Timestamp, pd.Timestamp]]]]:
+    """
+    Per-session top N universe and the matching minute-bar load windows.
+
+    Sessions before the first ranked one (no prior daily history) use
+    catalog order, as ``get_top_liquid_instruments`` does; a later session
+    without a ranking keeps the previous session's universe. Rankings are
+    only carried forward, never back, so no session sees later liquidity.
+
+    Returns
+    -------
+    tuple
+        ``(schedule, windows)``: session date -> instrument IDs, and
+        instrument ID -> ``[start, end)`` membership windows.
+    """
+    schedule = rolling_universe(_liquidity_index(catalog), sessions, limit, by=by)
+
+    fallback = [str(inst.id) for inst in catalog.instruments()][:limit]
+    for date in sorted(schedule):
+        if not schedule[date]:
+            schedule[date] = fallback
+        fallback = schedule[date]
+
+    return schedule, membership_windows(schedule, exit_days=exit_days)
+
+
 def create_data_configs(
     catalog_path: str,
     instrument_ids: List[str],
+    windows: Dict[str, List[Tuple[pd.Timestamp, pd.Timestamp]]] | None = None,
+    start=None,
+    daily_lookback_days: int | None = 0,
 ) -> List[BacktestDataConfig]:
-    """Create configs for 1-minute (execution) and 1-day (ADV) bars."""
+    """
+    Create configs for 1-minute (execution) and, optionally, 1-day bars.
+
+    Minute bars start at ``start``; with ``windows`` (rolling universe, see
+    ``liquidity.membership_windows``) they are only loaded over each
+    instrument's membership windows from ``start`` on.
+
+    ``daily_lookback_days`` bounds the daily bars, which the strategy does
+    not consume (rankings read the liquidity index): 0 (default) skips them,
+    N loads from ``start`` minus N days, None loads them all. ``BacktestNode``
+    clips every stream to the run start, so bars before ``start`` only reach
+    engines driven directly.
+    """
     configs: List[BacktestDataConfig] = []
+    if start is not None:
+        start = pd.Timestamp(start)
+        start = start.tz_localize("UTC") if start.tzinfo is None else start.tz_convert("UTC")
 
     # 1-minute bars for intraday trading
-    configs.extend(
-        BacktestDataConfig(
-            catalog_path=catalog_path,
-            data_cls=Bar,
-            instrument_id=inst_id,
-            bar_spec=f"{inst_id}-1-MINUTE-LAST-EXTERNAL",
-        )
-        for inst_id in instrument_ids
-    )
+    for inst_id in instrument_ids:
+        spans = windows.get(inst_id, []) if windows is not None else [(None, None)]
+        for span_start, span_end in spans:
+            if start is not None and (span_start is None or span_start < start):
+                span_start = start
+            if span_end is not None and span_start is not None and span_end <= span_start:
+                continue
+            configs.append(
+                BarDataConfig(
+                    catalog_path=catalog_path,
+                    data_cls=Bar,
+                    instrument_id=inst_id,
+                    bar_spec="1-MINUTE-LAST",
+                    start_time=span_start.isoformat() if span_start is not None else None,
+                    end_time=span_end.isoformat() if span_end is not None else None,
+                )
+            )
 
     # 1-day bars for average daily volume calculations
+    if daily_lookback_days == 0:
+        return configs
+
+    daily_start = None
+    if daily_lookback_days is not None and start is not None:
+        daily_start = (start - pd.Timedelta(days=daily_lookback_days)).isoformat()
+
     configs.extend(
-        BacktestDataConfig(
+        BarDataConfig(
             catalog_path=catalog_path,
             data_cls=Bar,
             instrument_id=inst_id,
-            bar_spec=f"{inst_id}-1-DAY-LAST-EXTERNAL",
+            bar_spec="1-DAY-LAST",
+            start_time=daily_start,
         )
         for inst_id in instrument_ids
     )
@@ -1,12 +1,19 @@
 # src/engine.py
 from __future__ import annotations
 
+import resource
+import sys
+import time
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List
 
+from nautilus_trader.backtest.engine import BacktestEngine
 from nautilus_trader.backtest.node import BacktestNode, BacktestVenueConfig, BacktestRunConfig
 from nautilus_trader.config import BacktestEngineConfig, ImportableStrategyConfig, LoggingConfig
 from nautilus_trader.backtest.config import BacktestDataConfig
+from nautilus_trader.model.enums import AccountType, OmsType
+from nautilus_trader.model.identifiers import Venue
+from nautilus_trader.model.objects import Money
 
 
 def run_backtest(
@@ -17,9 +24,32 @@ def run_backtest(
     data_configs: List[BacktestDataConfig] = None,
     start: datetime | None = None,
     end: datetime | None = None,
-    starting_balances: List[str] = None
+    starting_balances: List[str] = None,
+    return_reports: bool = False,
+    chunk_size: int | None = None,
+    market_cache: str | None = None,
 ):
-    """Run a high-level backtest using BacktestNode (recommended Nautilus API)."""
+    """
+    Run a high-level backtest using BacktestNode (recommended Nautilus API).
+
+    With ``chunk_size`` the node streams the data configs through one
+    session in chunks of that many records instead of loading every stream
+    up front, so peak memory follows the chunk rather than the dataset.
+
+    With ``return_reports=True`` the engine is kept alive after the run and
+    ``(results, reports)`` is returned, see ``collect_reports``.
+
+    With ``market_cache`` (a directory from ``market_cache.build_market_cache``)
+    ``data_configs`` and ``chunk_size`` are ignored: the bars are taken from
+    the shared-memory cache and replayed through a ``BacktestEngine``
+    directly, so no Parquet is decoded by the run.
+    """
+    if market_cache is not None:
+        return _run_cached_backtest(
+            strategy_path, config_path, strategy_config, venue_name,
+            market_cache, start, end, starting_balances, return_reports,
+        )
+
     if data_configs is None:
         data_configs = []
 
@@ -50,10 +80,140 @@ def run_backtest(
         data=data_configs,
         start=start,
         end=end,
+        chunk_size=chunk_size,
+        dispose_on_completion=not return_reports,
     )
 
     node = BacktestNode(configs=[run_config])
-    print("Starting backtest...")
+    print("Starting backtest..." + (f" (streaming, chunk_size={chunk_size})" if chunk_size else ""))
+    t0 = time.perf_counter()
     results = node.run()
+    wall_time_s = time.perf_counter() - t0
+    print("Backtest completed.")
+    for result in results:
+        print(format_run_stats(run_stats(result, wall_time_s)))
+
+    if not return_reports:
+        return results
+
+    reports = collect_reports(node.get_engine(run_config.id), venue_name) if results else {}
+    node.dispose()
+    return results, reports
+
+
+def _run_cached_backtest(
+    strategy_path: str,
+    config_path: str,
+    strategy_config,
+    venue_name: str,
+    market_cache: str,
+    start: datetime | None,
+    end: datetime | None,
+    starting_balances: List[str],
+    return_reports: bool,
+):
+    """Low-level ``BacktestEngine`` run over bars attached from a market cache."""
+    from .market_cache import attach_market_cache
+
+    cache = attach_market_cache(market_cache)
+
+    engine = BacktestEngine(
+        config=BacktestEngineConfig(
+            strategies=[
+                ImportableStrategyConfig(
+                    strategy_path=strategy_path,
+                    config_path=config_path,
+                    config=strategy_config,
+                )
+            ],
+            logging=LoggingConfig(log_level="ERROR"),
+        )
+    )
+    engine.add_venue(
+        venue=Venue(venue_name),
+        oms_type=OmsType.NETTING,
+        account_type=AccountType.MARGIN,
+        starting_balances=[Money.from_str(str(b)) for b in starting_balances],
+    )
+    for instrument in cache.instruments():
+        engine.add_instrument(instrument)
+    engine.add_data(cache.bars(start, end), validate=False)
+
+    print(f"Starting backtest... (market cache {market_cache})")
+    t0 = time.perf_counter()
+    engine.run(start=start, end=end)
+    wall_time_s = time.perf_counter() - t0
     print("Backtest completed.")
-    return results
+
+    results = [engine.get_result()]
+    print(format_run_stats(run_stats(results[0], wall_time_s)))
+
+    reports = collect_reports(engine, venue_name) if return_reports else None
+    engine.dispose()
+    return (results, reports) if return_reports else results
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB."""
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return maxrss / (1 << 20) if sys.platform == "darwin" else maxrss / (1 << 10)
+
+
+def run_stats(result, wall_time_s: float | None = None) -> Dict[str, float]:
+    """
+    Wall time, throughput and peak memory of a finished run.
+
+    Streaming runs do not stamp ``run_started``, so a measured
+    ``wall_time_s`` takes precedence over the result's timestamps.
+    """
+    if wall_time_s is None:
+        if result.run_started is None or result.run_finished is None:
+            wall_time_s = float("nan")
+        else:
+            wall_time_s = (result.run_finished - result.run_started) / 1e9
+    return {
+        "wall_time_s": wall_time_s,
+        "iterations": result.iterations,
+        "total_events": result.total_events,
+        "iterations_per_s": result.iterations / wall_time_s if wall_time_s > 0 else float("nan"),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def format_run_stats(stats: Dict[str, float]) -> str:
+    return (
+        f"Run stats: {stats['iterations']:,} data points in {stats['wall_time_s']:.2f}s "
+        f"({stats['iterations_per_s']:,.0f}/s), {stats['total_events']:,} events, "
+        f"peak RSS {stats['peak_rss_mb']:,.0f} MiB"
+    )
+
+
+def collect_reports(engine, venue_name: str) -> Dict[str, Any]:
+    """
+    Pull fills, positions, account history and ending state from an engine.
+
+    ``ending_positions`` maps instrument ID to signed quantity of the open
+    positions; ``ending_equity`` is balances plus unrealized PnL per currency,
+    formatted like ``starting_balances`` so it can seed a follow-on run.
+    """
+    venue = Venue(venue_name)
+    trader = engine.trader
+    account = engine.portfolio.account(venue)
+
+    unrealized = engine.portfolio.unrealized_pnls(venue)
+    ending_equity = [
+        f"{money.as_double() + (unrealized[currency].as_double() if currency in unrealized else 0.0)} {currency}"
+        for currency, money in account.balances_total().items()
+    ]
+
+    return {
+        "fills": trader.generate_order_fills_report(),
+        "positions": trader.generate_positions_report(),
+        "account": trader.generate_account_report(venue),
+        "ending_positions": {
+            str(position.instrument_id): position.signed_qty
+            for position in engine.cache.positions_open(venue=venue)
+        },
+        "ending_equity": ending_equity,
+    }
@@ -0,0 +1,83 @@
+# src/execution/algos/batch.py
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+from nautilus_trader.model.enums import OrderSide
+
+NS_PER_MINUTE = 60_000_000_000
+
+
+class BatchExecutionAlgo:
+    """
+    Base for algos that slice a whole cross-section at once.
+
+    ``on_bars`` receives the bars that printed at one timestamp and the
+    matching parent schedules, computes every slice with NumPy and emits the
+    orders in a single pass. ``on_bar`` is kept as a one-bar wrapper.
+    """
+
+    def __init__(self, config):
+        self.cfg = config
+
+    def on_bar(self, bar, schedule, engine):
+        self.on_bars([bar], [schedule], engine)
+
+    def on_bars(self, bars, schedules, engine):
+        raise NotImplementedError
+
+
+class BarBatch:
+    """Column view of one timestamp's bars and their parent schedules."""
+
+    __slots__ = ("bars", "schedules", "now", "volume", "remaining", "open", "start_ts", "end_ts")
+
+    def __init__(self, bars: List, schedules: List):
+        n = len(bars)
+        self.bars = bars
+        self.schedules = schedules
+        self.now = np.fromiter((b.ts_event for b in bars), dtype=np.int64, count=n)
+        self.volume = np.fromiter((b.volume.as_double() for b in bars), dtype=np.float64, count=n)
+        self.remaining = np.fromiter((s.remaining_qty for s in schedules), dtype=np.int64, count=n)
+        working = np.fromiter((s.working_qty for s in schedules), dtype=np.int64, count=n)
+        # Unfilled and not yet worked by a child; never on the opposite side
+        self.open = self.remaining - working
+        self.open[self.open * self.remaining <= 0] = 0
+        self.start_ts = np.fromiter((s.start_ts for s in schedules), dtype=np.int64, count=n)
+        self.end_ts = np.fromiter((s.end_ts for s in schedules), dtype=np.int64, count=n)
+
+    def remaining_minutes(self) -> np.ndarray:
+        """Whole minutes to each schedule's end, at least 1."""
+        return np.maximum(1, (self.end_ts - self.now) // NS_PER_MINUTE)
+
+    def participation(self, rate: float) -> np.ndarray:
+        """``int(volume * rate)`` per bar."""
+        return np.trunc(self.volume * rate).astype(np.int64)
+
+
+def finish(batch: BarBatch, mask: np.ndarray, engine) -> None:
+    for i in np.flatnonzero(mask):
+        engine.finish_schedule(batch.schedules[i])
+
+
+def emit_slices(batch: BarBatch, slice_qty: np.ndarray, engine, limit_mask=None, offset_ticks: int = 0):
+    """
+    Submit one child per positive ``slice_qty``, as one batch.
+
+    Children are market orders, or passive limits where ``limit_mask`` is set.
+    Parents are drawn down by the engine as children fill.
+    """
+    children = []
+    for i in np.flatnonzero(slice_qty > 0):
+        schedule = batch.schedules[i]
+        side = OrderSide.BUY if schedule.remaining_qty > 0 else OrderSide.SELL
+
+        price = None
+        if limit_mask is not None and limit_mask[i]:
+            price = engine.compute_passive_price(batch.bars[i], side, offset_ticks=offset_ticks)
+
+        children.append((schedule.instrument_id, side, int(slice_qty[i]), price))
+
+    if children:
+        engine.submit_batch(children)
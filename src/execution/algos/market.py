@@ -1,25 +1,14 @@
 # src/execution/algos/market.py
 from __future__ import annotations
 
-from nautilus_trader.model.enums import OrderSide
+import numpy as np
 
-class MarketExecutionAlgo:
-    def __init__(self, config):
-        self.cfg = config
+from .batch import BarBatch, BatchExecutionAlgo, emit_slices, finish
 
-    def on_bar(self, bar, schedule, engine):
+class MarketExecutionAlgo(BatchExecutionAlgo):
+    def on_bars(self, bars, schedules, engine):
         # Submit once, then finish
+        batch = BarBatch(bars, schedules)
 
-        side = (
-            OrderSide.BUY
-            if schedule.remaining_qty > 0
-            else OrderSide.SELL
-        )
-
-        engine.submit_market_order(
-            instrument_id=schedule.instrument_id,
-            side=side,
-            quantity=schedule.remaining_qty,
-        )
-
-        engine.finish_schedule(schedule)
+        emit_slices(batch, np.abs(batch.open), engine)
+        finish(batch, np.ones(len(bars), dtype=bool), engine)
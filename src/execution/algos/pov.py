@@ -1,40 +1,22 @@
 # src/execution/algos/pov.py
 from __future__ import annotations
 
-from nautilus_trader.model.enums import OrderSide
+import numpy as np
 
-class POVExecutionAlgo:
-    def __init__(self, config):
-        self.cfg = config
+from .batch import BarBatch, BatchExecutionAlgo, emit_slices, finish
 
-    def on_bar(self, bar, schedule, engine):
-        if schedule.remaining_qty == 0:
-            engine.finish_schedule(schedule)
-            return
+class POVExecutionAlgo(BatchExecutionAlgo):
+    def on_bars(self, bars, schedules, engine):
+        batch = BarBatch(bars, schedules)
 
-        bar_volume = getattr(bar, "volume", 0)
-        if bar_volume <= 0:
-            return
+        done = batch.remaining == 0
+        finish(batch, done, engine)
 
-        slice_qty = int(bar_volume * self.cfg.participation_rate)
-        slice_qty = max(slice_qty, self.cfg.min_slice_qty)
-        slice_qty = min(abs(schedule.remaining_qty), slice_qty)
-
-        if slice_qty <= 0:
-            return
-
-        side = (
-            OrderSide.BUY
-            if schedule.remaining_qty > 0
-            else OrderSide.SELL
+        slice_qty = np.maximum(
+            batch.participation(self.cfg.participation_rate),
+            self.cfg.min_slice_qty,
         )
+        slice_qty = np.minimum(np.abs(batch.open), slice_qty)
+        slice_qty[done | (batch.volume <= 0)] = 0
 
-        engine.submit_market_order(
-            instrument_id=schedule.instrument_id,
-            side=side,
-            quantity=slice_qty,
-        )
-
-        schedule.remaining_qty -= (
-            slice_qty if schedule.remaining_qty > 0 else -slice_qty
-        )
+        emit_slices(batch, slice_qty, engine)
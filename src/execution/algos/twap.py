@@ -1,43 +1,23 @@
 # src/execution/algos/twap.py
 from __future__ import annotations
 
-from nautilus_trader.model.enums import OrderSide
+import numpy as np
 
-class TWAPExecutionAlgo:
-    def __init__(self, config):
-        self.cfg = config
+from .batch import BarBatch, BatchExecutionAlgo, emit_slices, finish
 
-    def on_bar(self, bar, schedule, engine):
-        now = bar.ts_event
+class TWAPExecutionAlgo(BatchExecutionAlgo):
+    def on_bars(self, bars, schedules, engine):
+        batch = BarBatch(bars, schedules)
 
-        if now >= schedule.end_ts or schedule.remaining_qty == 0:
-            engine.finish_schedule(schedule)
-            return
+        done = (batch.now >= batch.end_ts) | (batch.remaining == 0)
+        finish(batch, done, engine)
 
-        remaining_minutes = max(
-            1,
-            int((schedule.end_ts - now) / 60_000_000_000),
-        )
-
-        slice_qty = max(
-            abs(schedule.remaining_qty) // remaining_minutes,
+        remaining = np.abs(batch.open)
+        slice_qty = np.maximum(
+            remaining // batch.remaining_minutes(),
             self.cfg.min_slice_qty,
         )
+        slice_qty = np.minimum(remaining, slice_qty)
+        slice_qty[done] = 0
 
-        slice_qty = min(abs(schedule.remaining_qty), slice_qty)
-
-        side = (
-            OrderSide.BUY
-            if schedule.remaining_qty > 0
-            else OrderSide.SELL
-        )
-
-        engine.submit_market_order(
-            instrument_id=schedule.instrument_id,
-            side=side,
-            quantity=slice_qty,
-        )
-
-        schedule.remaining_qty -= (
-            slice_qty if schedule.remaining_qty > 0 else -slice_qty
-        )
+        emit_slices(batch, slice_qty, engine)
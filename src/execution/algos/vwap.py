@@ -1,43 +1,80 @@
 # src/execution/algos/vwap.py
 from __future__ import annotations
 
-from nautilus_trader.model.enums import OrderSide
+import numpy as np
+
+from .batch import NS_PER_MINUTE, BarBatch, BatchExecutionAlgo, emit_slices, finish
+from ...sessions import session_index_for
+from ...volume_curve import VolumeCurves
+
+
+def load_volume_curves(config) -> VolumeCurves | None:
+    curve_dir = getattr(config, "volume_curve_dir", None)
+    return VolumeCurves.load(curve_dir) if curve_dir else None
+
+
+def trajectory_slices(batch: BarBatch, curves: VolumeCurves, exchange: str) -> np.ndarray:
+    """
+    Quantity each parent is behind its volume-curve trajectory, in shares.
+
+    The target cumulative fill at ``now`` is the parent's size times the
+    share of the horizon's expected volume traded up to the end of the
+    current minute; horizons with no expected volume fall back to linear in
+    time.
+    """
+    sessions = session_index_for(exchange, int(batch.now[0]))
+    start_min = sessions.session_minutes(batch.start_ts)
+    end_min = sessions.session_minutes(batch.end_ts)
+    now_min = sessions.session_minutes(batch.now) + 1
+
+    rows = curves.rows_for([s.instrument_id for s in batch.schedules])
+    horizon = curves.fraction_between(rows, start_min, end_min)
+    elapsed = curves.fraction_between(rows, start_min, now_min)
+
+    linear = np.clip(
+        (batch.now + NS_PER_MINUTE - batch.start_ts) / np.maximum(batch.end_ts - batch.start_ts, 1),
+        0.0,
+        1.0,
+    )
+    progress = np.divide(elapsed, horizon, out=linear, where=horizon > 0)
+    np.clip(progress, 0.0, 1.0, out=progress)
+
+    total = np.abs(np.fromiter((s.total_qty for s in batch.schedules), dtype=np.int64, count=len(rows)))
+    done = total - np.abs(batch.open)
+    return np.ceil(total * progress).astype(np.int64) - done
+
+
+class VWAPExecutionAlgo(BatchExecutionAlgo):
+    """
+    VWAP slicing, capped at ``participation_rate`` of each bar.
+
+    With ``volume_curve_dir`` set, parents follow the historical intraday
+    volume curve over their horizon; otherwise each bar trades its
+    participation share (capped POV).
+    """
 
-class VWAPExecutionAlgo:
     def __init__(self, config):
-        self.cfg = config
-
-    def on_bar(self, bar, schedule, engine):
-        if schedule.remaining_qty == 0:
-            return
-
-        now = bar.ts_event
-        if now >= schedule.end_ts:
-            engine.finish_schedule(schedule)
-            return
-
-        max_participation = int(
-            bar.volume * self.cfg.participation_rate
-        )
-
-        slice_qty = min(abs(schedule.remaining_qty), max_participation)
-        slice_qty = max(slice_qty, self.cfg.min_slice_qty)
-
-        if slice_qty <= 0:
-            return
-
-        side = (
-            OrderSide.BUY
-            if schedule.remaining_qty > 0
-            else OrderSide.SELL
-        )
-
-        engine.submit_market_order(
-            instrument_id=schedule.instrument_id,
-            side=side,
-            quantity=slice_qty,
-        )
-
-        schedule.remaining_qty -= (
-            slice_qty if schedule.remaining_qty > 0 else -slice_qty
-        )
+        super().__init__(config)
+        self.curves = load_volume_curves(config)
+
+    def on_bars(self, bars, schedules, engine):
+        batch = BarBatch(bars, schedules)
+
+        idle = batch.remaining == 0
+        expired = (batch.now >= batch.end_ts) & ~idle
+        finish(batch, expired, engine)
+
+        remaining = np.abs(batch.open)
+        participation = batch.participation(self.cfg.participation_rate)
+
+        if self.curves is None:
+            slice_qty = np.maximum(participation, self.cfg.min_slice_qty)
+        else:
+            behind = trajectory_slices(batch, self.curves, engine.strategy.venue.value)
+            slice_qty = np.maximum(np.minimum(behind, participation), self.cfg.min_slice_qty)
+            slice_qty[behind <= 0] = 0
+        # Never more than the open (unfilled, unworked) quantity
+        slice_qty = np.minimum(slice_qty, remaining)
+        slice_qty[idle | expired] = 0
+
+        emit_slices(batch, slice_qty, engine)
@@ -1,65 +1,58 @@
 # src/execution/algos/vwap_passive.py
 from __future__ import annotations
 
-from nautilus_trader.model.enums import OrderSide, TimeInForce
-from nautilus_trader.model.orders import LimitOrder
+import numpy as np
 
-class PassiveVWAPExecutionAlgo:
+from nautilus_trader.model.enums import OrderSide
+
+from .batch import BarBatch, BatchExecutionAlgo, emit_slices, finish
+from .vwap import load_volume_curves, trajectory_slices
+
+class PassiveVWAPExecutionAlgo(BatchExecutionAlgo):
     def __init__(self, config):
-        self.cfg = config
+        super().__init__(config)
+        self.curves = load_volume_curves(config)
 
-    def on_bar(self, bar, schedule, engine):
-        now = bar.ts_event
+    def on_bars(self, bars, schedules, engine):
+        batch = BarBatch(bars, schedules)
 
-        if schedule.remaining_qty == 0:
-            engine.finish_schedule(schedule)
-            return
+        done = batch.remaining == 0
+        finish(batch, done, engine)
 
         # --- urgency logic ---
-        remaining_minutes = max(
-            1,
-            int((schedule.end_ts - now) / 60_000_000_000),
-        )
-
-        aggressive = (
-            remaining_minutes <= self.cfg.max_cross_spread_minutes
-        )
+        aggressive = batch.remaining_minutes() <= self.cfg.max_cross_spread_minutes
+
+        # --- reprice: cancel limits resting away from this bar's price (all
+        # of them once crossing); their size returns when the cancel lands ---
+        for i in np.flatnonzero((batch.remaining != batch.open) & ~done):
+            schedule = batch.schedules[i]
+            price = None
+            if not aggressive[i]:
+                side = OrderSide.BUY if schedule.remaining_qty > 0 else OrderSide.SELL
+                price = engine.compute_passive_price(
+                    batch.bars[i],
+                    side,
+                    offset_ticks=self.cfg.price_offset_ticks,
+                )
+            engine.cancel_stale(schedule.instrument_id, price)
 
         # --- volume-based slice ---
-        bar_volume = getattr(bar, "volume", 0)
-        slice_qty = int(bar_volume * self.cfg.participation_rate)
-        slice_qty = max(slice_qty, self.cfg.min_slice_qty)
-        slice_qty = min(abs(schedule.remaining_qty), slice_qty)
-
-        if slice_qty <= 0:
-            return
-
-        side = (
-            OrderSide.BUY
-            if schedule.remaining_qty > 0
-            else OrderSide.SELL
-        )
-
-        if aggressive:
-            engine.submit_market_order(
-                instrument_id=schedule.instrument_id,
-                side=side,
-                quantity=slice_qty,
-            )
-        else:
-            price = engine.compute_passive_price(
-                bar,
-                side,
-                offset_ticks=self.cfg.price_offset_ticks,
-            )
-
-            engine.submit_limit_order(
-                instrument_id=schedule.instrument_id,
-                side=side,
-                quantity=slice_qty,
-                price=price,
-            )
-
-        schedule.remaining_qty -= (
-            slice_qty if schedule.remaining_qty > 0 else -slice_qty
+        participation = batch.participation(self.cfg.participation_rate)
+        if self.curves is not None:
+            # Follow the volume-curve trajectory (still capped by participation)
+            behind = trajectory_slices(batch, self.curves, engine.strategy.venue.value)
+            participation = np.minimum(participation, behind)
+            done |= behind <= 0
+
+        slice_qty = np.maximum(participation, self.cfg.min_slice_qty)
+        slice_qty = np.minimum(np.abs(batch.open), slice_qty)
+        slice_qty[done] = 0
+
+        # Passive limits until close to the horizon, then cross
+        emit_slices(
+            batch,
+            slice_qty,
+            engine,
+            limit_mask=~aggressive,
+            offset_ticks=self.cfg.price_offset_ticks,
         )
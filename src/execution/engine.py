@@ -1,7 +1,9 @@
 # src/execution/engine.py
 from __future__ import annotations
 
-from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
 from nautilus_trader.model.enums import OrderSide
 
 from .algos.market import MarketExecutionAlgo
@@ -9,13 +11,27 @@ from .algos.pov import POVExecutionAlgo
 from .algos.twap import TWAPExecutionAlgo
 from .algos.vwap import VWAPExecutionAlgo
 from .algos.vwap_passive import PassiveVWAPExecutionAlgo
-from .state import ExecutionSchedule
+from .state import ChildOrder, ExecutionSchedule
 
 class ExecutionEngine:
     def __init__(self, strategy, config):
         self.strategy = strategy
+        self.orders = strategy.orders
         self.cfg = config
-        self._schedules = {}
+        self.latency = strategy.latency
+        self._on_bars_stage = self.latency.stage("execution.on_bars")
+        # Schedule book: one aggregated parent per instrument
+        self._schedules: Dict[object, ExecutionSchedule] = {}
+        # Bars of live parents at the current timestamp, not yet sliced
+        self._pending: List = []
+        self._pending_ts: int | None = None
+        # Working child orders, by client order ID and per instrument (oldest first)
+        self._children: Dict[object, ChildOrder] = {}
+        self._working: Dict[object, Dict[object, ChildOrder]] = {}
+        # What each netted delta did to the instrument's parent
+        self.netting: Dict[str, int] = dict.fromkeys(
+            ("opened", "kept", "resized", "flipped", "retired", "children_cancelled"), 0
+        )
 
         if config.algo == "vwap" and config.passive:
             self.algo = PassiveVWAPExecutionAlgo(config)
@@ -35,7 +51,22 @@ class ExecutionEngine:
     # Public API (used by strategy)
     # -----------------------------
     def submit_target(self, instrument_id, delta_qty, ts_event):
+        """
+        Net a new delta into the instrument's parent schedule.
+
+        ``delta_qty`` is measured against the current position, so it already
+        contains whatever the live parent had left: a parent whose remainder
+        equals the delta is kept as it is, a same-side delta resizes it in
+        place on its original horizon (progress so far carried into
+        ``total_qty``), and only a new parent or a flip starts a fresh horizon;
+        a zero delta retires the parent. Nothing is stacked. Working children
+        that no longer fit are cancelled: all of them on a flip, the newest
+        ones on a shrink.
+        """
+        schedule = self._schedules.get(instrument_id)
         if delta_qty == 0:
+            if schedule is not None:
+                self.retire(schedule)
             return
 
         end_ts = (
@@ -44,51 +75,244 @@ class ExecutionEngine:
             else ts_event + self.cfg.horizon_minutes * 60_000_000_000
         )
 
-        self._schedules.setdefault(instrument_id, []).append(
-            ExecutionSchedule(
+        if schedule is None:
+            self.netting["opened"] += 1
+            schedule = self._schedules[instrument_id] = ExecutionSchedule(
                 instrument_id=instrument_id,
                 remaining_qty=delta_qty,
                 start_ts=ts_event,
                 end_ts=end_ts,
+                total_qty=delta_qty,
+                working_qty=sum(c.leaves_qty for c in self._working.get(instrument_id, {}).values()),
             )
-        )
+        elif schedule.remaining_qty == delta_qty:
+            self.netting["kept"] += 1
+            return
+        elif schedule.remaining_qty * delta_qty > 0:
+            # Same side: keep the trajectory's horizon, rescale its size
+            self.netting["resized"] += 1
+            schedule.total_qty += delta_qty - schedule.remaining_qty
+            schedule.remaining_qty = delta_qty
+        else:
+            self.netting["flipped"] += 1
+            schedule.remaining_qty = delta_qty
+            schedule.total_qty = delta_qty
+            schedule.start_ts = ts_event
+            schedule.end_ts = end_ts
+
+        working = schedule.working_qty
+        if working * delta_qty < 0:
+            self.netting["children_cancelled"] += self.cancel_working(instrument_id)
+        elif abs(working) > abs(delta_qty):
+            self.netting["children_cancelled"] += self.shrink_working(instrument_id, delta_qty)
+
+    def submit_targets(self, instrument_ids, delta_qty: np.ndarray, ts_event):
+        """
+        Net one decision's deltas for a whole cross-section in one pass.
+
+        Live parents of instruments whose delta is now zero are retired.
+        """
+        updated = set()
+        for slot in np.flatnonzero(delta_qty):
+            instrument_id = instrument_ids[slot]
+            self.submit_target(instrument_id, int(delta_qty[slot]), ts_event)
+            updated.add(instrument_id)
+
+        if len(updated) < len(self._schedules):
+            for instrument_id in [i for i in self._schedules if i not in updated]:
+                self.retire(self._schedules[instrument_id])
+
+    def has_schedule(self, instrument_id) -> bool:
+        return instrument_id in self._schedules or bool(self._working.get(instrument_id))
+
+    def __len__(self) -> int:
+        return len(self._schedules)
 
     # -----------------------------
     # Called every bar
     # -----------------------------
 
     def on_bar(self, bar):
-        instrument_id = bar.bar_type.instrument_id
+        """
+        Buffer bars of live parents per timestamp and slice them as a batch.
+
+        The batch is flushed as soon as every live parent has printed at the
+        current timestamp, or when a later bar (or ``flush``) arrives.
+        """
+        if self._pending and bar.ts_event != self._pending_ts:
+            self.flush()
 
-        schedules = self._schedules.get(instrument_id)
-        if not schedules:
+        if bar.bar_type.instrument_id not in self._schedules:
             return
 
-        for schedule in list(schedules):
-            self.algo.on_bar(bar, schedule, self)
+        self._pending.append(bar)
+        self._pending_ts = bar.ts_event
+        if len(self._pending) >= len(self._schedules):
+            self.flush()
 
-            if schedule.remaining_qty == 0:
-                schedules.remove(schedule)
+    def flush(self):
+        bars, self._pending = self._pending, []
+        if bars:
+            self.on_bars(bars)
+
+    def on_bars(self, bars):
+        """Slice every parent with a bar in ``bars`` (one timestamp) in one pass."""
+        schedules = self._schedules
+        live = [(bar, schedules.get(bar.bar_type.instrument_id)) for bar in bars]
+        live = [(bar, schedule) for bar, schedule in live if schedule is not None]
+        if not live:
+            return
+
+        t0 = self.latency.now()
+        bars, batch = zip(*live)
+        self.algo.on_bars(list(bars), list(batch), self)
 
-        if not schedules:
-            self._schedules.pop(instrument_id, None)
+        for schedule in batch:
+            if schedule.remaining_qty == 0:
+                self.finish_schedule(schedule)
+        self.latency.lap(self._on_bars_stage, t0)
 
     # -----------------------------
     # Order submission
     # -----------------------------
 
+    def submit_batch(self, children):
+        """
+        Build, register and submit one wave's children in a single pass.
+
+        ``children`` holds ``(instrument_id, side, quantity, price)`` tuples,
+        ``price=None`` for market children. Before a limit is posted, stale
+        limits are cancelled and ``max_resting_orders`` is enforced.
+        """
+        orders = []
+        for instrument_id, side, quantity, price in children:
+            if price is None:
+                order = self.orders.market(instrument_id, side, quantity)
+            else:
+                self._make_room(instrument_id, price)
+                order = self.orders.limit(instrument_id, side, quantity, price)
+            self._track(order, instrument_id, side, quantity, price)
+            orders.append(order)
+        self.orders.submit_batch(orders)
+
     def submit_market_order(self, instrument_id, side, quantity):
-        self.strategy.submit_market_order(instrument_id, side, quantity)
+        self.submit_batch([(instrument_id, side, quantity, None)])
 
     def submit_limit_order(self, instrument_id, side, quantity, price):
-        self.strategy.submit_limit_order(instrument_id, side, quantity, price)
+        self.submit_batch([(instrument_id, side, quantity, price)])
+
+    def _make_room(self, instrument_id, price):
+        working = self._working.get(instrument_id)
+        if not working:
+            return
+        self.cancel_stale(instrument_id, price)
+        resting = [c for c in working.values() if c.price is not None and not c.cancelling]
+        # Oldest first, keeping room for the new child
+        for child in resting[: max(len(resting) - self.cfg.max_resting_orders + 1, 0)]:
+            self._cancel(child)
 
     def compute_passive_price(self, bar, side, offset_ticks=0):
-        tick_size = self.strategy.cache.instrument(bar.bar_type.instrument_id).price_increment
+        spec = self.orders.spec(bar.bar_type.instrument_id)
         if side == OrderSide.BUY:
-            return bar.close - tick_size * offset_ticks
+            return spec.price(bar.close - spec.price_increment * offset_ticks)
         else:
-            return bar.close + tick_size * offset_ticks
+            return spec.price(bar.close + spec.price_increment * offset_ticks)
 
     def finish_schedule(self, schedule):
-        self._schedules[schedule.instrument_id].remove(schedule)
+        """Retire a parent (O(1)) and cancel its resting limits; a parent already re-based or retired is left alone."""
+        if self._schedules.get(schedule.instrument_id) is schedule:
+            del self._schedules[schedule.instrument_id]
+            self.cancel_working(schedule.instrument_id, limits_only=True)
+
+    def retire(self, schedule):
+        """Retire a parent whose target the position has reached (netted delta of zero)."""
+        self.netting["retired"] += 1
+        self.finish_schedule(schedule)
+
+    def shrink_working(self, instrument_id, qty) -> int:
+        """Cancel the newest working children until the rest fit within ``qty`` (same side)."""
+        children = [c for c in self._working.get(instrument_id, {}).values() if not c.cancelling]
+        live = sum(c.leaves_qty for c in children)
+        cancelled = 0
+        for child in reversed(children):
+            if abs(live) <= abs(qty):
+                break
+            self._cancel(child)
+            live -= child.leaves_qty
+            cancelled += 1
+        return cancelled
+
+    def cancel_working(self, instrument_id, limits_only: bool = False) -> int:
+        cancelled = 0
+        for child in list(self._working.get(instrument_id, {}).values()):
+            if not limits_only or child.price is not None:
+                cancelled += not child.cancelling
+                self._cancel(child)
+        return cancelled
+
+    def cancel_stale(self, instrument_id, price=None):
+        """Cancel resting limits not at ``price`` (all of them when None)."""
+        for child in list(self._working.get(instrument_id, {}).values()):
+            if child.price is not None and (price is None or child.price != price):
+                self._cancel(child)
+
+    def _cancel(self, child: ChildOrder):
+        if not child.cancelling:
+            child.cancelling = True
+            self.strategy.cancel_order(child.order)
+
+    def _track(self, order, instrument_id, side, quantity, price=None):
+        # Registered before submission: denials are raised synchronously
+        if price is not None:
+            price = self.orders.spec(instrument_id).price(price)
+        signed_qty = int(quantity) if side == OrderSide.BUY else -int(quantity)
+        child = ChildOrder(order=order, instrument_id=instrument_id, leaves_qty=signed_qty, price=price)
+        self._children[order.client_order_id] = child
+        self._working.setdefault(instrument_id, {})[order.client_order_id] = child
+
+        schedule = self._schedules.get(instrument_id)
+        if schedule is not None:
+            schedule.working_qty += signed_qty
+
+    # -----------------------------
+    # Order events (forwarded by the strategy)
+    # -----------------------------
+
+    def on_order_filled(self, event):
+        child = self._children.get(event.client_order_id)
+        if child is None:
+            return
+
+        fill_qty = int(event.last_qty) if event.order_side == OrderSide.BUY else -int(event.last_qty)
+        child.leaves_qty -= fill_qty
+        if child.leaves_qty == 0 or child.leaves_qty * fill_qty < 0:
+            self._release(event.client_order_id)
+
+        schedule = self._schedules.get(child.instrument_id)
+        if schedule is None:
+            return
+        schedule.working_qty -= fill_qty
+        schedule.remaining_qty -= fill_qty
+        if schedule.remaining_qty * schedule.total_qty <= 0:
+            # Complete (or overfilled after a re-base)
+            schedule.remaining_qty = 0
+            self.finish_schedule(schedule)
+
+    def on_order_closed(self, event):
+        """Canceled / expired / rejected / denied: release the child's leaves."""
+        child = self._release(event.client_order_id)
+        if child is None:
+            return
+        schedule = self._schedules.get(child.instrument_id)
+        if schedule is not None:
+            schedule.working_qty -= child.leaves_qty
+
+    def _release(self, client_order_id) -> ChildOrder | None:
+        child = self._children.pop(client_order_id, None)
+        if child is None:
+            return None
+        working = self._working[child.instrument_id]
+        del working[client_order_id]
+        if not working:
+            del self._working[child.instrument_id]
+        return child
@@ -0,0 +1,86 @@
+# src/execution/orders.py
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+from nautilus_trader.model import Price, Quantity
+from nautilus_trader.model.enums import TimeInForce
+
+
+class InstrumentSpec:
+    """Precision and increments of one instrument, read once from the cache."""
+
+    __slots__ = ("size_precision", "price_precision", "size_increment", "price_increment", "lot_size")
+
+    def __init__(self, instrument):
+        self.size_precision = instrument.size_precision
+        self.price_precision = instrument.price_precision
+        self.size_increment = instrument.size_increment.as_double()
+        self.price_increment = instrument.price_increment
+        lot_size = instrument.lot_size
+        self.lot_size = lot_size.as_double() if lot_size is not None else self.size_increment
+
+    def qty(self, quantity) -> Quantity:
+        return Quantity(abs(quantity), self.size_precision)
+
+    def price(self, price) -> Price:
+        return price if isinstance(price, Price) else Price(price, self.price_precision)
+
+
+class OrderSubmitter:
+    """
+    Low-overhead order construction and submission for a strategy.
+
+    Instrument precision is cached per instrument, client order IDs come
+    from the strategy's order factory generator, and the children of one
+    wave are built first and then submitted in a single pass.
+    """
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self._specs: Dict[object, InstrumentSpec] = {}
+
+    def spec(self, instrument_id) -> InstrumentSpec:
+        spec = self._specs.get(instrument_id)
+        if spec is None:
+            instrument = self.strategy.cache.instrument(instrument_id)
+            if instrument is None:
+                raise ValueError(f"Instrument {instrument_id} not found in cache")
+            spec = self._specs[instrument_id] = InstrumentSpec(instrument)
+        return spec
+
+    # -----------------------------
+    # Construction
+    # -----------------------------
+
+    def market(self, instrument_id, side, quantity):
+        return self.strategy.order_factory.market(
+            instrument_id=instrument_id,
+            order_side=side,
+            quantity=self.spec(instrument_id).qty(quantity),
+            time_in_force=TimeInForce.IOC,
+        )
+
+    def limit(self, instrument_id, side, quantity, price):
+        spec = self.spec(instrument_id)
+        return self.strategy.order_factory.limit(
+            instrument_id=instrument_id,
+            order_side=side,
+            quantity=spec.qty(quantity),
+            price=spec.price(price),
+            time_in_force=TimeInForce.GTC,
+        )
+
+    # -----------------------------
+    # Submission
+    # -----------------------------
+
+    def submit(self, order) -> None:
+        self.strategy.submit_order(order)
+
+    def submit_batch(self, orders: Iterable) -> List:
+        orders = list(orders)
+        submit_order = self.strategy.submit_order
+        for order in orders:
+            submit_order(order)
+        return orders
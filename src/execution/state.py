@@ -3,9 +3,22 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionSchedule:
+    """Aggregated parent order: the one live schedule of an instrument."""
     instrument_id: object
-    remaining_qty: int
+    remaining_qty: int      # signed, not yet filled
     start_ts: int
     end_ts: int
+    total_qty: int = 0      # signed size when (re)based; progress = total - remaining
+    working_qty: int = 0    # signed leaves of live child orders
+
+
+@dataclass(slots=True)
+class ChildOrder:
+    """A working child order of a parent schedule."""
+    order: object
+    instrument_id: object
+    leaves_qty: int         # signed
+    price: object = None    # limit price; None for market children
+    cancelling: bool = False
@@ -0,0 +1,229 @@
+# src/instrumentation.py
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Log-linear histogram: 2**SUB_BITS buckets per power of two (<= ~3% error)
+SUB_BITS = 4
+SUB_BUCKETS = 1 << SUB_BITS
+BUCKETS = 64 * SUB_BUCKETS
+
+SOLVE_METHODS = ("closed_form", "bisection", "cvxpy")
+
+_DUMPS = itertools.count()
+
+
+def bucket_of(ns: int) -> int:
+    """Histogram bucket of a duration in nanoseconds."""
+    if ns <= 0:
+        return 0
+    e = ns.bit_length() - 1
+    # Top SUB_BITS bits below the leading one
+    return e * SUB_BUCKETS + ((ns << SUB_BITS) >> e) - SUB_BUCKETS
+
+
+def bucket_bounds(buckets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``[lower, upper)`` nanoseconds of each bucket index."""
+    e, m = np.divmod(np.asarray(buckets, dtype=np.float64), SUB_BUCKETS)
+    scale = np.exp2(e - SUB_BITS)
+    return (SUB_BUCKETS + m) * scale, (SUB_BUCKETS + m + 1) * scale
+
+
+class LatencyRecorder:
+    """
+    Per-stage latency histograms and a per-decision solver log.
+
+    Stages are registered up front (``stage`` returns the row index), so a
+    sample is a ``perf_counter_ns`` read plus an increment into a
+    preallocated ``(stages, BUCKETS)`` count matrix. Timing is lap-style:
+
+        t = rec.now()
+        ...
+        t = rec.lap(PRICES, t)    # records the stage, returns a new start
+
+    Each decision also gets a row (timestamp, total latency, solve latency,
+    solver method / status / iterations) in arrays that double when full.
+    """
+
+    enabled = True
+
+    def __init__(self, capacity: int = 1 << 14):
+        self.names: List[str] = []
+        self.counts = np.zeros((0, BUCKETS), dtype=np.int64)
+        self.total_ns = np.zeros(0, dtype=np.int64)
+        self.max_ns = np.zeros(0, dtype=np.int64)
+
+        self.n_decisions = 0
+        self._ts = np.zeros(capacity, dtype=np.int64)
+        self._decision_ns = np.zeros(capacity, dtype=np.int64)
+        self._solve_ns = np.zeros(capacity, dtype=np.int64)
+        self._method = np.zeros(capacity, dtype=np.int8)
+        self._iterations = np.zeros(capacity, dtype=np.int32)
+        self._status: List[str] = []
+
+    def stage(self, name: str) -> int:
+        if name in self.names:
+            return self.names.index(name)
+        self.names.append(name)
+        self.counts = np.vstack([self.counts, np.zeros((1, BUCKETS), dtype=np.int64)])
+        self.total_ns = np.append(self.total_ns, 0)
+        self.max_ns = np.append(self.max_ns, 0)
+        return len(self.names) - 1
+
+    # -----------------------------
+    # Recording (hot path)
+    # -----------------------------
+
+    @staticmethod
+    def now() -> int:
+        return time.perf_counter_ns()
+
+    def lap(self, stage: int, t0: int) -> int:
+        t1 = time.perf_counter_ns()
+        self.record(stage, t1 - t0)
+        return t1
+
+    def record(self, stage: int, elapsed_ns: int) -> None:
+        self.counts[stage, bucket_of(elapsed_ns)] += 1
+        self.total_ns[stage] += elapsed_ns
+        if elapsed_ns > self.max_ns[stage]:
+            self.max_ns[stage] = elapsed_ns
+
+    def record_decision(self, ts_event: int, decision_ns: int, solve_ns: int, optimizer) -> None:
+        i = self.n_decisions
+        if i == len(self._ts):
+            self._grow()
+        self._ts[i] = ts_event
+        self._decision_ns[i] = decision_ns
+        self._solve_ns[i] = solve_ns
+        self._method[i] = SOLVE_METHODS.index(optimizer.last_method) if optimizer.last_method in SOLVE_METHODS else -1
+        self._iterations[i] = optimizer.last_iterations
+        self._status.append(optimizer.last_status)
+        self.n_decisions = i + 1
+
+    def _grow(self) -> None:
+        for name in ("_ts", "_decision_ns", "_solve_ns", "_method", "_iterations"):
+            array = getattr(self, name)
+            grown = np.zeros(2 * len(array), dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
+
+    # -----------------------------
+    # Reporting
+    # -----------------------------
+
+    def quantiles(self, stage: int, qs=(0.5, 0.9, 0.99)) -> np.ndarray:
+        """Quantiles of a stage in nanoseconds, at the midpoint of their bucket."""
+        counts = self.counts[stage]
+        total = counts.sum()
+        if not total:
+            return np.full(len(qs), np.nan)
+        buckets = np.searchsorted(np.cumsum(counts), np.ceil(np.asarray(qs) * total))
+        lower, upper = bucket_bounds(buckets)
+        return np.minimum(0.5 * (lower + upper), self.max_ns[stage])
+
+    def summary(self) -> pd.DataFrame:
+        """One row per stage: count, mean, p50 / p90 / p99 and max in microseconds."""
+        rows = []
+        for stage, name in enumerate(self.names):
+            count = int(self.counts[stage].sum())
+            p50, p90, p99 = self.quantiles(stage) / 1e3
+            rows.append({
+                "stage": name,
+                "count": count,
+                "mean_us": self.total_ns[stage] / count / 1e3 if count else np.nan,
+                "p50_us": p50,
+                "p90_us": p90,
+                "p99_us": p99,
+                "max_us": self.max_ns[stage] / 1e3,
+                "total_ms": self.total_ns[stage] / 1e6,
+            })
+        return pd.DataFrame(rows).set_index("stage") if rows else pd.DataFrame()
+
+    def decisions(self) -> pd.DataFrame:
+        n = self.n_decisions
+        methods = np.array([*SOLVE_METHODS, "unknown"])
+        return pd.DataFrame({
+            "ts_event": pd.to_datetime(self._ts[:n], utc=True),
+            "decision_us": self._decision_ns[:n] / 1e3,
+            "solve_us": self._solve_ns[:n] / 1e3,
+            "method": methods[self._method[:n]],
+            "status": self._status[:n],
+            "iterations": self._iterations[:n],
+        })
+
+    def solver_summary(self) -> pd.DataFrame:
+        """Decision count, solve latency and iterations per solver method / status."""
+        decisions = self.decisions()
+        if decisions.empty:
+            return pd.DataFrame()
+        return decisions.groupby(["method", "status"]).agg(
+            count=("solve_us", "size"),
+            p50_solve_us=("solve_us", "median"),
+            p99_solve_us=("solve_us", lambda s: s.quantile(0.99)),
+            mean_iterations=("iterations", "mean"),
+            max_iterations=("iterations", "max"),
+        )
+
+    def dump(self, output_dir: str | None = None, tag: str = "latency") -> Dict[str, str]:
+        """
+        Print the stage and solver tables; with ``output_dir`` also write the
+        stage summary and the per-decision log as CSV.
+
+        File names carry the first decision date, the process ID and a
+        per-process sequence number, so shards and sweep points sharing an
+        output directory do not overwrite each other.
+        """
+        summary = self.summary()
+        print("Latency by stage (us):")
+        print(summary.round(1).to_string() if not summary.empty else "  (no samples)")
+        solver = self.solver_summary()
+        if not solver.empty:
+            print("Solver:")
+            print(solver.round(1).to_string())
+
+        if output_dir is None:
+            return {}
+
+        first = pd.Timestamp(int(self._ts[0]), tz="UTC") if self.n_decisions else None
+        stem = f"{tag}_{first:%Y%m%d}" if first is not None else tag
+        stem = f"{stem}_{os.getpid()}_{next(_DUMPS)}"
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {
+            "stages": os.path.join(output_dir, f"{stem}_stages.csv"),
+            "decisions": os.path.join(output_dir, f"{stem}_decisions.csv"),
+        }
+        summary.to_csv(paths["stages"])
+        self.decisions().to_csv(paths["decisions"], index=False)
+        return paths
+
+
+class NullRecorder:
+    """Drop-in for ``LatencyRecorder`` when instrumentation is off: every call is a no-op."""
+
+    enabled = False
+
+    def stage(self, name: str) -> int:
+        return 0
+
+    @staticmethod
+    def now() -> int:
+        return 0
+
+    def lap(self, stage: int, t0: int) -> int:
+        return 0
+
+    def record(self, stage: int, elapsed_ns: int) -> None:
+        pass
+
+    def record_decision(self, ts_event: int, decision_ns: int, solve_ns: int, optimizer) -> None:
+        pass
+
+    def dump(self, output_dir: str | None = None, tag: str = "latency") -> Dict[str, str]:
+        return {}
@@ -0,0 +1,104 @@
+# src/intraday.py
+from __future__ import annotations
+
+import numpy as np
+
+from .portfolio import PortfolioState
+
+
+class IntradayVWAP:
+    """
+    Cross-sectional intraday VWAP, market volume and own participation.
+
+    Running notional, volume and filled quantity are per-slot fields of the
+    ``PortfolioState``. Sessions run from one session open (int64 ns, from
+    the strategy's ``SessionIndex``) to the next, located with one binary
+    search per session change; a name's sums are reset lazily by its first
+    bar of a new session, so a bar costs a bounds check and a few writes.
+
+    The accessors return vectors over the live slots; names that have not
+    printed in the current session read as no volume (VWAP NaN).
+    """
+
+    def __init__(self, state: PortfolioState):
+        self.state = state
+        for name, dtype, fill in (
+            ("vwap_notional", np.float64, 0.0),
+            ("vwap_volume", np.float64, 0.0),
+            ("vwap_filled", np.float64, 0.0),
+            # Session open the slot's sums belong to
+            ("vwap_session", np.int64, -1),
+        ):
+            state.register(name, dtype, fill)
+
+        self.session_opens: np.ndarray | None = None
+        self.session_open = -1
+        self._window = (0, -1)   # [current open, next open)
+
+    def bind(self, sessions) -> None:
+        self.session_opens = np.asarray(sessions.session_opens, dtype=np.int64)
+        self._window = (0, -1)
+
+    def _roll(self, ts_ns: int) -> None:
+        opens = self.session_opens
+        i = int(np.searchsorted(opens, ts_ns, side="right")) - 1
+        # Before the first session: its own bucket, ending at the first open
+        self.session_open = int(opens[i]) if i >= 0 else -1
+        end = int(opens[i + 1]) if i + 1 < len(opens) else np.iinfo(np.int64).max
+        self._window = (self.session_open if i >= 0 else np.iinfo(np.int64).min, end)
+
+    def _slot(self, instrument_id, ts_ns: int) -> int | None:
+        slot = self.state.slots.get(instrument_id)
+        if slot is None:
+            return None
+        start, end = self._window
+        if not start <= ts_ns < end:
+            self._roll(ts_ns)
+        state = self.state
+        if state.vwap_session[slot] != self.session_open:
+            state.vwap_session[slot] = self.session_open
+            state.vwap_notional[slot] = 0.0
+            state.vwap_volume[slot] = 0.0
+            state.vwap_filled[slot] = 0.0
+        return slot
+
+    # -----------------------------
+    # Updates
+    # -----------------------------
+
+    def update(self, instrument_id, ts_ns: int, price: float, volume: float) -> None:
+        slot = self._slot(instrument_id, ts_ns)
+        if slot is None:
+            return
+        self.state.vwap_notional[slot] += price * volume
+        self.state.vwap_volume[slot] += volume
+
+    def record_fill(self, instrument_id, ts_ns: int, quantity: float) -> None:
+        slot = self._slot(instrument_id, ts_ns)
+        if slot is None:
+            return
+        self.state.vwap_filled[slot] += abs(quantity)
+
+    # -----------------------------
+    # Cross-section
+    # -----------------------------
+
+    def _live(self) -> np.ndarray:
+        return self.state.vwap_session == self.session_open
+
+    def vwap(self) -> np.ndarray:
+        state = self.state
+        out = np.full(len(state), np.nan)
+        np.divide(state.vwap_notional, state.vwap_volume, out=out, where=self._live() & (state.vwap_volume > 0))
+        return out
+
+    def volume(self) -> np.ndarray:
+        """Market volume traded so far this session."""
+        return np.where(self._live(), self.state.vwap_volume, 0.0)
+
+    def participation(self) -> np.ndarray:
+        """Own filled quantity over market volume this session (0 without volume)."""
+        state = self.state
+        out = np.zeros(len(state))
+        np.divide(state.vwap_filled, state.vwap_volume, out=out, where=self._live() & (state.vwap_volume > 0))
+        return out
@@ -0,0 +1,225 @@
+# src/liquidity.py
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+LIQUIDITY_DIR = "liquidity"
+INDEX_FILE = "liquidity_index.parquet"
+DEFAULT_WINDOW = 20
+
+RAW_COLUMNS = ["instrument_id", "date", "close", "volume"]
+
+
+def index_path(catalog_path: str) -> str:
+    return os.path.join(os.path.expanduser(catalog_path), LIQUIDITY_DIR, INDEX_FILE)
+
+
+def compute_liquidity_metrics(daily: pd.DataFrame, window: int = DEFAULT_WINDOW) -> pd.DataFrame:
+    """
+    Rolling liquidity metrics per instrument from daily close / volume.
+
+    Parameters
+    ----------
+    daily : pd.DataFrame
+        Columns ``instrument_id``, ``date`` (UTC), ``close``, ``volume``.
+    window : int
+        Rolling window in sessions.
+
+    Returns
+    -------
+    pd.DataFrame
+        The input columns plus ``dollar_volume``, ``adv`` (shares),
+        ``adv_usd`` and ``volatility`` (std of daily log returns), all as of
+        the close of ``date``.
+    """
+    df = daily[RAW_COLUMNS].sort_values(["instrument_id", "date"], kind="stable").reset_index(drop=True)
+    df["dollar_volume"] = df["close"] * df["volume"]
+    df["log_return"] = np.log(df["close"]).groupby(df["instrument_id"], sort=False).diff()
+
+    grouped = df.groupby("instrument_id", sort=False)
+
+    def rolling(column: str, min_periods: int):
+        return grouped[column].rolling(window, min_periods=min_periods)
+
+    df["adv"] = rolling("volume", 1).mean().reset_index(level=0, drop=True)
+    df["adv_usd"] = rolling("dollar_volume", 1).mean().reset_index(level=0, drop=True)
+    df["volatility"] = rolling("log_return", 2).std().reset_index(level=0, drop=True)
+    return df.drop(columns="log_return")
+
+
+def load_liquidity_index(catalog_path: str) -> pd.DataFrame | None:
+    path = index_path(catalog_path)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
+
+
+def save_liquidity_index(catalog_path: str, index: pd.DataFrame) -> None:
+    path = index_path(catalog_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    index.sort_values(["date", "instrument_id"]).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def update_liquidity_index(
+    catalog_path: str,
+    daily: pd.DataFrame,
+    window: int = DEFAULT_WINDOW,
+    replace: bool = False,
+) -> pd.DataFrame:
+    """
+    Merge new daily rows into the on-disk index.
+
+    Only the touched instruments are recomputed, from their last ``window``
+    indexed sessions plus the new rows; restated days replace existing ones.
+    With ``replace=True`` the index is rebuilt from ``daily`` alone.
+    """
+    daily = daily[RAW_COLUMNS]
+    existing = None if replace else load_liquidity_index(catalog_path)
+
+    if existing is None or existing.empty:
+        index = compute_liquidity_metrics(daily, window)
+    else:
+        keys = pd.MultiIndex.from_frame(daily[["instrument_id", "date"]])
+        stale = pd.MultiIndex.from_frame(existing[["instrument_id", "date"]]).isin(keys)
+        touched = existing["instrument_id"].isin(daily["instrument_id"].unique())
+        # History excludes the restated days, so it holds a full window
+        history = (
+            existing.loc[touched & ~stale, RAW_COLUMNS]
+            .sort_values("date")
+            .groupby("instrument_id", sort=False)
+            .tail(window)
+        )
+        work = pd.concat([history, daily]).drop_duplicates(["instrument_id", "date"], keep="last")
+        fresh = compute_liquidity_metrics(work, window).merge(
+            daily[["instrument_id", "date"]], on=["instrument_id", "date"]
+        )
+        index = pd.concat([existing[~stale], fresh], ignore_index=True)
+
+    save_liquidity_index(catalog_path, index)
+    return index
+
+
+def build_liquidity_index(catalog, window: int = DEFAULT_WINDOW) -> pd.DataFrame:
+    """Build the index from the catalog's 1-DAY bars (one full scan)."""
+    bar_types = [f"{inst.id}-1-DAY-LAST-EXTERNAL" for inst in catalog.instruments()]
+    bars = catalog.bars(bar_types=bar_types) if bar_types else []
+
+    daily = pd.DataFrame(
+        {
+            "instrument_id": [str(bar.bar_type.instrument_id) for bar in bars],
+            "date": pd.to_datetime([bar.ts_event for bar in bars], unit="ns", utc=True),
+            "close": [bar.close.as_double() for bar in bars],
+            "volume": [bar.volume.as_double() for bar in bars],
+        }
+    )
+    return update_liquidity_index(str(catalog.path), daily, window, replace=True)
+
+
+def top_liquid(
+    index: pd.DataFrame,
+    limit: int,
+    as_of=None,
+    by: str = "adv_usd",
+) -> List[str]:
+    """
+    Top ``limit`` instrument IDs ranked by ``by`` as of a date.
+
+    Uses each instrument's latest metrics strictly before ``as_of`` (known at
+    that session's open), or the latest available when ``as_of`` is None.
+    """
+    if as_of is not None:
+        as_of = pd.Timestamp(as_of)
+        as_of = as_of.tz_localize("UTC") if as_of.tzinfo is None else as_of.tz_convert("UTC")
+        index = index[index["date"] < as_of]
+
+    latest = index.sort_values("date").groupby("instrument_id", sort=False).tail(1)
+    ranked = latest.sort_values([by, "instrument_id"], ascending=[False, True])
+    return ranked["instrument_id"].head(limit).tolist()
+
+
+def rolling_universe(
+    index: pd.DataFrame,
+    sessions,
+    limit: int,
+    by: str = "adv_usd",
+) -> Dict[str, List[str]]:
+    """
+    Point-in-time universe per session: ``{"YYYY-MM-DD": [instrument_id, ...]}``.
+
+    Equivalent to ``top_liquid(index, limit, as_of=session)`` for every
+    session, computed from one wide (date x instrument) table: metrics are
+    forward-filled, then looked up as of the last index date strictly before
+    each session. Sessions with no prior history get an empty list.
+    """
+    dates = pd.DatetimeIndex(pd.to_datetime(list(sessions), utc=True)).normalize()
+    if index.empty or dates.empty:
+        return {d.strftime("%Y-%m-%d"): [] for d in dates}
+
+    wide = (
+        index.pivot_table(index="date", columns="instrument_id", values=by, aggfunc="last")
+        .sort_index()
+        .ffill()
+    )
+    wide = wide[sorted(wide.columns)]
+    columns = np.asarray(wide.columns)
+    values = wide.to_numpy()
+
+    # Row of the last index date strictly before each session (-1: none)
+    rows = np.searchsorted(wide.index.values, dates.values, side="left") - 1
+
+    schedule: Dict[str, List[str]] = {}
+    for date, row in zip(dates, rows):
+        members: List[str] = []
+        if row >= 0:
+            metric = values[row]
+            valid = np.flatnonzero(~np.isnan(metric))
+            # Stable sort on -metric keeps instrument_id order on ties
+            order = valid[np.argsort(-metric[valid], kind="stable")]
+            members = columns[order[:limit]].tolist()
+        schedule[date.strftime("%Y-%m-%d")] = members
+    return schedule
+
+
+def membership_windows(
+    schedule: Dict[str, List[str]],
+    exit_days: int = 1,
+) -> Dict[str, List[Tuple[pd.Timestamp, pd.Timestamp]]]:
+    """
+    Contiguous membership runs per instrument as ``[start, end)`` UTC windows.
+
+    Each run starts at its first session date and ends ``exit_days`` sessions
+    after the last one, so names dropping out of the universe keep their bars
+    long enough to be unwound.
+    """
+    dates = sorted(schedule)
+    stamps = [pd.Timestamp(d, tz="UTC") for d in dates]
+    stamps.append(stamps[-1] + pd.Timedelta(days=1) if stamps else None)
+
+    runs: Dict[str, List[Tuple[int, int]]] = {}
+    for i, date in enumerate(dates):
+        for inst_id in schedule[date]:
+            spans = runs.setdefault(inst_id, [])
+            if spans and spans[-1][1] == i:
+                spans[-1] = (spans[-1][0], i + 1)
+            else:
+                spans.append((i, i + 1))
+
+    windows: Dict[str, List[Tuple[pd.Timestamp, pd.Timestamp]]] = {}
+    for inst_id, spans in runs.items():
+        merged: List[Tuple[int, int]] = []
+        for a, b in spans:
+            b = min(b + exit_days, len(dates))
+            if merged and a <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(b, merged[-1][1]))
+            else:
+                merged.append((a, b))
+        windows[inst_id] = [
+            (stamps[a], stamps[b] if b < len(dates) else stamps[-1]) for a, b in merged
+        ]
+    return windows
@@ -0,0 +1,161 @@
+# src/market_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from functools import lru_cache
+from typing import Dict, List
+
+import pandas as pd
+import pyarrow as pa
+
+from nautilus_trader.model.data import Bar
+from nautilus_trader.serialization.arrow.serializer import ArrowSerializer
+
+# tmpfs when available: the decoded bars live in RAM, shared by every process
+DEFAULT_ROOT = os.path.join(
+    "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+    "nautilus_intraday",
+)
+
+MANIFEST_FILE = "manifest.json"
+INSTRUMENTS_FILE = "instruments.pkl"
+
+
+# -----------------------------
+# Build
+# -----------------------------
+
+def cache_key(catalog_path: str, data_configs: List) -> str:
+    """
+    Digest of the configs' queries and of the Parquet files they read.
+
+    Re-ingesting a bar type changes its files (name, size or mtime), so a
+    cache is never served for data that has since moved.
+    """
+    digest = hashlib.sha1(os.path.abspath(os.path.expanduser(catalog_path)).encode())
+    for config in data_configs:
+        query = config.query
+        digest.update(json.dumps(query, sort_keys=True, default=str).encode())
+        for identifier in query.get("identifiers") or ():
+            directory = os.path.join(os.path.expanduser(catalog_path), "data", "bar", identifier)
+            if not os.path.isdir(directory):
+                continue
+            for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+                stat = entry.stat()
+                digest.update(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def build_market_cache(catalog, data_configs: List, root: str | None = None, rebuild: bool = False) -> str:
+    """
+    Decode the bars of ``data_configs`` once into a shared cache directory.
+
+    Every bar type becomes one Arrow IPC file (all of its windows, ordered
+    by ``ts_init``) next to a manifest and the pickled instruments; the
+    directory is named by ``cache_key`` so runs over the same universe and
+    dates reuse it. Built in a temporary directory and renamed into place,
+    so readers never see a partial cache.
+
+    Returns
+    -------
+    str
+        The cache directory, to pass to ``MarketDataCache`` / ``run_backtest``.
+    """
+    root = os.path.expanduser(root or DEFAULT_ROOT)
+    path = os.path.join(root, cache_key(catalog.path, data_configs))
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)) and not rebuild:
+        return path
+
+    by_type: Dict[str, List[Bar]] = {}
+    for config in data_configs:
+        query = config.query
+        for identifier in query["identifiers"]:
+            by_type.setdefault(identifier, []).extend(
+                catalog.query(Bar, identifiers=[identifier], start=query["start"], end=query["end"])
+            )
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    rows = {}
+    for bar_type, bars in by_type.items():
+        if not bars:
+            continue
+        bars.sort(key=lambda bar: bar.ts_init)
+        table = ArrowSerializer.serialize_batch(bars, Bar)
+        with pa.OSFile(os.path.join(tmp_path, f"{bar_type}.arrow"), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        rows[bar_type] = len(bars)
+
+    instrument_ids = sorted({bar_type.split("-", 1)[0] for bar_type in by_type})
+    with open(os.path.join(tmp_path, INSTRUMENTS_FILE), "wb") as f:
+        pickle.dump(catalog.instruments(instrument_ids=instrument_ids), f)
+
+    with open(os.path.join(tmp_path, MANIFEST_FILE), "w") as f:
+        json.dump({"catalog": catalog.path, "rows": rows}, f)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    print(f"Market cache built at {path}: {sum(rows.values()):,} bars, {len(rows)} bar types")
+    return path
+
+
+# -----------------------------
+# Attach
+# -----------------------------
+
+class MarketDataCache:
+    """
+    Read-only, memory-mapped view of a cache built by ``build_market_cache``.
+
+    The Arrow tables are mapped, not read: attaching costs no decode and the
+    pages are shared with every other process using the same cache. Bars
+    are only materialized, for the requested window, by ``bars``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+
+        self.tables: Dict[str, pa.Table] = {}
+        self._ts_init = {}
+        for bar_type in self.manifest["rows"]:
+            source = pa.memory_map(os.path.join(path, f"{bar_type}.arrow"))
+            table = pa.ipc.open_file(source).read_all()
+            self.tables[bar_type] = table
+            self._ts_init[bar_type] = table.column("ts_init").to_numpy()
+
+    def __len__(self) -> int:
+        return sum(self.manifest["rows"].values())
+
+    def instruments(self) -> List:
+        with open(os.path.join(self.path, INSTRUMENTS_FILE), "rb") as f:
+            return pickle.load(f)
+
+    def bars(self, start=None, end=None) -> List[Bar]:
+        """Bars with ``start <= ts_init <= end`` across every bar type."""
+        start_ns = pd.Timestamp(start).value if start is not None else None
+        end_ns = pd.Timestamp(end).value if end is not None else None
+
+        bars: List[Bar] = []
+        for bar_type, table in self.tables.items():
+            ts_init = self._ts_init[bar_type]
+            lo = ts_init.searchsorted(start_ns, side="left") if start_ns is not None else 0
+            hi = ts_init.searchsorted(end_ns, side="right") if end_ns is not None else len(ts_init)
+            if hi > lo:
+                bars.extend(Bar.from_pyo3_list(ArrowSerializer.deserialize(Bar, table.slice(lo, hi - lo))))
+        return bars
+
+
+@lru_cache(maxsize=None)
+def attach_market_cache(path: str) -> MarketDataCache:
+    """Attach once per process; later runs (sweep points, shards) reuse the mapping."""
+    return MarketDataCache(path)
@@ -0,0 +1,163 @@
+# src/portfolio.py
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# (name, dtype, fill value) of every per-instrument vector
+_FIELDS = (
+    # Market / account state
+    ("prices", np.float64, np.nan),
+    ("has_price", np.bool_, False),
+    ("in_universe", np.bool_, True),
+    ("positions", np.float64, 0.0),
+    ("position_usd", np.float64, 0.0),
+    # Optimizer inputs
+    ("alpha", np.float64, 0.0),
+    ("trading_cost", np.float64, 0.0),
+    ("risk_lambda", np.float64, 0.0),
+    ("clip_pos_usd", np.float64, 0.0),
+    ("clip_trd_usd", np.float64, 0.0),
+    ("factor_loading", np.float64, 0.0),
+    # Optimizer outputs / wave
+    ("target_usd", np.float64, 0.0),
+    ("target_qty", np.float64, 0.0),
+    ("trades", np.float64, 0.0),
+)
+
+
+class PortfolioState:
+    """
+    Fixed-order, NumPy-backed portfolio state for the decision loop.
+
+    Every per-instrument field is a preallocated float64 array indexed by the
+    instrument's slot, updated incrementally from bars and position events,
+    so the optimizer and the execution wave read the vectors directly
+    instead of rebuilding pandas objects every minute.
+
+    Instruments can be added and removed (rolling universe). Live slots are
+    kept dense in ``[0, n)`` by swap-removal and the buffers grow by
+    doubling, so the public field arrays stay contiguous views and a
+    universe change never rebuilds the state from scratch.
+
+    Other components keep their own per-instrument arrays in the same slots
+    with ``register`` (e.g. the signal engine's ring buffers, one row per
+    instrument), so they follow every add / remove / grow for free.
+    """
+
+    def __init__(self, instrument_ids: Iterable = (), capacity: int = 0):
+        self.instrument_ids: List = []
+        self.slots: Dict[object, int] = {}
+        self._capacity = 0
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._fields = [(name, dtype, fill, ()) for name, dtype, fill in _FIELDS]
+        self._grow(max(capacity, 1))
+        self.add(instrument_ids)
+
+    def __len__(self) -> int:
+        return len(self.instrument_ids)
+
+    def __contains__(self, instrument_id) -> bool:
+        return instrument_id in self.slots
+
+    def register(self, name: str, dtype, fill, shape: tuple = ()) -> None:
+        """Add a per-instrument field of ``shape`` per slot, bound as ``self.<name>``."""
+        if name in self._buffers:
+            raise ValueError(f"Field {name} is already registered")
+        self._fields.append((name, dtype, fill, tuple(shape)))
+        self._buffers[name] = np.full((self._capacity, *shape), fill, dtype=dtype)
+        self._bind()
+
+    # -----------------------------
+    # Membership
+    # -----------------------------
+
+    def add(self, instrument_ids: Iterable) -> None:
+        new_ids = [i for i in dict.fromkeys(instrument_ids) if i not in self.slots]
+        if not new_ids:
+            return
+
+        n = len(self.instrument_ids)
+        if n + len(new_ids) > self._capacity:
+            self._grow(max(2 * self._capacity, n + len(new_ids)))
+
+        for name, _, fill, _ in self._fields:
+            self._buffers[name][n:n + len(new_ids)] = fill
+        for i, inst_id in enumerate(new_ids, start=n):
+            self.slots[inst_id] = i
+        self.instrument_ids.extend(new_ids)
+        self._bind()
+
+    def remove(self, instrument_ids: Iterable) -> None:
+        removed = False
+        for inst_id in instrument_ids:
+            slot = self.slots.pop(inst_id, None)
+            if slot is None:
+                continue
+            last = len(self.instrument_ids) - 1
+            if slot != last:
+                moved = self.instrument_ids[last]
+                for buffer in self._buffers.values():
+                    buffer[slot] = buffer[last]
+                self.instrument_ids[slot] = moved
+                self.slots[moved] = slot
+            self.instrument_ids.pop()
+            removed = True
+        if removed:
+            self._bind()
+
+    def _grow(self, capacity: int) -> None:
+        n = len(self.instrument_ids)
+        for name, dtype, fill, shape in self._fields:
+            buffer = np.full((capacity, *shape), fill, dtype=dtype)
+            if name in self._buffers:
+                buffer[:n] = self._buffers[name][:n]
+            self._buffers[name] = buffer
+        self._capacity = capacity
+
+    def _bind(self) -> None:
+        # Public fields are views over the live slots
+        n = len(self.instrument_ids)
+        for name, _, _, _ in self._fields:
+            setattr(self, name, self._buffers[name][:n])
+
+    # -----------------------------
+    # Incremental updates
+    # -----------------------------
+
+    def update_price(self, instrument_id, price: float) -> None:
+        slot = self.slots.get(instrument_id)
+        if slot is None:
+            return
+        self.prices[slot] = price
+        self.has_price[slot] = True
+
+    def update_position(self, instrument_id, signed_qty: float) -> None:
+        slot = self.slots.get(instrument_id)
+        if slot is None:
+            return
+        self.positions[slot] = signed_qty
+
+    # -----------------------------
+    # Derived vectors (in place)
+    # -----------------------------
+
+    def mark(self) -> np.ndarray:
+        """Mark positions to market into ``position_usd`` (0 where unpriced)."""
+        np.multiply(self.positions, self.prices, out=self.position_usd)
+        self.position_usd[~self.has_price] = 0.0
+        return self.position_usd
+
+    def compute_trades(self) -> np.ndarray:
+        """Share deltas from ``target_usd`` into ``target_qty`` / ``trades``."""
+        np.divide(
+            self.target_usd,
+            self.prices,
+            out=self.target_qty,
+            where=self.has_price,
+        )
+        self.target_qty[~self.has_price] = 0.0
+        np.subtract(self.target_qty, self.positions, out=self.trades)
+        self.trades[~self.has_price] = 0.0
+        return self.trades
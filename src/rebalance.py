@@ -0,0 +1,144 @@
+# src/rebalance.py
+from __future__ import annotations
+
+import numpy as np
+
+from .portfolio import PortfolioState
+
+NS_PER_MINUTE = 60_000_000_000
+
+# Optimizer inputs watched by the change detector (state fields)
+WATCHED = ("alpha", "risk_lambda", "clip_pos_usd", "position_usd")
+
+
+class RebalanceController:
+    """
+    Decides when the decision loop re-solves and which deltas it trades.
+
+    - ``interval_minutes``: minimum spacing between solves;
+    - ``change_threshold``: the solve is skipped while every watched input
+      vector (alpha, risk, position caps, marked positions) has moved less
+      than this relative L2 distance since the last solve; a name entering
+      or leaving the universe always counts as a change, and
+      ``max_interval_minutes`` forces a solve regardless;
+    - ``round_to_lots``: share targets are rounded to the instrument's lot
+      size and the deltas to its size increment, so a target that moved by
+      less than half a lot leaves the live parent as it is;
+    - ``no_trade_band_usd`` / ``no_trade_band_lots``: deltas inside the band
+      are zeroed like sub-``min_trade_qty`` ones, so no schedule is opened
+      (and a live parent that is this close to its target is retired).
+
+    The snapshots of the last solve and the lot sizes / increments are
+    per-slot fields of the ``PortfolioState`` (NaN for names added since),
+    so they follow the rolling universe.
+    """
+
+    def __init__(self, state: PortfolioState, config, orders=None):
+        self.state = state
+        self.cfg = config
+        self.orders = orders
+        for name in WATCHED:
+            state.register(f"rb_{name}", np.float64, np.nan)
+        state.register("lot_size", np.float64, np.nan)
+        state.register("size_increment", np.float64, np.nan)
+
+        self.last_solve_ts: int | None = None
+        self.last_solve_size = 0
+        self.last_change = np.inf
+        self.solves = 0
+        self.skipped = 0
+
+    # -----------------------------
+    # Solve gating
+    # -----------------------------
+
+    def change(self) -> float:
+        """Largest relative L2 move of the watched inputs since the last solve (inf if incomparable)."""
+        state = self.state
+        # A name removed since (swap-removal carries the snapshots along)
+        if len(state) != self.last_solve_size:
+            return np.inf
+        largest = 0.0
+        for name in WATCHED:
+            new, old = getattr(state, name), getattr(state, f"rb_{name}")
+            move = np.linalg.norm(new - old)
+            # NaN snapshot (a name added since): an unbounded change
+            if move != move:
+                return np.inf
+            scale = max(np.linalg.norm(new), np.linalg.norm(old), 1e-12)
+            largest = max(largest, move / scale)
+        return largest
+
+    def should_solve(self, ts_event: int) -> bool:
+        cfg = self.cfg
+        if self.last_solve_ts is None:
+            return True
+        elapsed = (ts_event - self.last_solve_ts) // NS_PER_MINUTE
+        if elapsed < cfg.interval_minutes:
+            solve = False
+        elif cfg.max_interval_minutes and elapsed >= cfg.max_interval_minutes:
+            solve = True
+        elif cfg.change_threshold > 0:
+            self.last_change = self.change()
+            solve = self.last_change >= cfg.change_threshold
+        else:
+            solve = True
+        if not solve:
+            self.skipped += 1
+        return solve
+
+    def solved(self, ts_event: int) -> None:
+        """Snapshot the inputs the solve at ``ts_event`` used."""
+        state = self.state
+        for name in WATCHED:
+            getattr(state, f"rb_{name}")[:] = getattr(state, name)
+        self.last_solve_ts = ts_event
+        self.last_solve_size = len(state)
+        self.solves += 1
+
+    # -----------------------------
+    # Tradable deltas
+    # -----------------------------
+
+    def _load_specs(self) -> None:
+        """Lot size and size increment of names not seen yet, from the instrument specs."""
+        state = self.state
+        for slot in np.flatnonzero(np.isnan(state.lot_size)):
+            spec = self.orders.spec(state.instrument_ids[slot])
+            state.lot_size[slot] = spec.lot_size
+            state.size_increment[slot] = spec.size_increment
+
+    def deltas(self, min_trade_qty: float) -> np.ndarray:
+        """
+        Share deltas for the execution wave from ``target_usd``.
+
+        Targets are rounded to whole lots (``round_to_lots``), the deltas to
+        the size increment; deltas under ``min_trade_qty`` or inside the
+        no-trade band are zero.
+        """
+        state = self.state
+        trades = state.compute_trades()
+        self._load_specs()
+        if self.cfg.round_to_lots:
+            lots = np.round(state.target_qty / state.lot_size) * state.lot_size
+            np.subtract(lots, state.positions, out=trades)
+            trades[~state.has_price] = 0.0
+
+        increment = state.size_increment
+        deltas = np.round(trades / increment) * increment
+        deltas[np.abs(deltas) < min_trade_qty] = 0.0
+        return self.band(deltas)
+
+    # -----------------------------
+    # No-trade band
+    # -----------------------------
+
+    def band(self, deltas: np.ndarray) -> np.ndarray:
+        """Zero the share deltas that fall inside the no-trade band (in place)."""
+        cfg = self.cfg
+        if cfg.no_trade_band_usd > 0:
+            notional = np.abs(deltas * self.state.prices)
+            deltas[~(notional >= cfg.no_trade_band_usd)] = 0.0
+        if cfg.no_trade_band_lots > 0:
+            deltas[np.abs(deltas) < cfg.no_trade_band_lots * self.state.lot_size] = 0.0
+        return deltas
@@ -0,0 +1,237 @@
+# src/sessions.py
+from __future__ import annotations
+
+import os
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .startup import lazy_import
+
+NS_PER_DAY = 86_400_000_000_000
+NS_PER_MINUTE = 60_000_000_000
+
+
+class SessionIndex:
+    """
+    Precomputed trading-session index for one exchange over a date window.
+
+    Sessions are stored as sorted int64 nanosecond arrays so membership and
+    next-open queries are a single binary search, with no
+    calendar object or pandas timestamp on the hot path.
+
+    ``opens`` / ``closes`` hold the trading intervals (sessions with a lunch
+    break are split in two), ``session_opens`` / ``session_closes`` hold the
+    full sessions.
+    """
+
+    __slots__ = (
+        "exchange",
+        "start_ns",
+        "end_ns",
+        "opens",
+        "closes",
+        "session_opens",
+        "session_closes",
+    )
+
+    def __init__(
+        self,
+        exchange: str,
+        start_ns: int,
+        end_ns: int,
+        opens: np.ndarray,
+        closes: np.ndarray,
+        session_opens: np.ndarray,
+        session_closes: np.ndarray,
+    ):
+        self.exchange = exchange
+        self.start_ns = int(start_ns)
+        self.end_ns = int(end_ns)
+        self.opens = np.ascontiguousarray(opens, dtype=np.int64)
+        self.closes = np.ascontiguousarray(closes, dtype=np.int64)
+        self.session_opens = np.ascontiguousarray(session_opens, dtype=np.int64)
+        self.session_closes = np.ascontiguousarray(session_closes, dtype=np.int64)
+
+    # -----------------------------
+    # Construction / persistence
+    # -----------------------------
+
+    @classmethod
+    def build(cls, exchange: str, start, end) -> SessionIndex:
+        """Build the index from ``exchange_calendars`` for sessions in [start, end]."""
+        xcals = lazy_import("exchange_calendars")
+
+        start = _to_date(start)
+        end = _to_date(end)
+
+        cal = xcals.get_calendar(exchange, start=start, end=end)
+        schedule = cal.schedule.loc[start:end]
+
+        session_opens = _to_ns(schedule["open"])
+        session_closes = _to_ns(schedule["close"])
+
+        break_starts = _to_ns(schedule["break_start"])
+        break_ends = _to_ns(schedule["break_end"])
+        has_break = break_starts != np.iinfo(np.int64).min
+
+        # Split sessions with a break into [open, break_start) and [break_end, close)
+        opens = np.concatenate([session_opens, break_ends[has_break]])
+        closes = np.concatenate(
+            [np.where(has_break, break_starts, session_closes), session_closes[has_break]]
+        )
+        order = np.argsort(opens, kind="stable")
+
+        return cls(
+            exchange=exchange,
+            start_ns=start.value,
+            end_ns=end.value + NS_PER_DAY,
+            opens=opens[order],
+            closes=closes[order],
+            session_opens=session_opens,
+            session_closes=session_closes,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> SessionIndex:
+        with np.load(path) as arrays:
+            return cls(
+                exchange=str(arrays["exchange"]),
+                start_ns=int(arrays["window"][0]),
+                end_ns=int(arrays["window"][1]),
+                opens=arrays["opens"],
+                closes=arrays["closes"],
+                session_opens=arrays["session_opens"],
+                session_closes=arrays["session_closes"],
+            )
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            exchange=np.array(self.exchange),
+            window=np.array([self.start_ns, self.end_ns], dtype=np.int64),
+            opens=self.opens,
+            closes=self.closes,
+            session_opens=self.session_opens,
+            session_closes=self.session_closes,
+        )
+        os.replace(tmp_path, path)
+
+    # -----------------------------
+    # Queries (timestamps in UTC ns)
+    # -----------------------------
+
+    def covers(self, ts_ns: int) -> bool:
+        return self.start_ns <= ts_ns < self.end_ns
+
+    def is_open(self, ts_ns: int) -> bool:
+        """True if the exchange is open at ``ts_ns`` (open inclusive, close exclusive)."""
+        i = int(np.searchsorted(self.opens, ts_ns, side="right")) - 1
+        return i >= 0 and ts_ns < self.closes[i]
+
+    def next_open(self, ts_ns: int) -> int | None:
+        """First trading-interval open strictly after ``ts_ns``."""
+        i = int(np.searchsorted(self.opens, ts_ns, side="right"))
+        return int(self.opens[i]) if i < len(self.opens) else None
+
+    def session_bounds(self, ts_ns: int) -> tuple[int, int] | None:
+        """(open, close) of the full session containing ``ts_ns``, if any."""
+        i = int(np.searchsorted(self.session_opens, ts_ns, side="right")) - 1
+        if i < 0 or ts_ns >= self.session_closes[i]:
+            return None
+        return int(self.session_opens[i]), int(self.session_closes[i])
+
+    def session_minutes(self, ts_ns: np.ndarray) -> np.ndarray:
+        """Whole minutes since the open of the latest session at or before each timestamp."""
+        ts_ns = np.asarray(ts_ns, dtype=np.int64)
+        i = np.maximum(np.searchsorted(self.session_opens, ts_ns, side="right") - 1, 0)
+        return np.maximum((ts_ns - self.session_opens[i]) // NS_PER_MINUTE, 0)
+
+    def session_dates(self) -> pd.DatetimeIndex:
+        """UTC dates of the session opens (the keys of a universe schedule)."""
+        return pd.to_datetime(self.session_opens, unit="ns", utc=True).normalize()
+
+    def __len__(self) -> int:
+        return len(self.session_opens)
+
+    def __repr__(self) -> str:
+        return (
+            f"SessionIndex(exchange={self.exchange!r}, sessions={len(self)}, "
+            f"start={pd.Timestamp(self.start_ns, tz='UTC').date()}, "
+            f"end={pd.Timestamp(self.end_ns - NS_PER_DAY, tz='UTC').date()})"
+        )
+
+
+# -----------------------------
+# Process-wide registry
+# -----------------------------
+
+_INDEXES: Dict[str, SessionIndex] = {}
+# Calendar-year indexes for point lookups, never evicted by other windows
+_YEAR_INDEXES: Dict[Tuple[str, int], SessionIndex] = {}
+
+
+def get_session_index(
+    exchange: str,
+    start,
+    end,
+    cache_dir: str | None = None,
+) -> SessionIndex:
+    """
+    Return a session index for ``exchange`` covering [start, end].
+
+    Indexes are shared by every strategy in the process and, when
+    ``cache_dir`` is given, persisted on disk keyed by exchange and window so
+    later runs skip the calendar build entirely.
+    """
+    start = _to_date(start)
+    end = _to_date(end)
+
+    index = _INDEXES.get(exchange)
+    if index is not None and index.start_ns <= start.value and end.value < index.end_ns:
+        return index
+
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(
+            os.path.expanduser(cache_dir),
+            f"{exchange}_{start:%Y%m%d}_{end:%Y%m%d}.npz",
+        )
+
+    if path is not None and os.path.exists(path):
+        index = SessionIndex.load(path)
+    else:
+        index = SessionIndex.build(exchange, start, end)
+        if path is not None:
+            index.save(path)
+
+    _INDEXES[exchange] = index
+    return index
+
+
+def session_index_for(exchange: str, ts_ns: int) -> SessionIndex:
+    """Registered index covering ``ts_ns``, else the (cached) index of its calendar year."""
+    index = _INDEXES.get(exchange)
+    if index is not None and index.covers(ts_ns):
+        return index
+
+    year = pd.Timestamp(ts_ns, unit="ns", tz="UTC").year
+    index = _YEAR_INDEXES.get((exchange, year))
+    if index is None:
+        index = _YEAR_INDEXES[(exchange, year)] = SessionIndex.build(exchange, f"{year}-01-01", f"{year}-12-31")
+    return index
+
+
+def _to_date(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts.normalize()
+
+
+def _to_ns(column: pd.Series) -> np.ndarray:
+    values = column.to_numpy(dtype="datetime64[ns]", na_value=np.datetime64("NaT"))
+    return values.view(np.int64)
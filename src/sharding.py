@@ -0,0 +1,203 @@
+# src/sharding.py
+from __future__ import annotations
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import msgspec
+import pandas as pd
+
+SHARD_FREQS = {"day": "D", "week": "W-MON", "month": "MS"}
+
+
+def shard_window(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    shard: str = "month",
+) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Split [start, end) into consecutive day / week / month windows."""
+    if shard not in SHARD_FREQS:
+        raise ValueError(f"Unknown shard size: {shard}")
+
+    bounds = pd.date_range(start, end, freq=SHARD_FREQS[shard], inclusive="neither")
+    edges = [start, *bounds, end]
+    return [(a, b) for a, b in zip(edges[:-1], edges[1:]) if a < b]
+
+
+def _run_shard(shard_id: int, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    from .engine import run_backtest, run_stats
+
+    # Measured here: streaming runs (chunk_size) do not stamp run_started
+    t0 = time.perf_counter()
+    results, reports = run_backtest(return_reports=True, **kwargs)
+    wall_time_s = time.perf_counter() - t0
+    return {
+        "shard": shard_id,
+        "result": results[0] if results else None,
+        "stats": run_stats(results[0], wall_time_s) if results else {},
+        "reports": reports,
+        "start": kwargs["start"],
+        "end": kwargs["end"],
+        "starting_balances": kwargs["starting_balances"],
+    }
+
+
+def run_sharded_backtest(
+    strategy_path: str,
+    config_path: str,
+    strategy_config,
+    venue_name: str,
+    data_configs: list,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    starting_balances: List[str],
+    shard: str = "month",
+    mode: str = "independent",
+    max_workers: int | None = None,
+    chunk_size: int | None = None,
+    market_cache: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Run a long backtest as a series of time shards and stitch the results.
+
+    Modes
+    -----
+    independent
+        Every shard starts flat with ``starting_balances`` and shards run in
+        parallel across a process pool. Approximate: positions held across a
+        shard boundary are not carried, but the speedup is near-linear.
+    chained
+        Shards run one after another; each starts from the previous shard's
+        ending equity (balance plus unrealized PnL) and re-establishes its
+        open positions at the first bar via ``initial_positions``. This is a
+        sequential re-run, not a speedup over a single run: it bounds the
+        memory of each engine and gives per-shard reports. It is also an
+        approximation. The positions are re-created with market orders at
+        each boundary, fills the unsharded run never makes, so carried
+        positions miss the move from the last mark to the re-entry fill and
+        pay any fees / slippage. The signal and VWAP state also restarts
+        cold in every shard.
+
+    With ``market_cache`` every shard attaches to the shared-memory cache and
+    materializes only its own window.
+
+    Returns
+    -------
+    dict
+        ``summary`` (one row per shard with start/end equity and PnL) and the
+        concatenated ``fills``, ``positions`` and ``account`` reports, plus
+        ``total_pnl`` per currency.
+    """
+    windows = shard_window(start, end, shard)
+    base_kwargs = dict(
+        strategy_path=strategy_path,
+        config_path=config_path,
+        venue_name=venue_name,
+        data_configs=data_configs,
+        chunk_size=chunk_size,
+        market_cache=market_cache,
+    )
+
+    outputs = []
+    if mode == "independent":
+        max_workers = min(max_workers or os.cpu_count() or 1, len(windows))
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _run_shard,
+                    i,
+                    dict(
+                        base_kwargs,
+                        strategy_config=strategy_config,
+                        start=a,
+                        end=b,
+                        starting_balances=list(starting_balances),
+                    ),
+                )
+                for i, (a, b) in enumerate(windows)
+            ]
+            outputs = [f.result() for f in futures]
+    elif mode == "chained":
+        balances = list(starting_balances)
+        positions: Dict[str, float] = {}
+        for i, (a, b) in enumerate(windows):
+            shard_config = msgspec.structs.replace(strategy_config, initial_positions=positions)
+            output = _run_shard(
+                i,
+                dict(
+                    base_kwargs,
+                    strategy_config=shard_config,
+                    start=a,
+                    end=b,
+                    starting_balances=balances,
+                ),
+            )
+            outputs.append(output)
+            if output["result"] is None:
+                break
+            balances = output["reports"]["ending_equity"]
+            positions = output["reports"]["ending_positions"]
+    else:
+        raise ValueError(f"Unknown shard mode: {mode}")
+
+    return stitch_shards(outputs)
+
+
+def stitch_shards(outputs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-shard reports into one report, ordered by shard."""
+    rows = []
+    frames: Dict[str, List[pd.DataFrame]] = {"fills": [], "positions": [], "account": []}
+
+    for output in sorted(outputs, key=lambda o: o["shard"]):
+        result, reports = output["result"], output["reports"]
+        row = {
+            "shard": output["shard"],
+            "start": output["start"],
+            "end": output["end"],
+            "status": "ok" if result is not None else "failed",
+        }
+
+        if result is not None:
+            row["total_orders"] = result.total_orders
+            row["total_positions"] = result.total_positions
+            row.update(output["stats"])
+
+            starting = _parse_balances(output["starting_balances"])
+            ending = _parse_balances(reports["ending_equity"])
+            for currency, value in ending.items():
+                row[f"start_equity [{currency}]"] = starting.get(currency, 0.0)
+                row[f"end_equity [{currency}]"] = value
+                row[f"pnl [{currency}]"] = value - starting.get(currency, 0.0)
+
+            for name in frames:
+                frame = reports[name]
+                if frame is not None and len(frame):
+                    frames[name].append(frame.assign(shard=output["shard"]))
+
+        rows.append(row)
+
+    summary = pd.DataFrame(rows).set_index("shard")
+    pnl_columns = [c for c in summary.columns if c.startswith("pnl [")]
+
+    return {
+        "summary": summary,
+        "total_pnl": summary[pnl_columns].sum().to_dict(),
+        **{
+            name: pd.concat(parts) if parts else pd.DataFrame()
+            for name, parts in frames.items()
+        },
+    }
+
+
+def _parse_balances(balances: List[str]) -> Dict[str, float]:
+    parsed = {}
+    for balance in balances:
+        amount, currency = str(balance).split()
+        parsed[currency] = float(amount.replace("_", "").replace(",", ""))
+    return parsed
@@ -0,0 +1,160 @@
+# src/signals.py
+from __future__ import annotations
+
+import numpy as np
+
+from .portfolio import PortfolioState
+
+
+class SignalEngine:
+    """
+    Incremental alpha and risk model over the portfolio state's slots.
+
+    Per instrument it keeps a ring buffer of the last ``window`` bar log
+    returns (rows registered on the ``PortfolioState``, so they follow the
+    rolling universe), running momentum sums per horizon, an EWMA variance
+    and an EWMA covariance with the equal-weight market return.
+
+    ``update`` is a few array writes per bar; the bars of one timestamp are
+    folded into the buffer in one vectorized step when the next timestamp
+    starts (or at ``compute``), and every running sum moves by the value
+    entering and the value leaving its window, so a minute costs O(n)
+    regardless of the horizons. Sums are re-derived exactly once per lap of
+    the ring to stop floating-point drift.
+
+    ``compute`` writes the optimizer inputs into the state:
+
+    - ``alpha``: ``ic * score * sigma * sqrt(holding_bars)``, the score being
+      the weighted, volatility-scaled multi-horizon momentum (unit variance
+      under a random walk), cross-sectionally demeaned and clipped;
+    - ``risk_lambda``: ``risk_aversion * sigma**2 * holding_bars``;
+    - ``trading_cost``: ``cost_base + cost_vol_mult * sigma``;
+    - ``factor_loading``: EWMA beta to the market (1 until warmed up).
+    """
+
+    def __init__(self, state: PortfolioState, config):
+        self.state = state
+        self.cfg = config
+
+        self.horizons = np.asarray(config.horizons, dtype=np.int64)
+        weights = np.asarray(config.horizon_weights, dtype=np.float64)
+        if weights.shape != self.horizons.shape:
+            raise ValueError("horizon_weights must have one weight per horizon")
+        # sum_h r over h bars is ~ sigma * sqrt(h): scale each horizon to unit
+        # variance, then the weighted sum back to unit variance
+        self._weights = weights / np.sqrt(self.horizons) / np.sqrt((weights ** 2).sum())
+
+        self.window = int(self.horizons.max())
+        self._var_rate = 1.0 - 0.5 ** (1.0 / config.vol_halflife)
+        self._beta_rate = 1.0 - 0.5 ** (1.0 / config.beta_halflife)
+
+        prior = config.sigma_prior ** 2
+        self.market_var = prior
+        for name, dtype, fill, shape in (
+            ("sig_returns", np.float64, 0.0, (self.window,)),
+            ("sig_head", np.int64, 0, ()),
+            ("sig_count", np.int64, 0, ()),
+            ("sig_momentum", np.float64, 0.0, (len(self.horizons),)),
+            ("sig_var", np.float64, prior, ()),
+            ("sig_cov_market", np.float64, prior, ()),
+            ("sig_last_close", np.float64, np.nan, ()),
+            # Bar of the timestamp being collected
+            ("sig_close", np.float64, np.nan, ()),
+            ("sig_pending", np.bool_, False, ()),
+        ):
+            state.register(name, dtype, fill, shape)
+
+        self._pending_ts: int | None = None
+
+    # -----------------------------
+    # Per bar
+    # -----------------------------
+
+    def update(self, instrument_id, ts_event: int, close: float) -> None:
+        state = self.state
+        slot = state.slots.get(instrument_id)
+        if slot is None:
+            return
+        if ts_event != self._pending_ts:
+            if self._pending_ts is not None:
+                self.fold()
+            self._pending_ts = ts_event
+        state.sig_close[slot] = close
+        state.sig_pending[slot] = True
+
+    # -----------------------------
+    # Per timestamp (vectorized)
+    # -----------------------------
+
+    def fold(self) -> None:
+        """Push the collected bars' returns into the ring buffer."""
+        state = self.state
+        self._pending_ts = None
+        idx = np.flatnonzero(state.sig_pending)
+        if not len(idx):
+            return
+
+        close = state.sig_close[idx]
+        prev = state.sig_last_close[idx]
+        state.sig_last_close[idx] = close
+        state.sig_pending[idx] = False
+
+        # A name's first bar only seeds its last close
+        has_prev = (prev > 0) & (close > 0)
+        idx = idx[has_prev]
+        if not len(idx):
+            return
+        r = np.log(close[has_prev] / prev[has_prev])
+
+        window = self.window
+        returns = state.sig_returns
+        head = state.sig_head[idx]
+
+        # Running sums: add the entering value, drop the one leaving the window
+        leaving = returns[idx[:, None], (head[:, None] - self.horizons[None, :]) % window]
+        state.sig_momentum[idx] += r[:, None] - leaving
+        returns[idx, head] = r
+
+        head = (head + 1) % window
+        state.sig_head[idx] = head
+        state.sig_count[idx] += 1
+
+        wrapped = idx[head == 0]
+        if len(wrapped):
+            for k, h in enumerate(self.horizons):
+                state.sig_momentum[wrapped, k] = returns[wrapped, window - h:].sum(axis=1)
+
+        # EWMA variance and covariance with the equal-weight market return
+        state.sig_var[idx] += self._var_rate * (r * r - state.sig_var[idx])
+        r_market = r.mean()
+        state.sig_cov_market[idx] += self._beta_rate * (r * r_market - state.sig_cov_market[idx])
+        self.market_var += self._beta_rate * (r_market * r_market - self.market_var)
+
+    # -----------------------------
+    # Cross-section
+    # -----------------------------
+
+    def ready(self) -> np.ndarray:
+        return self.state.sig_count >= self.cfg.min_bars
+
+    def compute(self) -> None:
+        """Write ``alpha``, ``risk_lambda``, ``trading_cost`` and ``factor_loading`` into the state."""
+        if self._pending_ts is not None:
+            self.fold()
+
+        state, cfg = self.state, self.cfg
+        ready = self.ready()
+        sigma = np.sqrt(state.sig_var)
+
+        score = state.sig_momentum @ self._weights / sigma
+        if cfg.cross_sectional and ready.any():
+            score -= score[ready].mean()
+        np.clip(score, -cfg.max_score, cfg.max_score, out=score)
+        score[~ready] = 0.0
+
+        np.multiply(score, cfg.ic * np.sqrt(cfg.holding_bars) * sigma, out=state.alpha)
+        np.multiply(state.sig_var, cfg.risk_aversion * cfg.holding_bars, out=state.risk_lambda)
+        np.multiply(sigma, cfg.cost_vol_mult, out=state.trading_cost)
+        state.trading_cost += cfg.cost_base
+        np.divide(state.sig_cov_market, self.market_var, out=state.factor_loading)
+        state.factor_loading[~ready] = 1.0
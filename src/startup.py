@@ -0,0 +1,58 @@
+# src/startup.py
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# First-import cost of the modules loaded through ``lazy_import``, in seconds
+IMPORT_TIMES: Dict[str, float] = {}
+
+
+def lazy_import(name: str):
+    """
+    Import ``name`` on first use and record what that import cost.
+
+    Heavy dependencies (the cvxpy solver, the exchange calendars) are loaded
+    through here at their point of use, so a process only pays for the ones
+    it actually reaches. The Parquet catalog is not one of them: the
+    backtest configs and ``Strategy`` already import it.
+    """
+    module = sys.modules.get(name)
+    if module is None:
+        t0 = time.perf_counter()
+        module = importlib.import_module(name)
+        IMPORT_TIMES[name] = time.perf_counter() - t0
+    return module
+
+
+class StartupProfile:
+    """
+    Wall time of consecutive startup phases, reported with the lazy imports.
+
+    ``mark(phase)`` closes the phase that started at the previous mark (or
+    at ``t0``, e.g. a ``perf_counter`` taken before the entry point's own
+    imports).
+    """
+
+    def __init__(self, t0: float | None = None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self._last = self.t0
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self) -> str:
+        width = max((len(name) for name, _ in self.phases), default=0)
+        width = max([width, *(len(name) + 2 for name in IMPORT_TIMES)])
+        lines = ["Startup profile:"]
+        lines += [f"  {name:<{width}}  {seconds:7.3f}s" for name, seconds in self.phases]
+        lines.append(f"  {'total':<{width}}  {self._last - self.t0:7.3f}s")
+        if IMPORT_TIMES:
+            lines.append("  lazy imports (first use):")
+            lines += [f"    {name:<{width - 2}}  {seconds:7.3f}s" for name, seconds in IMPORT_TIMES.items()]
+        return "\n".join(lines)
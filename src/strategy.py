@@ -1,141 +1,258 @@
 # src/strategy.py
 from __future__ import annotations
 
-from datetime import time
-
+from nautilus_trader.core.datetime import unix_nanos_to_dt
 from nautilus_trader.core.rust.model import PriceType
-from nautilus_trader.core.uuid import UUID4
-from nautilus_trader.indicators import VolumeWeightedAveragePrice
-from nautilus_trader.model import Quantity, Price
 from nautilus_trader.model.data import Bar, BarType, BarSpecification, BarAggregation
-from nautilus_trader.model.enums import TimeInForce
-from nautilus_trader.model.identifiers import ClientOrderId, InstrumentId, Venue
-from nautilus_trader.persistence.catalog import ParquetDataCatalog
+from nautilus_trader.model.enums import OrderSide
+from nautilus_trader.model.identifiers import InstrumentId, Venue
 from nautilus_trader.trading.strategy import Strategy
 
 import numpy as np
-import os
 import pandas as pd
 
-from .alpha import optimize_target_positions_usd
+from .alpha import PositionOptimizer
+from .barrier import BarBarrier
 from .config import MomentumConfig
 from .execution.engine import ExecutionEngine
-from .utils import is_trading_time
+from .execution.orders import OrderSubmitter
+from .instrumentation import LatencyRecorder, NullRecorder
+from .intraday import IntradayVWAP
+from .portfolio import PortfolioState
+from .rebalance import RebalanceController
+from .sessions import get_session_index
+from .signals import SignalEngine
+
+# Latency stages of the decision loop, in registration order
+STAGES = ("on_bar", "portfolio_value", "mark", "inputs", "solve", "execute_wave", "decision")
+ON_BAR, PORTFOLIO_VALUE, MARK, INPUTS, SOLVE, EXECUTE_WAVE, DECISION = range(len(STAGES))
 
 class MomentumStrategy(Strategy):
     def __init__(self, config: MomentumConfig):
         super().__init__(config)
 
+        # Registered before the execution engine adds its own stages
+        self.latency = LatencyRecorder() if config.instrumentation.enabled else NullRecorder()
+        for name in STAGES:
+            self.latency.stage(name)
+
         self.instrument_ids = [InstrumentId.from_str(i) for i in config.instrument_ids]
         self.venue = Venue(config.venue)
         self.custom_config = config
 
         self.target_positions_usd = None
-        self.day_count = 0
-        self.at_wave = False
-        self.catalog = ParquetDataCatalog(
-            path=os.path.expanduser(os.getenv("NAUTILUS_ROOT"))
-        )
 
-        self.vwaps = {
-            inst_id: VolumeWeightedAveragePrice()
-            for inst_id in self.instrument_ids
-
-        }
+        # Rolling universe: the state starts empty and follows the schedule
+        self._schedule = config.universe_schedule
+        self.portfolio_state = PortfolioState(
+            () if self._schedule else self.instrument_ids,
+            capacity=max((len(m) for m in self._schedule.values()), default=0),
+        )
+        self._session_open: int | None = None
+        self._exiting: set = set()
+        self.signals = SignalEngine(self.portfolio_state, config.signals)
+        self.intraday = IntradayVWAP(self.portfolio_state)
+        self.optimizer = PositionOptimizer(solver=config.solver)
+        self.orders = OrderSubmitter(self)
+        self.rebalance = RebalanceController(self.portfolio_state, config.rebalance, self.orders)
         self.execution = ExecutionEngine(
             strategy=self,
             config=self.config.execution,
         )
-        self._last_minute: int | None = None
-
-    def _get_prices(self):
-        prices = {}
-        for inst_id in self.instrument_ids:
-            price = self.cache.price(inst_id, PriceType.LAST)
-            prices[inst_id] = float(price)
-
-        prices = pd.Series(prices)
-        return prices
-
-    def _get_positions(self):
-        positions = self.cache.positions()
-        #print(positions)
-
-        if len(positions) == 0:
-            positions = pd.Series(0.0, index=self.instrument_ids)
-        else:
-            '''
-            import inspect
-            all_members = inspect.getmembers(positions[0])
-            for name, value in all_members:
-                if not name.startswith('__'):
-                    print(f"{name}: {value}")
-            '''
-            positions = pd.Series([x.signed_qty for x in positions], index=[x.symbol for x in positions])
-            positions = pd.Series(positions, index=self.instrument_ids).fillna(0.)
-        return positions
+        self._pending_initial = {
+            InstrumentId.from_str(i): qty for i, qty in config.initial_positions.items()
+        }
+        self.sessions = None
 
     def _get_portfilio_value(self):
-
         account = self.portfolio.account(self.venue)
-        '''
-        import inspect
-        all_members = inspect.getmembers(account)
-        for name, value in all_members:
-            if not name.startswith('__'):
-                print(f"{name}: {value}")
-
-        print("++++++++++++++++++++++++++++++++++++++++++++++++++++")
-        '''
         portfolio_value = account.balances_total()
-        '''
-        all_members = inspect.getmembers(portfolio_value)
-        for name, value in all_members:
-            if not name.startswith('__'):
-                print(f"{name}: {value}")
-        '''
         portfolio_value = float(list(portfolio_value.values())[0])
         return portfolio_value
 
     def on_start(self):
-        # Subscribe to bars (unchanged)
-        for instrument_id in self.instrument_ids:
-            bar_spec = BarSpecification(1, BarAggregation.MINUTE, PriceType.LAST)
-            self.subscribe_bars(BarType(instrument_id, bar_spec))
-
-        # 🔔 Add minute clock (fires exactly at minute boundaries)
-        self.clock.set_timer(
-            name="minute_timer",
-            interval=pd.Timedelta(minutes=1),
-            callback=self.on_minute_timer
+        # Seed positions already held (e.g. carried over from a previous run);
+        # under a rolling universe they are tracked exit-only until the first roll
+        positions = self.cache.positions_open(venue=self.venue)
+        if self._schedule:
+            held = [p.instrument_id for p in positions] + list(self._pending_initial)
+            self._add_instruments(held, in_universe=False)
+        for position in positions:
+            self.portfolio_state.update_position(position.instrument_id, position.signed_qty)
+
+        # Session index for the backtest window (shared across strategies)
+        session_start = self.custom_config.session_start or self.clock.utc_now()
+        session_end = self.custom_config.session_end or (
+            pd.Timestamp(session_start) + pd.Timedelta(days=366)
+        )
+        self.sessions = get_session_index(
+            self.venue.value,
+            start=session_start,
+            end=session_end,
+            cache_dir=self.custom_config.session_cache_dir,
+        )
+        self.intraday.bind(self.sessions)
+
+        # Subscribe to bars (rolling universe: at each session open instead)
+        if not self._schedule:
+            for instrument_id in self.instrument_ids:
+                self.subscribe_bars(self._minute_bar_type(instrument_id))
+
+        # Decisions are driven by bar arrival; the clock only times out an
+        # incomplete cross-section and rolls the universe at each session open
+        self.barrier = BarBarrier(
+            self.clock,
+            self.on_bar_barrier,
+            timeout_ns=int(self.custom_config.decision_timeout_secs * 1e9),
+        )
+        if self._schedule:
+            self.on_session_open(self.clock.timestamp_ns())
+
+    def on_stop(self):
+        self.log.info(
+            f"Decisions: {self.barrier.completed} on a complete cross-section, "
+            f"{self.barrier.timed_out} on timeout; "
+            f"{self.rebalance.solves} solves, {self.rebalance.skipped} skipped"
         )
+        self.log.info(f"Parent netting: {self.execution.netting}")
+        if self.latency.enabled:
+            self.latency.dump(self.custom_config.instrumentation.output_dir)
 
+    def on_bar_barrier(self, ts_event: int, complete: bool):
+        # Slice anything still buffered before the decision
+        self.execution.flush()
+        self.on_minute(ts_event)
+
+    def _decision_due(self, ts_event: int) -> bool:
+        """Decisions run in trading hours, every ``decision_interval_minutes`` from the open."""
+        if not self.sessions.is_open(ts_event):
+            return False
+        minute = int(self.sessions.session_minutes(ts_event))
+        return minute % self.custom_config.decision_interval_minutes == 0
+
+    # -----------------------------
+    # Rolling universe
+    # -----------------------------
+
+    @staticmethod
+    def _minute_bar_type(instrument_id) -> BarType:
+        bar_spec = BarSpecification(1, BarAggregation.MINUTE, PriceType.LAST)
+        return BarType(instrument_id, bar_spec)
+
+    def _add_instruments(self, instrument_ids, in_universe: bool = True):
+        state = self.portfolio_state
+        new_ids = [i for i in dict.fromkeys(instrument_ids) if i not in state]
+        state.add(new_ids)
+        for inst_id in new_ids:
+            state.in_universe[state.slots[inst_id]] = in_universe
+            if not in_universe:
+                self._exiting.add(inst_id)
+            self.subscribe_bars(self._minute_bar_type(inst_id))
+
+    def _schedule_session_open(self, ts_ns: int):
+        next_open = self.sessions.next_open(ts_ns)
+        if next_open is not None:
+            self.clock.set_time_alert(
+                "session_open",
+                unix_nanos_to_dt(next_open),
+                callback=lambda event: self.on_session_open(event.ts_event),
+                override=True,
+            )
 
-    def on_minute_timer(self, event: TimerEvent):
-        ts_event = event.ts_event
-        timestamp = pd.Timestamp(ts_event, unit="ns", tz="UTC")
-        if not is_trading_time(timestamp, self.venue.value):
+    def on_session_open(self, ts_ns: int):
+        """Roll the universe if ``ts_ns`` is in a new session, then wait for the next open."""
+        bounds = self.sessions.session_bounds(ts_ns)
+        if bounds is not None and bounds[0] != self._session_open:
+            self._session_open = bounds[0]
+            self._roll_universe(bounds[0])
+        self._schedule_session_open(ts_ns)
+
+    def _roll_universe(self, session_open: int):
+        """Apply the schedule for the session opening at ``session_open``."""
+        date = pd.Timestamp(session_open, unit="ns", tz="UTC").strftime("%Y-%m-%d")
+        members = self._schedule.get(date)
+        if members is None:
             return
-        self.on_minute(ts_event)
+
+        state = self.portfolio_state
+        members = [InstrumentId.from_str(i) for i in members]
+        member_set = set(members)
+
+        # Dropped names stay in the state exit-only until flat
+        for inst_id in state.instrument_ids:
+            if inst_id not in member_set:
+                state.in_universe[state.slots[inst_id]] = False
+                self._exiting.add(inst_id)
+
+        self._add_instruments(members)
+        for inst_id in members:
+            state.in_universe[state.slots[inst_id]] = True
+            self._exiting.discard(inst_id)
+
+        self._release_exits()
+        self.log.info(f"Universe for {date}: {len(members)} names, {len(self._exiting)} exiting")
+
+    def _release_exits(self):
+        """Unsubscribe and drop exit-only names that are flat with no live schedule."""
+        state = self.portfolio_state
+        released = [
+            inst_id
+            for inst_id in self._exiting
+            if state.positions[state.slots[inst_id]] == 0
+            and inst_id not in self._pending_initial
+            and not self.execution.has_schedule(inst_id)
+        ]
+        for inst_id in released:
+            self.unsubscribe_bars(self._minute_bar_type(inst_id))
+            self._exiting.discard(inst_id)
+        state.remove(released)
 
     def on_bar(self, bar: Bar):
+        t0 = self.latency.now()
+        inst_id = bar.bar_type.instrument_id
+        if bar.ts_event != self.barrier.ts:
+            self.barrier.open(
+                bar.ts_event,
+                expected=len(self.portfolio_state),
+                armed=self._decision_due(bar.ts_event),
+            )
+        close = bar.close.as_double()
+        self.portfolio_state.update_price(inst_id, close)
+        volume = bar.volume.as_double()
+        self.signals.update(inst_id, bar.ts_event, close)
+        self.intraday.update(inst_id, bar.ts_event, close, volume)
+
+        if self._pending_initial:
+            self._establish_initial_position(inst_id)
+
         # Update execution engine (VWAP/TWAP/POV)
         self.execution.on_bar(bar)
 
-        inst_id = bar.bar_type.instrument_id
-        ts_event = bar.ts_event
+        self.latency.lap(ON_BAR, t0)
+        self.barrier.arrive()
 
-        timestamp = (
-            pd.Timestamp(ts_event, unit="ns", tz="UTC")
-            .astimezone("America/New_York")
-        )
+    def _establish_initial_position(self, inst_id):
+        target_qty = self._pending_initial.pop(inst_id, None)
+        if target_qty is None:
+            return
+        slot = self.portfolio_state.slots.get(inst_id)
+        current_qty = self.portfolio_state.positions[slot] if slot is not None else 0.0
+        delta_qty = round(target_qty - current_qty)
+        if delta_qty != 0:
+            self.submit_market_order(
+                inst_id,
+                OrderSide.BUY if delta_qty > 0 else OrderSide.SELL,
+                delta_qty,
+            )
 
-        # Update indicators only
-        self.vwaps[inst_id].update_raw(
-            price=float(bar.close),
-            volume=float(bar.volume),
-            timestamp=timestamp,
-        )
+    def on_position_opened(self, event):
+        self.portfolio_state.update_position(event.instrument_id, event.signed_qty)
+
+    def on_position_changed(self, event):
+        self.portfolio_state.update_position(event.instrument_id, event.signed_qty)
+
+    def on_position_closed(self, event):
+        self.portfolio_state.update_position(event.instrument_id, 0.0)
 
     def on_minute(self, ts_event):
         """
@@ -148,92 +265,114 @@ class MomentumStrategy(Strategy):
         # ------------------------------------------------------------------
         # 1️⃣ Build inputs for optimizer
         # ------------------------------------------------------------------
-        prices = self._get_prices()
-        positions = self._get_positions()
-        portfolio_value = self._get_portfilio_value()
+        latency = self.latency
+        t_start = t = latency.now()
 
-        current_position_usd = positions * prices
+        state = self.portfolio_state
+        portfolio_value = self._get_portfilio_value()
+        t = latency.lap(PORTFOLIO_VALUE, t)
 
-        # --- Alpha & model inputs (unchanged placeholders) ---
-        alpha = pd.Series(
-            np.random.normal(loc=0.0, scale=1.0, size=len(self.instrument_ids)),
-            index=self.instrument_ids,
-        )
+        current_position_usd = state.mark()
+        t = latency.lap(MARK, t)
 
-        trading_cost = pd.Series(0.005, index=self.instrument_ids)
-        risk_lambda = pd.Series(0.001, index=self.instrument_ids)
+        # --- Alpha & risk model: alpha, trading_cost, risk_lambda, factor_loading ---
+        self.signals.compute()
 
-        clip_pos_usd = pd.Series(
-            self.custom_config.max_position_weight * portfolio_value, index=self.instrument_ids
+        # Unpriced names get zero caps, so the optimizer leaves them flat
+        np.multiply(
+            state.has_price,
+            self.custom_config.max_position_weight * portfolio_value,
+            out=state.clip_pos_usd,
         )
-        clip_trd_usd = pd.Series(
-            self.custom_config.max_trade_weight * portfolio_value, index=self.instrument_ids
-        )
-
-        factor_loading = pd.Series(
-            np.random.normal(loc=0.0, scale=1.0, size=len(self.instrument_ids)),
-            index=self.instrument_ids,
+        np.multiply(
+            state.has_price,
+            self.custom_config.max_trade_weight * portfolio_value,
+            out=state.clip_trd_usd,
         )
+        if self._exiting:
+            # Exit-only names can only be unwound
+            exiting = ~state.in_universe
+            state.clip_pos_usd[exiting] = 0.0
+            np.abs(current_position_usd, out=state.clip_trd_usd, where=exiting)
+        t = latency.lap(INPUTS, t)
+
+        # Inputs barely moved (or too soon): live parents keep working
+        if not self.rebalance.should_solve(ts_event):
+            if self._exiting:
+                self._release_exits()
+            return
 
         # ------------------------------------------------------------------
         # 2️⃣ Optimize TARGET POSITIONS (USD)
         # ------------------------------------------------------------------
-        self.target_positions_usd = optimize_target_positions_usd(
-            alpha=alpha,
-            current_position_usd=current_position_usd,
-            trading_cost=trading_cost,
-            risk_lambda=risk_lambda,
-            clip_pos_usd=clip_pos_usd,
-            clip_trd_usd=clip_trd_usd,
+        state.target_usd[:] = self.optimizer.solve(
+            alpha=state.alpha,
+            x0=current_position_usd,
+            cost=state.trading_cost,
+            lam=state.risk_lambda,
+            pos_cap=state.clip_pos_usd,
+            trd_cap=state.clip_trd_usd,
             max_delta=self.custom_config.max_delta,
-            factor_loading=factor_loading,
+            factor_loading=state.factor_loading,
             max_factor_exposure=self.custom_config.max_factor_exposure,
         )
+        self.target_positions_usd = state.target_usd
+        self.rebalance.solved(ts_event)
+        t_solved = latency.lap(SOLVE, t)
+        solve_ns, t = t_solved - t, t_solved
 
         # ------------------------------------------------------------------
         # 3️⃣ Execute trades
         # ------------------------------------------------------------------
         self.execute_wave(ts_event)
 
+        if self._exiting:
+            self._release_exits()
+        t = latency.lap(EXECUTE_WAVE, t)
+
+        if latency.enabled:
+            latency.record(DECISION, t - t_start)
+            latency.record_decision(ts_event, t - t_start, solve_ns, self.optimizer)
+
     def execute_wave(self, ts_event):
         if self.target_positions_usd is None:
             return
 
-        prices = self._get_prices()
-        positions = self._get_positions()
-
-        target_shares = self.target_positions_usd / prices
-        trades = target_shares - positions
+        # Lot-rounded, netted against the position (and so the live parents)
+        deltas = self.rebalance.deltas(self.custom_config.min_trade_qty)
 
-        for inst_id, trade_qty in trades.items():
-            trade_qty = round(trade_qty)
-            if abs(trade_qty) < self.custom_config.min_trade_qty:
-                continue
-            self.execution.submit_target(
-                instrument_id=inst_id,
-                delta_qty=trade_qty,
-                ts_event=ts_event,
-            )
+        self.execution.submit_targets(
+            instrument_ids=self.portfolio_state.instrument_ids,
+            delta_qty=deltas,
+            ts_event=ts_event,
+        )
 
     def submit_market_order(self, instrument_id, side, quantity):
-
-        order = self.order_factory.market(
-                        instrument_id=instrument_id,
-                        order_side=side,
-                        quantity=Quantity(abs(quantity), 0),
-                        time_in_force=TimeInForce.IOC,
-                        client_order_id=ClientOrderId(str(UUID4()))
-                    )
-        self.submit_order(order)
+        order = self.orders.market(instrument_id, side, quantity)
+        self.orders.submit(order)
+        return order
 
     def submit_limit_order(self, instrument_id, side, quantity, price):
+        order = self.orders.limit(instrument_id, side, quantity, price)
+        self.orders.submit(order)
+        return order
+
+    # -----------------------------
+    # Order events -> execution engine
+    # -----------------------------
+
+    def on_order_filled(self, event):
+        self.intraday.record_fill(event.instrument_id, event.ts_event, event.last_qty.as_double())
+        self.execution.on_order_filled(event)
+
+    def on_order_canceled(self, event):
+        self.execution.on_order_closed(event)
+
+    def on_order_expired(self, event):
+        self.execution.on_order_closed(event)
+
+    def on_order_rejected(self, event):
+        self.execution.on_order_closed(event)
 
-        order = self.order_factory.limit(
-                        instrument_id=instrument_id,
-                        order_side=side,
-                        quantity=Quantity(abs(quantity), 0),
-                        price=Price(price, 2),
-                        time_in_force=TimeInForce.GTC,
-                        client_order_id=ClientOrderId(str(UUID4()))
-                    )
-        self.submit_order(order)
+    def on_order_denied(self, event):
+        self.execution.on_order_closed(event)
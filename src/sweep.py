@@ -0,0 +1,196 @@
+# src/sweep.py
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
+from typing import Any, Dict, List, Mapping, Sequence
+
+import pandas as pd
+
+# Per-worker state, filled once by ``_init_worker``
+_WORKER: Dict[str, Any] = {}
+
+
+def expand_grid(grid: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Cartesian product of a parameter grid into a list of override dicts.
+
+    The grid maps (possibly nested) config keys to lists of values, e.g.
+    ``{"execution": {"participation_rate": [0.05, 0.1]}}``; the overrides use
+    dotted keys such as ``execution.participation_rate``.
+    """
+    flat = _flatten(grid or {})
+    if not flat:
+        return []
+    keys = list(flat)
+    return [dict(zip(keys, values)) for values in itertools.product(*flat.values())]
+
+
+def _flatten(grid: Mapping[str, Any], prefix: str = "") -> Dict[str, Sequence]:
+    flat = {}
+    for key, value in grid.items():
+        if isinstance(value, Mapping):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = list(value)
+    return flat
+
+
+def apply_overrides(strategy_cfg: Mapping, overrides: Mapping[str, Any]) -> dict:
+    """
+    Return a copy of a strategy config dict with dotted-key overrides applied.
+
+    Keys are relative to the strategy config, e.g. ``max_trade_weight`` or
+    ``execution.participation_rate``.
+    """
+    cfg = deepcopy(dict(strategy_cfg))
+    for key, value in overrides.items():
+        node = cfg
+        *parents, leaf = key.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        if leaf not in node:
+            raise KeyError(f"Unknown sweep parameter: {key}")
+        node[leaf] = value
+    return cfg
+
+
+def summarize_result(result, wall_time_s: float | None = None) -> Dict[str, Any]:
+    """Flatten a ``BacktestResult`` (and the measured wall time) into one comparison-table row."""
+    from .engine import run_stats
+
+    row = run_stats(result, wall_time_s)
+    row["total_orders"] = result.total_orders
+    row["total_positions"] = result.total_positions
+    for currency, stats in (result.stats_pnls or {}).items():
+        for name, value in stats.items():
+            row[f"{name} [{currency}]"] = value
+    row.update(result.stats_returns or {})
+    return row
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+
+def _init_worker(
+    catalog_path: str,
+    instruments: List[str],
+    data_kwargs: Dict[str, Any],
+    market_cache: str | None = None,
+):
+    from .data import create_data_configs
+
+    if market_cache is not None:
+        # Map the shared cache once; no catalog or data configs needed
+        from .market_cache import attach_market_cache
+
+        attach_market_cache(market_cache)
+        _WORKER["data_configs"] = []
+        return
+
+    _WORKER["data_configs"] = create_data_configs(catalog_path, instruments, **data_kwargs)
+
+
+def _run_point(point_id: int, strategy_cfg: dict, backtest_kwargs: dict) -> Dict[str, Any]:
+    from hydra.utils import instantiate
+
+    from .engine import run_backtest
+
+    strategy_config = instantiate(strategy_cfg, _convert_="all")
+
+    t0 = time.perf_counter()
+    results = run_backtest(
+        strategy_config=strategy_config,
+        data_configs=_WORKER["data_configs"],
+        **backtest_kwargs,
+    )
+    elapsed_s = time.perf_counter() - t0
+    row = {"point": point_id, "pid": os.getpid(), "elapsed_s": elapsed_s}
+
+    if not results:
+        row["status"] = "failed"
+        return row
+
+    row["status"] = "ok"
+    row.update(summarize_result(results[0], wall_time_s=elapsed_s))
+    return row
+
+
+# -----------------------------
+# Driver
+# -----------------------------
+
+def run_sweep(
+    strategy_cfg: Mapping,
+    points: Sequence[Mapping[str, Any]],
+    catalog_path: str,
+    instruments: List[str],
+    backtest_kwargs: Mapping[str, Any],
+    max_workers: int | None = None,
+    data_kwargs: Mapping[str, Any] | None = None,
+) -> pd.DataFrame:
+    """
+    Run one backtest per override point across a process pool.
+
+    Parameters
+    ----------
+    strategy_cfg : Mapping
+        Base strategy config as a plain dict (with ``_target_``), as produced
+        by ``OmegaConf.to_container(cfg.strategy, resolve=True)``.
+    points : Sequence[Mapping[str, Any]]
+        Dotted-key overrides per run (see ``expand_grid``).
+    catalog_path : str
+        Catalog root; each worker opens it once.
+    instruments : List[str]
+        Universe shared by every run, selected once in the parent.
+    backtest_kwargs : Mapping[str, Any]
+        Remaining ``run_backtest`` arguments (paths, venue, window, balances);
+        with ``market_cache`` the workers attach to it instead of the catalog.
+    max_workers : int | None
+        Pool size, defaults to the number of cores.
+    data_kwargs : Mapping[str, Any] | None
+        Extra ``create_data_configs`` arguments (e.g. the daily lookback).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per point: the overrides followed by the run statistics.
+    """
+    points = [dict(p) for p in points] or [{}]
+    configs = [apply_overrides(strategy_cfg, p) for p in points]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(points))
+
+    rows = []
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(
+            catalog_path,
+            list(instruments),
+            dict(data_kwargs or {}),
+            backtest_kwargs.get("market_cache"),
+        ),
+    ) as pool:
+        futures = {
+            pool.submit(_run_point, i, cfg, dict(backtest_kwargs)): i
+            for i, cfg in enumerate(configs)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                row = future.result()
+            except Exception as exc:
+                row = {"point": i, "status": f"error: {exc}"}
+            row.update(points[i])
+            rows.append(row)
+            print(f"[sweep] point {i + 1}/{len(points)} done: {row['status']}")
+
+    table = pd.DataFrame(rows).sort_values("point").set_index("point")
+    leading = list(dict.fromkeys(k for p in points for k in p))
+    return table[leading + [c for c in table.columns if c not in leading]]
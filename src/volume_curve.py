@@ -0,0 +1,202 @@
+# src/volume_curve.py
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from .sessions import NS_PER_MINUTE, get_session_index
+
+BUCKETS = 390                 # minutes in a regular US equity session
+MIN_SESSIONS = 5              # below this an instrument uses the pooled curve
+
+INDEX_FILE = "index.json"     # instrument rows + last ingested bar per row
+SUMS_FILE = "volume_sums.npy"
+SESSIONS_FILE = "sessions.npy"
+CUMULATIVE_FILE = "cumulative.npy"
+
+
+# -----------------------------
+# Build / refresh
+# -----------------------------
+
+def minute_volume_sums(
+    ts_ns: np.ndarray,
+    volume: np.ndarray,
+    sessions,
+    buckets: int = BUCKETS,
+    seen_ns: int | None = None,
+):
+    """
+    Volume per minute-of-session bucket and the number of sessions seen.
+
+    Bars outside a session are ignored; bars past the last bucket (long
+    sessions) fall into it. The session of ``seen_ns`` (the last bar of a
+    previous refresh) is already counted, so it is not counted again.
+    """
+    i = np.searchsorted(sessions.session_opens, ts_ns, side="right") - 1
+    valid = i >= 0
+    valid[valid] = ts_ns[valid] <= sessions.session_closes[i[valid]]
+
+    minutes = (ts_ns[valid] - sessions.session_opens[i[valid]]) // NS_PER_MINUTE
+    sums = np.bincount(
+        np.minimum(minutes, buckets - 1),
+        weights=volume[valid],
+        minlength=buckets,
+    )
+    seen = np.unique(i[valid])
+    if seen_ns is not None:
+        prev = int(np.searchsorted(sessions.session_opens, seen_ns, side="right")) - 1
+        if prev >= 0 and seen_ns <= sessions.session_closes[prev]:
+            seen = seen[seen != prev]
+    return sums, len(seen)
+
+
+def update_volume_curves(
+    catalog,
+    curve_dir: str,
+    instrument_ids: Iterable[str],
+    exchange: str = "XNYS",
+    end=None,
+    min_sessions: int = MIN_SESSIONS,
+) -> VolumeCurves:
+    """
+    Add the 1-MINUTE bars newer than the last refresh to the stored sums.
+
+    Only instruments in ``instrument_ids`` are read (new ones get a row), so
+    refreshing after an incremental ingest only scans the new bars. Bars at
+    or after ``end`` are left out, which keeps a backtest's curves
+    point-in-time (the sums only move forward, so use a separate
+    ``curve_dir`` for an earlier cutoff). A session split across refreshes
+    is counted once. The normalized cumulative curves are rewritten from
+    the sums.
+    """
+    end_ns = None
+    if end is not None:
+        end = pd.Timestamp(end)
+        end_ns = (end.tz_localize("UTC") if end.tzinfo is None else end).value - 1
+    curve_dir = os.path.expanduser(curve_dir)
+    os.makedirs(curve_dir, exist_ok=True)
+
+    rows, last_ts, sums, counts = _load_sums(curve_dir)
+    for inst_id in instrument_ids:
+        if inst_id not in rows:
+            rows[inst_id] = len(rows)
+            sums = np.vstack([sums, np.zeros((1, sums.shape[1]))])
+            counts = np.append(counts, 0)
+
+        start = last_ts.get(inst_id)
+        bars = catalog.bars(
+            bar_types=[f"{inst_id}-1-MINUTE-LAST-EXTERNAL"],
+            start=start + 1 if start is not None else None,
+            end=end_ns,
+        )
+        if not bars:
+            continue
+
+        ts_ns = np.fromiter((bar.ts_event for bar in bars), dtype=np.int64, count=len(bars))
+        volume = np.fromiter((bar.volume.as_double() for bar in bars), dtype=np.float64, count=len(bars))
+        first = int(ts_ns.min()) if start is None else min(start, int(ts_ns.min()))
+        sessions = get_session_index(exchange, first, int(ts_ns.max()))
+
+        row_sums, row_sessions = minute_volume_sums(ts_ns, volume, sessions, sums.shape[1], seen_ns=start)
+        sums[rows[inst_id]] += row_sums
+        counts[rows[inst_id]] += row_sessions
+        last_ts[inst_id] = int(ts_ns.max())
+
+    _save(curve_dir, rows, last_ts, sums, counts, _cumulative(sums, counts, min_sessions))
+    return VolumeCurves.load(curve_dir)
+
+
+def _cumulative(sums: np.ndarray, counts: np.ndarray, min_sessions: int) -> np.ndarray:
+    """Rows of cumulative volume fractions (``BUCKETS + 1`` points), pooled row last."""
+    def normalize(matrix):
+        total = matrix.sum(axis=1, keepdims=True)
+        cum = np.zeros((matrix.shape[0], matrix.shape[1] + 1))
+        np.cumsum(matrix, axis=1, out=cum[:, 1:])
+        np.divide(cum, total, out=cum, where=total > 0)
+        return cum
+
+    pooled = normalize(sums.sum(axis=0, keepdims=True))
+    if not pooled[0, -1]:
+        # No history at all: uniform
+        pooled[0] = np.linspace(0.0, 1.0, sums.shape[1] + 1)
+
+    cumulative = normalize(sums)
+    thin = (counts < min_sessions) | (sums.sum(axis=1) <= 0)
+    cumulative[thin] = pooled[0]
+    return np.vstack([cumulative, pooled]).astype(np.float32)
+
+
+def _load_sums(curve_dir: str):
+    path = os.path.join(curve_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {}, {}, np.zeros((0, BUCKETS)), np.zeros(0, dtype=np.int64)
+
+    with open(path) as f:
+        index = json.load(f)
+    sums = np.load(os.path.join(curve_dir, SUMS_FILE))
+    counts = np.load(os.path.join(curve_dir, SESSIONS_FILE))
+    return index["rows"], index["last_ts"], sums, counts
+
+
+def _save(curve_dir, rows, last_ts, sums, counts, cumulative) -> None:
+    # Arrays first, index last: a reader never sees rows without data
+    for name, array in (
+        (SUMS_FILE, sums),
+        (SESSIONS_FILE, counts),
+        (CUMULATIVE_FILE, cumulative),
+    ):
+        tmp_path = os.path.join(curve_dir, f"tmp_{name}")
+        np.save(tmp_path, array)
+        os.replace(tmp_path, os.path.join(curve_dir, name))
+
+    tmp_path = os.path.join(curve_dir, f"{INDEX_FILE}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"buckets": int(sums.shape[1]), "rows": rows, "last_ts": last_ts}, f)
+    os.replace(tmp_path, os.path.join(curve_dir, INDEX_FILE))
+
+
+# -----------------------------
+# Lookup
+# -----------------------------
+
+class VolumeCurves:
+    """
+    Memory-mapped cumulative intraday volume curves.
+
+    ``cumulative[row, m]`` is the expected fraction of a session's volume
+    traded before minute ``m`` of the session; instruments without a row (or
+    with too little history) use the pooled curve.
+    """
+
+    __slots__ = ("rows", "cumulative", "buckets", "pooled_row")
+
+    def __init__(self, rows: Dict[str, int], cumulative: np.ndarray):
+        self.rows = rows
+        self.cumulative = cumulative
+        self.buckets = cumulative.shape[1] - 1
+        self.pooled_row = cumulative.shape[0] - 1
+
+    @classmethod
+    def load(cls, curve_dir: str) -> VolumeCurves:
+        curve_dir = os.path.expanduser(curve_dir)
+        with open(os.path.join(curve_dir, INDEX_FILE)) as f:
+            rows = json.load(f)["rows"]
+        cumulative = np.load(os.path.join(curve_dir, CUMULATIVE_FILE), mmap_mode="r")
+        return cls(rows, cumulative)
+
+    def row(self, instrument_id) -> int:
+        return self.rows.get(str(instrument_id), self.pooled_row)
+
+    def rows_for(self, instrument_ids: List) -> np.ndarray:
+        return np.fromiter((self.row(i) for i in instrument_ids), dtype=np.int64, count=len(instrument_ids))
+
+    def fraction_between(self, rows: np.ndarray, start_min: np.ndarray, end_min: np.ndarray) -> np.ndarray:
+        """Expected share of daily volume between two minutes-of-session, per row."""
+        start_min = np.clip(start_min, 0, self.buckets)
+        end_min = np.clip(end_min, 0, self.buckets)
+        return self.cumulative[rows, end_min] - self.cumulative[rows, start_min]
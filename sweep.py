@@ -0,0 +1,80 @@
+# sweep.py
+from __future__ import annotations
+
+from dotenv import load_dotenv
+from hydra.core.hydra_config import HydraConfig
+from omegaconf import DictConfig, OmegaConf
+
+import os
+import pandas as pd
+import hydra
+
+from src.data import create_data_configs, get_catalog, get_top_liquid_instruments
+from src.sweep import expand_grid, run_sweep
+
+@hydra.main(version_base=None, config_path="conf", config_name="config")
+def main(cfg: DictConfig):
+    # 1. Prepare Data (once, shared by every sweep point)
+    load_dotenv()
+    NAUTILUS_ROOT = os.getenv('NAUTILUS_ROOT')
+    catalog = get_catalog(NAUTILUS_ROOT)
+    instruments = get_top_liquid_instruments(catalog,
+                                             limit=cfg.universe.top_n_instruments,
+                                             as_of=cfg.universe.as_of or cfg.backtest.start_date,
+                                             by=cfg.universe.rank_by)
+    print(f"Selected Instruments: {instruments}")
+
+    # 2. Base config + sweep points
+    cfg.strategy.instrument_ids = instruments
+    cfg.strategy.session_start = cfg.backtest.start_date
+    cfg.strategy.session_end = cfg.backtest.end_date
+    if cfg.strategy.session_cache_dir is None:
+        cfg.strategy.session_cache_dir = os.path.join(NAUTILUS_ROOT, "sessions")
+    if cfg.strategy.instrumentation.enabled and cfg.strategy.instrumentation.output_dir is None:
+        cfg.strategy.instrumentation.output_dir = HydraConfig.get().runtime.output_dir
+
+    strategy_cfg = OmegaConf.to_container(cfg.strategy, resolve=True)
+    grid = OmegaConf.to_container(cfg.sweep.grid, resolve=True)
+    points = list(OmegaConf.to_container(cfg.sweep.points, resolve=True)) or expand_grid(grid)
+    print(f"Sweep points: {len(points)}")
+
+    data_kwargs = dict(start=cfg.backtest.start_date,
+                       daily_lookback_days=cfg.backtest.daily_lookback_days)
+    market_cache = None
+    if cfg.backtest.market_cache:
+        from src.market_cache import build_market_cache
+
+        # Decoded once here; every worker memory-maps the same files
+        market_cache = build_market_cache(catalog,
+                                          create_data_configs(NAUTILUS_ROOT, instruments, **data_kwargs),
+                                          root=cfg.backtest.market_cache_dir)
+
+    backtest_kwargs = dict(
+        strategy_path=cfg.backtest.strategy_path,
+        config_path=cfg.backtest.config_path,
+        venue_name=cfg.backtest.venue,
+        start=pd.Timestamp(cfg.backtest.start_date, tz='UTC'),
+        end=pd.Timestamp(cfg.backtest.end_date, tz='UTC'),
+        starting_balances=list(cfg.backtest.starting_balances),
+        chunk_size=cfg.backtest.chunk_size,
+        market_cache=market_cache,
+    )
+
+    # 3. Run
+    table = run_sweep(
+        strategy_cfg=strategy_cfg,
+        points=points,
+        catalog_path=NAUTILUS_ROOT,
+        instruments=instruments,
+        backtest_kwargs=backtest_kwargs,
+        max_workers=cfg.sweep.max_workers,
+        data_kwargs=data_kwargs,
+    )
+
+    output_path = os.path.join(HydraConfig.get().runtime.output_dir, "sweep_results.csv")
+    table.to_csv(output_path)
+    print(table.to_string())
+    print(f"Sweep results written to {output_path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# tests/test_alpha.py
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.alpha import PositionOptimizer
+
+UNBOUNDED = 1e12
+
+
+def objective(x, alpha, x0, cost, lam):
+    return alpha @ x - cost @ np.abs(x - x0) - 0.5 * (lam * x * x).sum()
+
+
+def problem(rng, n, max_delta=UNBOUNDED, max_factor=UNBOUNDED):
+    cap = np.full(n, 5e4)
+    return dict(
+        alpha=rng.standard_normal(n),
+        x0=rng.normal(0.0, 1e4, n),
+        cost=np.full(n, 0.005),
+        lam=1e-3 * rng.uniform(0.5, 2.0, n),
+        pos_cap=cap,
+        trd_cap=cap * rng.uniform(0.2, 1.0, n),
+        factor_loading=rng.standard_normal(n),
+        max_factor_exposure=max_factor,
+        max_delta=max_delta,
+    )
+
+
+def assert_matches_cvxpy(optimizer, inputs, method):
+    x = optimizer.solve(**inputs)
+    assert optimizer.last_method == method
+
+    reference = PositionOptimizer(solver="CLARABEL", fast_path=False).solve(**inputs)
+    args = (inputs["alpha"], inputs["x0"], inputs["cost"], inputs["lam"])
+    fast, exact = objective(x, *args), objective(reference, *args)
+    # Same optimum (the fast path is exact; Clarabel to its tolerance)
+    assert fast >= exact - 1e-6 * max(1.0, abs(exact))
+    assert fast == pytest.approx(exact, rel=1e-6, abs=1e-3)
+
+    # Feasible
+    assert (np.abs(x) <= inputs["pos_cap"] + 1e-9).all()
+    assert (np.abs(x - inputs["x0"]) <= inputs["trd_cap"] + 1e-9).all()
+    assert abs(x.sum()) <= inputs["max_delta"] * (1 + 1e-9)
+    assert abs(inputs["factor_loading"] @ x) <= inputs["max_factor_exposure"] * (1 + 1e-9)
+    return x
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_closed_form_matches_cvxpy(seed):
+    inputs = problem(np.random.default_rng(seed), 50)
+    assert_matches_cvxpy(PositionOptimizer(), inputs, "closed_form")
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("constraint", ["max_delta", "max_factor_exposure"])
+def test_bisection_matches_cvxpy(seed, constraint):
+    inputs = problem(np.random.default_rng(seed), 200)
+    w = np.ones(200) if constraint == "max_delta" else inputs["factor_loading"]
+    # Bind at a tenth of the unconstrained exposure
+    bound = 0.1 * abs(w @ PositionOptimizer().solve(**inputs))
+    inputs[constraint] = bound
+
+    x = assert_matches_cvxpy(PositionOptimizer(), inputs, "bisection")
+    assert abs(w @ x) == pytest.approx(bound, rel=1e-6)
+
+
+def test_warm_start_matches_cold_solve():
+    rng = np.random.default_rng(7)
+    inputs = problem(rng, 300, max_delta=2_000.0)
+    warm = PositionOptimizer()
+    for _ in range(5):
+        inputs["alpha"] = inputs["alpha"] * (1.0 + 0.05 * rng.standard_normal(300))
+        x = warm.solve(**inputs)
+        cold = PositionOptimizer()
+        np.testing.assert_allclose(x, cold.solve(**inputs), rtol=1e-6, atol=1e-3)
+        assert warm.last_method == cold.last_method == "bisection"
+    assert 0 in warm._multipliers
+
+
+def test_both_constraints_binding_fall_back_to_cvxpy():
+    rng = np.random.default_rng(3)
+    inputs = problem(rng, 100, max_delta=10.0, max_factor=10.0)
+    optimizer = PositionOptimizer()
+
+    x = optimizer.solve(**inputs)
+    assert optimizer.last_method == "cvxpy"
+    assert optimizer.last_status == "optimal"
+    assert abs(x.sum()) <= 10.0 + 1e-4
+
+
+def test_fast_path_declines_zero_risk_aversion():
+    inputs = problem(np.random.default_rng(0), 20)
+    inputs["lam"][0] = 0.0
+    optimizer = PositionOptimizer()
+    optimizer.solve(**inputs)
+    assert optimizer.last_method == "cvxpy"
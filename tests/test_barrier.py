@@ -0,0 +1,103 @@
+# tests/test_barrier.py
+from __future__ import annotations
+
+import pytest
+
+from nautilus_trader.common.component import TestClock
+
+from src.barrier import BarBarrier
+
+NS_PER_MINUTE = 60_000_000_000
+TIMEOUT = 5_000_000_000
+T0 = 1_700_000_000 * 1_000_000_000 // NS_PER_MINUTE * NS_PER_MINUTE
+
+
+@pytest.fixture
+def clock():
+    clock = TestClock()
+    clock.set_time(T0)
+    return clock
+
+
+@pytest.fixture
+def fired():
+    return []
+
+
+@pytest.fixture
+def barrier(clock, fired):
+    return BarBarrier(clock, lambda ts, complete: fired.append((ts, complete)), TIMEOUT)
+
+
+def advance(clock, to_ns):
+    for handler in clock.advance_time(to_ns):
+        handler.handle()
+
+
+def test_fires_once_when_complete(clock, barrier, fired):
+    barrier.open(T0, expected=3)
+    assert barrier.name in clock.timer_names
+    barrier.arrive()
+    barrier.arrive()
+    assert fired == []
+    barrier.arrive()
+
+    assert fired == [(T0, True)]
+    assert barrier.name not in clock.timer_names
+    # Extra bars and the (cancelled) timeout do not fire again
+    barrier.arrive()
+    advance(clock, T0 + TIMEOUT)
+    assert fired == [(T0, True)]
+    assert (barrier.completed, barrier.timed_out) == (1, 0)
+
+
+def test_fires_on_timeout_with_partial_cross_section(clock, barrier, fired):
+    barrier.open(T0, expected=3)
+    barrier.arrive()
+    advance(clock, T0 + TIMEOUT - 1)
+    assert fired == []
+
+    advance(clock, T0 + TIMEOUT)
+    assert fired == [(T0, False)]
+    assert barrier.count == 1
+    # Stragglers after the timeout do not fire again
+    barrier.arrive()
+    barrier.arrive()
+    assert fired == [(T0, False)]
+    assert (barrier.completed, barrier.timed_out) == (0, 1)
+
+
+def test_next_timestamp_flushes_the_open_one(clock, barrier, fired):
+    barrier.open(T0, expected=3)
+    barrier.arrive()
+    barrier.open(T0 + NS_PER_MINUTE, expected=3)
+
+    assert fired == [(T0, False)]
+    for _ in range(3):
+        barrier.arrive()
+    assert fired == [(T0, False), (T0 + NS_PER_MINUTE, True)]
+    assert (barrier.completed, barrier.timed_out) == (1, 1)
+
+
+def test_unarmed_timestamp_only_counts(clock, barrier, fired):
+    barrier.open(T0, expected=2, armed=False)
+    assert barrier.name not in clock.timer_names
+    barrier.arrive()
+    barrier.arrive()
+    advance(clock, T0 + TIMEOUT)
+    barrier.open(T0 + NS_PER_MINUTE, expected=2)
+
+    assert fired == []
+    assert barrier.count == 0 and barrier.armed
+
+
+def test_timer_rearmed_per_timestamp(clock, barrier, fired):
+    barrier.open(T0, expected=2)
+    barrier.arrive()
+    barrier.arrive()
+    barrier.open(T0 + NS_PER_MINUTE, expected=2)
+    barrier.arrive()
+
+    # The first timestamp's alert was cancelled; only the second one's fires
+    advance(clock, T0 + NS_PER_MINUTE + TIMEOUT)
+    assert fired == [(T0, True), (T0 + NS_PER_MINUTE, False)]
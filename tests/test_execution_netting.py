@@ -0,0 +1,96 @@
+# tests/test_execution_netting.py
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.config import ExecutionConfig
+from src.execution.engine import ExecutionEngine
+from src.instrumentation import NullRecorder
+
+NS_PER_MINUTE = 60_000_000_000
+T0 = 1_000 * NS_PER_MINUTE
+HORIZON = 30
+
+
+@pytest.fixture
+def engine():
+    # No children are worked here: only the parent book is exercised
+    strategy = SimpleNamespace(latency=NullRecorder(), orders=None)
+    return ExecutionEngine(strategy, ExecutionConfig(algo="twap", horizon_minutes=HORIZON))
+
+
+def counts(engine, **expected):
+    return {name: engine.netting[name] for name in expected} == expected
+
+
+def test_opened(engine):
+    engine.submit_target("A", 500, T0)
+
+    schedule = engine._schedules["A"]
+    assert (schedule.remaining_qty, schedule.total_qty) == (500, 500)
+    assert (schedule.start_ts, schedule.end_ts) == (T0, T0 + HORIZON * NS_PER_MINUTE)
+    assert counts(engine, opened=1, kept=0, resized=0, flipped=0, retired=0)
+
+
+def test_kept(engine):
+    engine.submit_target("A", 500, T0)
+    schedule = engine._schedules["A"]
+    schedule.remaining_qty = 300   # 200 filled since
+
+    engine.submit_target("A", 300, T0 + 5 * NS_PER_MINUTE)
+
+    assert engine._schedules["A"] is schedule
+    assert (schedule.remaining_qty, schedule.total_qty) == (300, 500)
+    assert (schedule.start_ts, schedule.end_ts) == (T0, T0 + HORIZON * NS_PER_MINUTE)
+    assert counts(engine, opened=1, kept=1, resized=0)
+
+
+@pytest.mark.parametrize("delta, total", [(200, 400), (600, 800)])
+def test_resized_keeps_horizon(engine, delta, total):
+    engine.submit_target("A", 500, T0)
+    schedule = engine._schedules["A"]
+    schedule.remaining_qty = 300   # 200 filled since
+
+    engine.submit_target("A", delta, T0 + 5 * NS_PER_MINUTE)
+
+    assert engine._schedules["A"] is schedule
+    assert (schedule.remaining_qty, schedule.total_qty) == (delta, total)
+    assert (schedule.start_ts, schedule.end_ts) == (T0, T0 + HORIZON * NS_PER_MINUTE)
+    assert counts(engine, opened=1, resized=1, flipped=0)
+
+
+def test_flipped_restarts_horizon(engine):
+    engine.submit_target("A", 500, T0)
+    schedule = engine._schedules["A"]
+    schedule.remaining_qty = 300
+
+    ts = T0 + 5 * NS_PER_MINUTE
+    engine.submit_target("A", -200, ts)
+
+    assert engine._schedules["A"] is schedule
+    assert (schedule.remaining_qty, schedule.total_qty) == (-200, -200)
+    assert (schedule.start_ts, schedule.end_ts) == (ts, ts + HORIZON * NS_PER_MINUTE)
+    assert counts(engine, opened=1, resized=0, flipped=1)
+
+
+def test_retired_on_zero_delta(engine):
+    engine.submit_target("A", 500, T0)
+    engine.submit_target("A", 0, T0 + NS_PER_MINUTE)
+
+    assert "A" not in engine._schedules
+    assert counts(engine, opened=1, retired=1)
+
+    # Zero delta without a parent: nothing to retire
+    engine.submit_target("B", 0, T0 + NS_PER_MINUTE)
+    assert counts(engine, retired=1)
+
+
+def test_submit_targets_retires_missing_names(engine):
+    engine.submit_targets(["A", "B"], np.array([500.0, -300.0]), T0)
+    engine.submit_targets(["A", "B"], np.array([500.0, 0.0]), T0 + NS_PER_MINUTE)
+
+    assert list(engine._schedules) == ["A"]
+    assert counts(engine, opened=2, kept=1, retired=1)
@@ -0,0 +1,95 @@
+# tests/test_intraday.py
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.intraday import IntradayVWAP
+from src.portfolio import PortfolioState
+
+NS_PER_MINUTE = 60_000_000_000
+DAY = 1_440 * NS_PER_MINUTE
+OPENS = np.array([10 * DAY, 11 * DAY, 14 * DAY], dtype=np.int64)
+
+
+def make(names=("A", "B")):
+    state = PortfolioState(list(names))
+    vwap = IntradayVWAP(state)
+    vwap.bind(SimpleNamespace(session_opens=OPENS))
+    return state, vwap
+
+
+def test_vwap_volume_and_participation():
+    state, vwap = make()
+    t = OPENS[0]
+    vwap.update("A", t, 10.0, 100.0)
+    vwap.update("A", t + NS_PER_MINUTE, 12.0, 300.0)
+    vwap.update("B", t + NS_PER_MINUTE, 50.0, 1_000.0)
+    vwap.record_fill("A", t + NS_PER_MINUTE, -40.0)
+    vwap.update("Z", t, 1.0, 1.0)   # not in the state: ignored
+
+    np.testing.assert_allclose(vwap.vwap(), [11.5, 50.0])
+    np.testing.assert_allclose(vwap.volume(), [400.0, 1_000.0])
+    np.testing.assert_allclose(vwap.participation(), [0.1, 0.0])
+
+
+def test_session_reset_is_lazy_per_name():
+    state, vwap = make()
+    vwap.update("A", OPENS[0] + NS_PER_MINUTE, 10.0, 100.0)
+    vwap.update("B", OPENS[0] + NS_PER_MINUTE, 20.0, 100.0)
+    vwap.record_fill("B", OPENS[0] + 2 * NS_PER_MINUTE, 10.0)
+
+    # Next session: only A prints; B's sums belong to the previous session
+    vwap.update("A", OPENS[1] + NS_PER_MINUTE, 30.0, 50.0)
+
+    vwap_now = vwap.vwap()
+    assert vwap_now[0] == pytest.approx(30.0)
+    assert np.isnan(vwap_now[1])
+    np.testing.assert_allclose(vwap.volume(), [50.0, 0.0])
+    np.testing.assert_allclose(vwap.participation(), [0.0, 0.0])
+
+    # B's first bar of the session starts from zero
+    vwap.update("B", OPENS[1] + 2 * NS_PER_MINUTE, 40.0, 10.0)
+    np.testing.assert_allclose(vwap.vwap(), [30.0, 40.0])
+    assert state.vwap_filled[state.slots["B"]] == 0.0
+
+
+def test_session_spans_to_the_next_open():
+    state, vwap = make(["A"])
+    # Late bars and the weekend belong to the session of the last open
+    vwap.update("A", OPENS[1] + 600 * NS_PER_MINUTE, 10.0, 10.0)
+    vwap.update("A", OPENS[2] - 1, 20.0, 10.0)
+    assert vwap.session_open == OPENS[1]
+    assert vwap.vwap()[0] == pytest.approx(15.0)
+
+    vwap.update("A", OPENS[2], 40.0, 10.0)
+    assert vwap.session_open == OPENS[2]
+    assert vwap.vwap()[0] == pytest.approx(40.0)
+    # Past the last open: still the last session
+    vwap.update("A", OPENS[2] + 5 * DAY, 60.0, 10.0)
+    assert vwap.vwap()[0] == pytest.approx(50.0)
+
+
+def test_before_first_session():
+    state, vwap = make(["A"])
+    vwap.update("A", OPENS[0] - NS_PER_MINUTE, 10.0, 10.0)
+    assert vwap.session_open == -1
+    assert vwap.vwap()[0] == pytest.approx(10.0)
+
+    vwap.update("A", OPENS[0], 20.0, 10.0)
+    assert vwap.vwap()[0] == pytest.approx(20.0)
+
+
+def test_sums_follow_universe_changes():
+    state, vwap = make(["A", "B"])
+    t = OPENS[0] + NS_PER_MINUTE
+    vwap.update("A", t, 10.0, 100.0)
+    vwap.update("B", t, 20.0, 200.0)
+
+    state.remove(["A"])
+    state.add(["C"])
+    np.testing.assert_allclose(vwap.volume(), [200.0, 0.0])
+    vwap.update("C", t, 5.0, 10.0)
+    np.testing.assert_allclose(vwap.vwap(), [20.0, 5.0])
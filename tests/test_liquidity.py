@@ -0,0 +1,159 @@
+# tests/test_liquidity.py
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import get_rolling_universe, get_top_liquid_instruments
+from src.liquidity import (
+    compute_liquidity_metrics,
+    load_liquidity_index,
+    membership_windows,
+    rolling_universe,
+    save_liquidity_index,
+    top_liquid,
+    update_liquidity_index,
+)
+
+SYMBOLS = ["A.XNYS", "B.XNYS", "C.XNYS", "D.XNYS"]
+
+
+def daily_frame(start="2024-09-16", days=10, seed=0) -> pd.DataFrame:
+    """Daily close / volume rows in the index's raw layout (UTC midnight dates)."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start, periods=days, tz="UTC")
+    return pd.DataFrame({
+        "instrument_id": np.tile(SYMBOLS, days),
+        "date": np.repeat(dates, len(SYMBOLS)),
+        "close": rng.uniform(10.0, 100.0, days * len(SYMBOLS)).round(2),
+        "volume": rng.integers(1_000, 100_000, days * len(SYMBOLS)).astype(float),
+    })
+
+
+def stub_catalog(path, symbols=SYMBOLS):
+    """The slice of ``ParquetDataCatalog`` the universe helpers read."""
+    instruments = [SimpleNamespace(id=symbol) for symbol in symbols]
+    return SimpleNamespace(path=str(path), instruments=lambda: instruments)
+
+
+def sort_index(index: pd.DataFrame) -> pd.DataFrame:
+    return index.sort_values(["instrument_id", "date"]).reset_index(drop=True)
+
+
+# -----------------------------
+# Liquidity index
+# -----------------------------
+
+def test_liquidity_metrics():
+    daily = daily_frame(days=6)
+    index = compute_liquidity_metrics(daily, window=3)
+
+    a = daily[daily["instrument_id"] == "A.XNYS"]
+    row = index[index["instrument_id"] == "A.XNYS"].iloc[-1]
+    dollar = (a["close"] * a["volume"]).to_numpy()
+    assert row["adv"] == pytest.approx(a["volume"].iloc[-3:].mean())
+    assert row["adv_usd"] == pytest.approx(dollar[-3:].mean())
+    assert row["volatility"] == pytest.approx(np.diff(np.log(a["close"].to_numpy()))[-3:].std(ddof=1))
+    # One session: a mean but no return volatility yet
+    first = index.groupby("instrument_id").head(1)
+    assert first["adv"].notna().all() and first["volatility"].isna().all()
+
+
+def test_incremental_update_matches_full_rebuild(tmp_path):
+    daily = daily_frame(days=10)
+    dates = daily["date"].unique()
+    full = update_liquidity_index(str(tmp_path / "full"), daily, window=3, replace=True)
+
+    path = str(tmp_path / "incremental")
+    update_liquidity_index(path, daily[daily["date"] < dates[6]], window=3)
+    # Restate day 6 with the wrong volume first, then deliver the rest
+    restated = daily[daily["date"] == dates[6]].assign(volume=1.0)
+    update_liquidity_index(path, restated, window=3)
+    update_liquidity_index(path, daily[daily["date"] >= dates[6]], window=3)
+
+    pd.testing.assert_frame_equal(
+        sort_index(load_liquidity_index(path)), sort_index(full), check_dtype=False
+    )
+
+
+def test_top_liquid_is_as_of_strictly_before():
+    daily = daily_frame(days=3)
+    # C dominates on the last day only
+    daily.loc[(daily["instrument_id"] == "C.XNYS") & (daily["date"] == daily["date"].max()), "volume"] = 1e12
+    index = compute_liquidity_metrics(daily, window=2)
+    last = daily["date"].max()
+
+    assert top_liquid(index, 1) == ["C.XNYS"]
+    assert top_liquid(index, 1, as_of=last + pd.Timedelta(days=1)) == ["C.XNYS"]
+    assert "C.XNYS" not in top_liquid(index, 1, as_of=last)
+    assert top_liquid(index, 2, as_of=daily["date"].min()) == []
+    # Naive dates are read as UTC
+    assert top_liquid(index, 4, as_of=last.tz_localize(None)) == top_liquid(index, 4, as_of=last)
+
+
+def test_top_liquid_instruments_fall_back_to_catalog_order(tmp_path):
+    save_liquidity_index(str(tmp_path), compute_liquidity_metrics(daily_frame(start="2024-10-01"), window=3))
+    catalog = stub_catalog(tmp_path, symbols=list(reversed(SYMBOLS)))
+
+    assert get_top_liquid_instruments(catalog, limit=2, as_of="2024-09-30") == ["D.XNYS", "C.XNYS"]
+    assert len(get_top_liquid_instruments(catalog, limit=2, as_of="2024-10-03")) == 2
+
+
+# -----------------------------
+# Rolling universe
+# -----------------------------
+
+def test_rolling_universe_matches_top_liquid():
+    index = compute_liquidity_metrics(daily_frame(), window=3)
+    sessions = pd.bdate_range("2024-09-16", "2024-10-01")
+
+    schedule = rolling_universe(index, sessions, limit=2)
+
+    assert list(schedule) == [d.strftime("%Y-%m-%d") for d in sessions]
+    for date, members in schedule.items():
+        assert members == top_liquid(index, 2, as_of=date)
+    # First session: no history strictly before it
+    assert schedule["2024-09-16"] == []
+
+
+def test_membership_windows():
+    schedule = {
+        "2024-10-01": ["A", "B"],
+        "2024-10-02": ["A", "C"],
+        "2024-10-03": ["A", "B"],
+        "2024-10-04": ["C"],
+    }
+    ts = lambda d: pd.Timestamp(d, tz="UTC")
+
+    windows = membership_windows(schedule, exit_days=0)
+    assert windows["A"] == [(ts("2024-10-01"), ts("2024-10-04"))]
+    assert windows["B"] == [(ts("2024-10-01"), ts("2024-10-02")), (ts("2024-10-03"), ts("2024-10-04"))]
+    assert windows["C"] == [(ts("2024-10-02"), ts("2024-10-03")), (ts("2024-10-04"), ts("2024-10-05"))]
+
+    # One exit day bridges B's gap and keeps A for the session it drops out
+    windows = membership_windows(schedule, exit_days=1)
+    assert windows["A"] == [(ts("2024-10-01"), ts("2024-10-05"))]
+    assert windows["B"] == [(ts("2024-10-01"), ts("2024-10-05"))]
+
+
+def test_get_rolling_universe_has_no_look_ahead(tmp_path):
+    # The index starts on 09-18: earlier sessions have no ranking yet
+    index = compute_liquidity_metrics(daily_frame(start="2024-09-18", days=5), window=3)
+    save_liquidity_index(str(tmp_path), index)
+    catalog = stub_catalog(tmp_path, symbols=list(reversed(SYMBOLS)))
+    sessions = pd.bdate_range("2024-09-16", "2024-09-27")
+
+    schedule, windows = get_rolling_universe(catalog, sessions, limit=2)
+
+    # 09-16..09-18: catalog order, not the first later ranking
+    for date in ("2024-09-16", "2024-09-17", "2024-09-18"):
+        assert schedule[date] == ["D.XNYS", "C.XNYS"]
+    # Ranked sessions: as of the day before, never later
+    for date in ("2024-09-19", "2024-09-20", "2024-09-23", "2024-09-24", "2024-09-25"):
+        assert schedule[date] == top_liquid(index, 2, as_of=date)
+    # Past the end of the index the last ranking carries forward
+    assert schedule["2024-09-27"] == top_liquid(index, 2)
+    assert set(windows) == {i for members in schedule.values() for i in members}
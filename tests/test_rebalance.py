@@ -0,0 +1,183 @@
+# tests/test_rebalance.py
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.config import RebalanceConfig
+from src.portfolio import PortfolioState
+from src.rebalance import NS_PER_MINUTE, RebalanceController
+
+T0 = 1_000 * NS_PER_MINUTE
+
+
+class StubOrders:
+    """``OrderSubmitter.spec`` with fixed lot sizes / increments."""
+
+    def __init__(self, lot_size=100.0, size_increment=1.0):
+        self.lot_size = lot_size
+        self.size_increment = size_increment
+        self.calls = 0
+
+    def spec(self, instrument_id):
+        self.calls += 1
+        return SimpleNamespace(lot_size=self.lot_size, size_increment=self.size_increment)
+
+
+def make(config=None, orders=None, prices=(10.0, 10.0, 10.0, np.nan)):
+    state = PortfolioState(["A", "B", "C", "D"])
+    controller = RebalanceController(state, config or RebalanceConfig(), orders or StubOrders())
+    for instrument_id, price in zip(state.instrument_ids, prices):
+        if price == price:
+            state.update_price(instrument_id, price)
+    return state, controller
+
+
+# -----------------------------
+# Solve gating
+# -----------------------------
+
+def test_first_decision_solves():
+    state, controller = make(RebalanceConfig(interval_minutes=5, change_threshold=0.5))
+    assert controller.should_solve(T0)
+
+
+def test_interval_throttles_solves():
+    state, controller = make(RebalanceConfig(interval_minutes=5))
+    controller.solved(T0)
+
+    assert not controller.should_solve(T0 + 4 * NS_PER_MINUTE)
+    assert controller.should_solve(T0 + 5 * NS_PER_MINUTE)
+    assert (controller.solves, controller.skipped) == (1, 1)
+
+
+def test_change_threshold():
+    state, controller = make(RebalanceConfig(change_threshold=0.1))
+    state.alpha[:] = [1.0, -1.0, 0.5, 0.0]
+    controller.solved(T0)
+
+    state.alpha[0] = 1.05   # ~3% relative L2 move
+    assert not controller.should_solve(T0 + NS_PER_MINUTE)
+    assert controller.last_change == pytest.approx(0.05 / np.linalg.norm(state.alpha), rel=0.1)
+
+    state.alpha[1] = 1.0
+    assert controller.should_solve(T0 + 2 * NS_PER_MINUTE)
+
+
+def test_max_interval_forces_solve():
+    state, controller = make(RebalanceConfig(change_threshold=0.1, max_interval_minutes=10))
+    controller.solved(T0)
+
+    assert not controller.should_solve(T0 + 9 * NS_PER_MINUTE)
+    assert controller.should_solve(T0 + 10 * NS_PER_MINUTE)
+
+
+def test_new_name_counts_as_change():
+    state, controller = make(RebalanceConfig(change_threshold=0.1))
+    controller.solved(T0)
+    assert controller.change() == 0.0
+
+    state.add(["E"])
+    assert controller.change() == np.inf
+    assert controller.should_solve(T0 + NS_PER_MINUTE)
+
+
+def test_removed_name_counts_as_change():
+    state, controller = make(RebalanceConfig(change_threshold=0.1))
+    controller.solved(T0)
+
+    state.remove(["A"])
+    assert controller.change() == np.inf
+
+
+# -----------------------------
+# band
+# -----------------------------
+
+@pytest.mark.parametrize("band_usd, expected", [
+    (0.0, [150.0, -400.0, 2000.0, 0.0]),
+    (1_500.0, [150.0, -400.0, 2000.0, 0.0]),   # the band edge itself trades
+    (4_000.1, [0.0, 0.0, 2000.0, 0.0]),
+])
+def test_band_usd(band_usd, expected):
+    state, controller = make(RebalanceConfig(no_trade_band_usd=band_usd))
+    deltas = np.array([150.0, -400.0, 2000.0, 0.0])
+
+    assert controller.band(deltas) is deltas
+    np.testing.assert_array_equal(deltas, expected)
+
+
+def test_band_usd_drops_names_without_price():
+    state, controller = make(RebalanceConfig(no_trade_band_usd=1.0))
+    np.testing.assert_array_equal(controller.band(np.array([0.0, 0.0, 0.0, 500.0])), [0.0, 0.0, 0.0, 0.0])
+
+
+def test_band_lots():
+    state, controller = make(RebalanceConfig(no_trade_band_lots=2.0))
+    controller._load_specs()
+
+    deltas = controller.band(np.array([150.0, -200.0, 1000.0, -199.0]))
+    np.testing.assert_array_equal(deltas, [0.0, -200.0, 1000.0, 0.0])
+
+
+# -----------------------------
+# deltas
+# -----------------------------
+
+def test_deltas_round_targets_to_lots():
+    state, controller = make()
+    state.target_usd[:] = [10_440.0, 10_600.0, -4_960.0, 5_000.0]
+    state.positions[:] = [0.0, 950.0, 0.0, 0.0]
+
+    deltas = controller.deltas(min_trade_qty=1)
+
+    # 1044 -> 1000 shares, 1060 -> 1100 (less 950 held), -496 -> -500; no price: no trade
+    np.testing.assert_array_equal(deltas, [1000.0, 150.0, -500.0, 0.0])
+
+
+def test_deltas_without_lot_rounding():
+    state, controller = make(RebalanceConfig(round_to_lots=False))
+    state.target_usd[:] = [10_444.0, 10_600.0, -4_960.0, 5_000.0]
+    state.positions[:] = [0.0, 950.0, 0.0, 0.0]
+
+    np.testing.assert_array_equal(controller.deltas(min_trade_qty=1), [1044.0, 110.0, -496.0, 0.0])
+
+
+def test_deltas_round_to_size_increment():
+    state, controller = make(RebalanceConfig(round_to_lots=False), StubOrders(lot_size=1.0, size_increment=10.0))
+    state.target_usd[:] = [10_440.0, 10_460.0, 0.0, 0.0]
+
+    np.testing.assert_array_equal(controller.deltas(min_trade_qty=1), [1040.0, 1050.0, 0.0, 0.0])
+
+
+def test_deltas_drop_under_min_trade_qty():
+    state, controller = make()
+    state.target_usd[:] = [10_000.0, 10_000.0, 10_000.0, 0.0]
+    state.positions[:] = [990.0, 980.0, 0.0, 0.0]
+
+    # Lot rounding targets 1000 shares everywhere: deltas of 10, 20 and 1000
+    np.testing.assert_array_equal(controller.deltas(min_trade_qty=20), [0.0, 20.0, 1000.0, 0.0])
+
+
+def test_deltas_apply_band():
+    state, controller = make(RebalanceConfig(no_trade_band_lots=1.0))
+    state.target_usd[:] = [10_000.0, 10_000.0, 0.0, 0.0]
+    state.positions[:] = [950.0, 0.0, 0.0, 0.0]
+
+    np.testing.assert_array_equal(controller.deltas(min_trade_qty=1), [0.0, 1000.0, 0.0, 0.0])
+
+
+def test_deltas_load_specs_once_per_name():
+    orders = StubOrders()
+    state, controller = make(orders=orders)
+    controller.deltas(min_trade_qty=1)
+    controller.deltas(min_trade_qty=1)
+    assert orders.calls == len(state)
+
+    state.add(["E"])
+    assert np.isnan(state.lot_size[state.slots["E"]])
+    controller.deltas(min_trade_qty=1)
+    assert orders.calls == len(state)
+    assert state.lot_size[state.slots["E"]] == 100.0
@@ -0,0 +1,102 @@
+# tests/test_sessions.py
+from __future__ import annotations
+
+import exchange_calendars as xcals
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import sessions
+from src.sessions import NS_PER_MINUTE, SessionIndex, session_index_for
+
+START, END = "2024-06-01", "2024-12-31"
+
+
+def probe_times(seed=0, n=3_000) -> pd.DatetimeIndex:
+    """Random minutes over the window plus every session's open / close edges."""
+    rng = np.random.default_rng(seed)
+    lo, hi = pd.Timestamp(START, tz="UTC").value, pd.Timestamp(END, tz="UTC").value
+    random = rng.integers(lo, hi, n) // NS_PER_MINUTE * NS_PER_MINUTE
+    schedule = xcals.get_calendar("XNYS", start=START, end=END).schedule
+    edges = np.concatenate([
+        schedule[column].astype("int64").to_numpy() + offset
+        for column in ("open", "close")
+        for offset in (-NS_PER_MINUTE, 0, NS_PER_MINUTE)
+    ])
+    return pd.DatetimeIndex(np.sort(np.concatenate([random, edges])), tz="UTC")
+
+
+@pytest.mark.parametrize("exchange", ["XNYS", "XHKG"])
+def test_is_open_matches_exchange_calendars(exchange):
+    calendar = xcals.get_calendar(exchange, start=START, end=END)
+    index = SessionIndex.build(exchange, START, END)
+    first, last = calendar.first_minute, calendar.last_minute
+
+    for ts in probe_times():
+        if not first <= ts <= last:
+            continue
+        # Open inclusive, close exclusive (lunch breaks closed)
+        assert index.is_open(ts.value) == calendar.is_open_at_time(ts, side="left"), ts
+
+
+def test_next_open_matches_exchange_calendars():
+    calendar = xcals.get_calendar("XNYS", start=START, end=END)
+    index = SessionIndex.build("XNYS", START, END)
+    last_open = calendar.schedule["open"].iloc[-1]
+
+    for ts in probe_times(seed=1):
+        if not calendar.first_minute <= ts < last_open:
+            continue
+        assert index.next_open(ts.value) == calendar.next_open(ts).value, ts
+    assert index.next_open(last_open.value) is None
+
+
+def test_early_close_and_holiday():
+    index = SessionIndex.build("XNYS", START, END)
+    ny = lambda s: pd.Timestamp(s, tz="America/New_York").value
+
+    # Day after Thanksgiving closes at 13:00 New York
+    assert index.is_open(ny("2024-11-29 12:59"))
+    assert not index.is_open(ny("2024-11-29 13:00"))
+    assert index.session_bounds(ny("2024-11-29 10:00")) == (ny("2024-11-29 09:30"), ny("2024-11-29 13:00"))
+    # Thanksgiving: closed, next open on Friday
+    assert not index.is_open(ny("2024-11-28 12:00"))
+    assert index.session_bounds(ny("2024-11-28 12:00")) is None
+    assert index.next_open(ny("2024-11-28 12:00")) == ny("2024-11-29 09:30")
+
+
+def test_save_load_roundtrip(tmp_path):
+    index = SessionIndex.build("XHKG", START, END)
+    path = str(tmp_path / "xhkg.npz")
+    index.save(path)
+    loaded = SessionIndex.load(path)
+
+    assert (loaded.exchange, loaded.start_ns, loaded.end_ns) == (index.exchange, index.start_ns, index.end_ns)
+    for name in ("opens", "closes", "session_opens", "session_closes"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(index, name))
+    # The lunch break splits full days in two trading intervals (half days have none)
+    assert len(index) < len(index.opens) <= 2 * len(index)
+
+
+def test_session_index_for_caches_per_year(monkeypatch):
+    monkeypatch.setattr(sessions, "_INDEXES", {})
+    monkeypatch.setattr(sessions, "_YEAR_INDEXES", {})
+    built = []
+    build = SessionIndex.build.__func__
+    monkeypatch.setattr(
+        SessionIndex, "build",
+        classmethod(lambda cls, *args: built.append(args) or build(cls, *args)),
+    )
+
+    ts_2023 = pd.Timestamp("2023-03-01 15:00", tz="UTC").value
+    ts_2024 = pd.Timestamp("2024-03-01 15:00", tz="UTC").value
+    for ts in (ts_2023, ts_2024, ts_2023, ts_2024):
+        index = session_index_for("XNYS", ts)
+        assert index.covers(ts)
+    assert len(built) == 2
+
+    # A registered window covering the timestamp takes precedence
+    window = sessions.get_session_index("XNYS", "2024-02-01", "2024-04-01")
+    assert session_index_for("XNYS", ts_2024) is window
+    assert session_index_for("XNYS", ts_2023) is sessions._YEAR_INDEXES[("XNYS", 2023)]
+    assert len(built) == 3
@@ -0,0 +1,83 @@
+# tests/test_sharding.py
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.sharding import shard_window, stitch_shards
+
+
+def ts(date: str) -> pd.Timestamp:
+    return pd.Timestamp(date, tz="UTC")
+
+
+def shard_output(shard, start, end, starting, ending, fills=1, failed=False):
+    """A ``_run_shard`` output with ``fills`` one-row fill reports."""
+    if failed:
+        return {"shard": shard, "result": None, "stats": {}, "reports": None,
+                "start": ts(start), "end": ts(end), "starting_balances": starting}
+    return {
+        "shard": shard,
+        "result": SimpleNamespace(total_orders=10 * (shard + 1), total_positions=shard + 1),
+        "stats": {"wall_time_s": 1.5, "iterations": 100},
+        "reports": {
+            "ending_equity": ending,
+            "fills": pd.DataFrame({"qty": np.arange(fills)}),
+            "positions": pd.DataFrame(),
+            "account": None,
+        },
+        "start": ts(start),
+        "end": ts(end),
+        "starting_balances": starting,
+    }
+
+
+def test_shard_window():
+    assert shard_window(ts("2024-10-01"), ts("2024-10-04"), "day") == [
+        (ts("2024-10-01"), ts("2024-10-02")),
+        (ts("2024-10-02"), ts("2024-10-03")),
+        (ts("2024-10-03"), ts("2024-10-04")),
+    ]
+    # Partial first / last months
+    assert shard_window(ts("2024-09-15"), ts("2024-11-10"), "month") == [
+        (ts("2024-09-15"), ts("2024-10-01")),
+        (ts("2024-10-01"), ts("2024-11-01")),
+        (ts("2024-11-01"), ts("2024-11-10")),
+    ]
+    with pytest.raises(ValueError):
+        shard_window(ts("2024-10-01"), ts("2024-10-04"), "hour")
+
+
+def test_stitch_shards():
+    outputs = [
+        shard_output(1, "2024-10-02", "2024-10-03", ["1_000_250.5 USD"], ["1,000,100 USD"], fills=2),
+        shard_output(0, "2024-10-01", "2024-10-02", ["1_000_000 USD"], ["1_000_250.5 USD"], fills=3),
+    ]
+    report = stitch_shards(outputs)
+    summary = report["summary"]
+
+    assert list(summary.index) == [0, 1]
+    assert summary["pnl [USD]"].tolist() == pytest.approx([250.5, -150.5])
+    assert summary["end_equity [USD]"].tolist() == pytest.approx([1_000_250.5, 1_000_100.0])
+    assert summary["total_orders"].tolist() == [10, 20]
+    assert summary["wall_time_s"].tolist() == [1.5, 1.5]
+    assert report["total_pnl"] == pytest.approx({"pnl [USD]": 100.0})
+
+    # Reports concatenated in shard order and tagged; empty / missing ones skipped
+    assert report["fills"]["shard"].tolist() == [0, 0, 0, 1, 1]
+    assert report["positions"].empty and report["account"].empty
+
+
+def test_stitch_shards_with_a_failed_shard():
+    outputs = [
+        shard_output(0, "2024-10-01", "2024-10-02", ["1_000_000 USD"], ["1_000_050 USD"]),
+        shard_output(1, "2024-10-02", "2024-10-03", ["1_000_050 USD"], None, failed=True),
+    ]
+    report = stitch_shards(outputs)
+
+    assert report["summary"]["status"].tolist() == ["ok", "failed"]
+    assert np.isnan(report["summary"].loc[1, "pnl [USD]"])
+    assert report["total_pnl"] == pytest.approx({"pnl [USD]": 50.0})
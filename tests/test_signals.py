@@ -0,0 +1,129 @@
+# tests/test_signals.py
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.config import SignalConfig
+from src.portfolio import PortfolioState
+from src.signals import SignalEngine
+
+NAMES = ["A", "B", "C"]
+
+
+def feed(seed=0, bars=95, missing=0.1, names=NAMES):
+    """Random-walk closes per timestamp; each name skips ~``missing`` of the bars."""
+    rng = np.random.default_rng(seed)
+    closes = 50.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, (bars, len(names))), axis=0))
+    present = rng.random((bars, len(names))) >= missing
+    present[0] = True
+    return [
+        [(name, closes[t, j]) for j, name in enumerate(names) if present[t, j]]
+        for t in range(bars)
+    ]
+
+
+class Reference:
+    """Brute-force momentum sums and EWMAs from each name's full return history."""
+
+    def __init__(self, config, names):
+        self.cfg = config
+        prior = config.sigma_prior ** 2
+        self.returns = {name: [] for name in names}
+        self.last = {}
+        self.var = dict.fromkeys(names, prior)
+        self.cov = dict.fromkeys(names, prior)
+        self.market_var = prior
+        self.var_rate = 1.0 - 0.5 ** (1.0 / config.vol_halflife)
+        self.beta_rate = 1.0 - 0.5 ** (1.0 / config.beta_halflife)
+
+    def step(self, bars):
+        moves = {}
+        for name, close in bars:
+            if name in self.last:
+                moves[name] = np.log(close / self.last[name])
+            self.last[name] = close
+        if not moves:
+            return
+        r_market = np.mean(list(moves.values()))
+        for name, r in moves.items():
+            self.returns[name].append(r)
+            self.var[name] += self.var_rate * (r * r - self.var[name])
+            self.cov[name] += self.beta_rate * (r * r_market - self.cov[name])
+        self.market_var += self.beta_rate * (r_market * r_market - self.market_var)
+
+    def momentum(self, name):
+        returns = self.returns[name]
+        return [sum(returns[-h:]) for h in self.cfg.horizons]
+
+
+def run(engine, reference, timestamps):
+    for ts, bars in enumerate(timestamps):
+        for name, close in bars:
+            engine.update(name, ts, close)
+        reference.step(bars)
+    engine.fold()
+
+
+@pytest.mark.parametrize("bars", [9, 10, 11, 95])
+def test_running_sums_across_ring_wraps(bars):
+    config = SignalConfig(horizons=[2, 5, 10], horizon_weights=[0.5, 0.3, 0.2])
+    state = PortfolioState(NAMES)
+    engine = SignalEngine(state, config)
+    reference = Reference(config, NAMES)
+
+    # Just before / at / after the first lap of the 10-bar ring, and ~8 laps, with gaps per name
+    run(engine, reference, feed(bars=bars))
+
+    for name in NAMES:
+        slot = state.slots[name]
+        assert state.sig_count[slot] == len(reference.returns[name])
+        np.testing.assert_allclose(state.sig_momentum[slot], reference.momentum(name), rtol=1e-9, atol=1e-15)
+        assert state.sig_var[slot] == pytest.approx(reference.var[name], rel=1e-12)
+        assert state.sig_cov_market[slot] == pytest.approx(reference.cov[name], rel=1e-12)
+    assert engine.market_var == pytest.approx(reference.market_var, rel=1e-12)
+
+
+def test_sums_follow_universe_changes():
+    config = SignalConfig(horizons=[3, 7], horizon_weights=[0.5, 0.5])
+    state = PortfolioState(["A", "B"])
+    engine = SignalEngine(state, config)
+    reference = Reference(config, ["A", "B", "C"])
+
+    run(engine, reference, feed(bars=20, names=["A", "B"], missing=0.0))
+    # C joins with an empty ring, A leaves (B is swapped into its slot)
+    state.add(["C"])
+    state.remove(["A"])
+    later = feed(seed=1, bars=12, names=["B", "C"], missing=0.0)
+    # Continue B from its last close so its returns stay continuous
+    scale = reference.last["B"] / later[0][0][1]
+    later = [[(n, c * scale if n == "B" else c) for n, c in bars] for bars in later]
+    for ts, bars in enumerate(later, start=20):
+        for name, close in bars:
+            engine.update(name, ts, close)
+        reference.step(bars)
+    engine.fold()
+
+    for name in ("B", "C"):
+        slot = state.slots[name]
+        np.testing.assert_allclose(state.sig_momentum[slot], reference.momentum(name), rtol=1e-9, atol=1e-15)
+        assert state.sig_count[slot] == len(reference.returns[name])
+
+
+def test_compute_writes_optimizer_inputs():
+    config = SignalConfig(horizons=[2, 5], horizon_weights=[0.5, 0.5], min_bars=3)
+    state = PortfolioState(NAMES + ["D"])
+    engine = SignalEngine(state, config)
+    run(engine, Reference(config, NAMES), feed(bars=30, missing=0.0))
+    engine.compute()
+
+    ready = engine.ready()
+    np.testing.assert_array_equal(ready, [True, True, True, False])
+    sigma = np.sqrt(state.sig_var)
+    np.testing.assert_allclose(state.risk_lambda, config.risk_aversion * config.holding_bars * sigma ** 2)
+    np.testing.assert_allclose(state.trading_cost, config.cost_base + config.cost_vol_mult * sigma)
+    # D has no signal yet; the ready names' score is demeaned and clipped
+    assert state.alpha[3] == 0.0 and state.factor_loading[3] == 1.0
+    score = state.alpha[ready] / (config.ic * np.sqrt(config.holding_bars) * sigma[ready])
+    assert score.sum() == pytest.approx(0.0, abs=1e-9)
+    assert (np.abs(score) <= config.max_score).all()
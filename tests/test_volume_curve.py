@@ -0,0 +1,106 @@
+# tests/test_volume_curve.py
+from __future__ import annotations
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.volume_curve import (
+    BUCKETS,
+    CUMULATIVE_FILE,
+    SESSIONS_FILE,
+    SUMS_FILE,
+    VolumeCurves,
+    update_volume_curves,
+)
+
+SYMBOLS = ["A.XNYS", "B.XNYS"]
+SESSIONS = ["2024-10-01", "2024-10-02", "2024-10-03", "2024-10-04"]
+
+
+class StubCatalog:
+    """``ParquetDataCatalog.bars`` over synthetic regular-session minute bars."""
+
+    def __init__(self, symbols=SYMBOLS, sessions=SESSIONS, seed=0):
+        rng = np.random.default_rng(seed)
+        minutes = np.concatenate([
+            pd.date_range(pd.Timestamp(f"{day} 09:30", tz="America/New_York"), periods=BUCKETS, freq="1min").asi8
+            for day in sessions
+        ])
+        self.bars_by_type = {
+            f"{symbol}-1-MINUTE-LAST-EXTERNAL": (minutes, rng.integers(100, 10_000, len(minutes)).astype(float))
+            for symbol in symbols
+        }
+
+    def bars(self, bar_types, start=None, end=None):
+        ts, volume = self.bars_by_type[bar_types[0]]
+        keep = np.ones(len(ts), dtype=bool)
+        if start is not None:
+            keep &= ts >= start
+        if end is not None:
+            keep &= ts <= end
+        return [
+            SimpleNamespace(ts_event=int(t), volume=SimpleNamespace(as_double=lambda v=v: v))
+            for t, v in zip(ts[keep], volume[keep])
+        ]
+
+
+def stored(curve_dir):
+    return {name: np.load(os.path.join(curve_dir, name)) for name in (SUMS_FILE, SESSIONS_FILE, CUMULATIVE_FILE)}
+
+
+def test_incremental_refresh_matches_full_build(tmp_path):
+    catalog = StubCatalog()
+    full_dir, incremental_dir = str(tmp_path / "full"), str(tmp_path / "incremental")
+    update_volume_curves(catalog, full_dir, SYMBOLS, min_sessions=2)
+
+    # First refresh stops mid-session on 10-02, the second picks up from there
+    update_volume_curves(catalog, incremental_dir, SYMBOLS, end="2024-10-02 16:00", min_sessions=2)
+    update_volume_curves(catalog, incremental_dir, SYMBOLS, min_sessions=2)
+
+    full, incremental = stored(full_dir), stored(incremental_dir)
+    np.testing.assert_array_equal(full[SESSIONS_FILE], [4, 4])
+    for name in full:
+        np.testing.assert_allclose(incremental[name], full[name])
+
+
+def test_refresh_is_a_no_op_without_new_bars(tmp_path):
+    catalog = StubCatalog()
+    curve_dir = str(tmp_path)
+    update_volume_curves(catalog, curve_dir, SYMBOLS)
+    before = stored(curve_dir)
+
+    update_volume_curves(catalog, curve_dir, SYMBOLS)
+    for name, array in stored(curve_dir).items():
+        np.testing.assert_array_equal(array, before[name])
+
+
+def test_curves_are_point_in_time(tmp_path):
+    catalog = StubCatalog()
+    curves = update_volume_curves(catalog, str(tmp_path), SYMBOLS, end="2024-10-03", min_sessions=1)
+
+    np.testing.assert_array_equal(np.load(os.path.join(str(tmp_path), SESSIONS_FILE)), [2, 2])
+    ts, volume = catalog.bars_by_type["A.XNYS-1-MINUTE-LAST-EXTERNAL"]
+    early = volume[: 2 * BUCKETS].reshape(2, BUCKETS).sum(axis=0)
+    expected = np.concatenate([[0.0], np.cumsum(early)]) / early.sum()
+    np.testing.assert_allclose(curves.cumulative[curves.row("A.XNYS")], expected, rtol=1e-6)
+
+
+def test_thin_history_uses_pooled_curve(tmp_path):
+    curve_dir = str(tmp_path)
+    update_volume_curves(StubCatalog(symbols=["A.XNYS"]), curve_dir, ["A.XNYS"], min_sessions=2)
+    # B joins with a single session of history
+    catalog = StubCatalog(symbols=["A.XNYS", "B.XNYS"], sessions=SESSIONS[:1], seed=1)
+    curves = update_volume_curves(catalog, curve_dir, ["A.XNYS", "B.XNYS"], min_sessions=2)
+
+    assert isinstance(curves, VolumeCurves)
+    assert curves.rows == {"A.XNYS": 0, "B.XNYS": 1}
+    np.testing.assert_array_equal(curves.cumulative[1], curves.cumulative[curves.pooled_row])
+    assert curves.row("C.XNYS") == curves.pooled_row
+
+    rows = curves.rows_for(["A.XNYS", "B.XNYS"])
+    shares = curves.fraction_between(rows, np.array([0, 0]), np.array([BUCKETS, BUCKETS]))
+    np.testing.assert_allclose(shares, [1.0, 1.0], rtol=1e-6)